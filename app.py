@@ -1,14 +1,28 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime, date, timedelta
+import numpy as np
+from datetime import datetime, date
 import os
-import base64
-from io import BytesIO
-import json
 import calendar
-import requests
+import hashlib
+from contextlib import nullcontext
+
+from job_tracker import service
+from job_tracker.bulk_import import REQUIRED_COLUMNS, detect_format, import_applications, read_columns, suggest_mapping
+from job_tracker.events import EVENT_COLUMNS
+from job_tracker.exports import EXPORT_FORMATS, available_formats, export_bytes, export_file_name
+from job_tracker.profiling import PROFILE_LOG_FILE, profile_run, profiled, step
+from job_tracker.indexes import get_aggregates, get_event_index, get_salary_index, get_search_index
+from job_tracker.reminders import compute_reminders
+from job_tracker.salary import annual_midpoints
+from job_tracker.schema import (
+    APPLICATION_COLUMNS, CHANNEL_OPTIONS, DATE_COLUMNS, PRIORITY_OPTIONS, REFERRAL_OPTIONS, STATUS_OPTIONS,
+    date_value, option_index, text_value
+)
+from job_tracker.service import create_sample_data, get_storage
+from job_tracker.storage import StaleWriteError, get_data_cache, same_value
+from job_tracker.workspaces import check_workspace_name, current_workspace, use_workspace
+from job_tracker.write_behind import WriteBehindStore
 
 # Page configuration
 st.set_page_config(
@@ -113,69 +127,94 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Data file path
-DATA_FILE = "job_applications.csv"
-BACKUP_FILE = "job_applications_backup.json"
-
 def load_data():
-    """Load job applications data from local file"""
-    if os.path.exists(DATA_FILE):
-        try:
-            df = pd.read_csv(DATA_FILE)
-            # Convert date columns back to datetime
-            if 'date_applied' in df.columns:
-                df['date_applied'] = pd.to_datetime(df['date_applied']).dt.date
-            if 'follow_up_date' in df.columns:
-                df['follow_up_date'] = pd.to_datetime(df['follow_up_date']).dt.date
-            if 'deadline' in df.columns:
-                df['deadline'] = pd.to_datetime(df['deadline']).dt.date
-            if 'interview_date' in df.columns:
-                df['interview_date'] = pd.to_datetime(df['interview_date']).dt.date
-            return df
-        except Exception as e:
-            st.error(f"Error loading data: {e}")
-            return pd.DataFrame()
-    return pd.DataFrame()
+    """Load job applications data from the configured storage backend"""
+    try:
+        return service.load_data()
+    except Exception as e:
+        st.error(f"Error loading data: {e}")
+        return pd.DataFrame()
 
-def save_data(df):
-    """Save job applications data to local file with backup"""
+def save_data(df, expected_version=None):
+    """Replace all stored job applications with df"""
     try:
-        # Save to CSV file
-        df.to_csv(DATA_FILE, index=False)
-        
-        # Create JSON backup
-        backup_data = df.to_dict('records')
-        with open(BACKUP_FILE, 'w') as f:
-            json.dump(backup_data, f, default=str)
-        
+        service.save_data(df, expected_version=expected_version)
         st.success("✅ Data saved successfully!")
         return True
+    except StaleWriteError as e:
+        st.warning(f"⚠️ {e}")
+        return False
     except Exception as e:
         st.error(f"Error saving data: {e}")
         return False
 
-def create_sample_data():
-    """Create sample data if no data exists"""
-    sample_data = {
-        'job_title': ['Software Engineer', 'Data Analyst', 'Product Manager', 'Strategy Consulting Intern'],
-        'company': ['Tech Corp', 'Data Inc', 'Product Co', 'JLL'],
-        'status': ['Applied', 'Interviewing', 'Pending', 'Pending'],
-        'priority': ['High', 'Medium', 'Low', 'High'],
-        'channel': ['LinkedIn', 'Company Website', 'Referral', 'LinkedIn'],
-        'salary_range': ['$80k-$100k', '$60k-$80k', '$100k-$120k', '4,000'],
-        'location': ['Remote', 'New York', 'San Francisco', 'Dubai'],
-        'date_applied': [date.today() - timedelta(days=5), date.today() - timedelta(days=3), date.today() - timedelta(days=1), date.today()],
-        'follow_up_date': [date.today() + timedelta(days=7), None, None, None],
-        'deadline': [date.today() + timedelta(days=14), None, None, None],
-        'interview_date': [None, date.today() + timedelta(days=2), None, None],
-        'notes': ['Great opportunity', 'Good company culture', 'Interesting role', 'Strategy consulting role'],
-        'referral': ['No', 'Yes', 'No', 'No'],
-        'application_id': ['APP001', 'APP002', 'APP003', 'APP004'],
-        'contact_person': ['John Doe', 'Jane Smith', 'Bob Johnson', 'Sarah Wilson'],
-        'contact_email': ['john@techcorp.com', 'jane@datainc.com', 'bob@productco.com', 'sarah@jll.com']
-    }
-    return pd.DataFrame(sample_data)
+def insert_application(record):
+    """Store a single new application, returning its row key (or None on failure)"""
+    try:
+        return service.insert_application(record)
+    except Exception as e:
+        st.error(f"Error saving data: {e}")
+        return None
+
+def update_application(key, record, base=None):
+    """Update a single stored application, merging with concurrent edits when base is given"""
+    try:
+        service.update_application(key, record, base=base)
+        return True
+    except StaleWriteError as e:
+        if base is not None:
+            refresh_edit_base(key, e, record)
+        st.warning(f"⚠️ {e}")
+        return False
+    except Exception as e:
+        st.error(f"Error saving data: {e}")
+        return False
 
+def delete_application(key, base=None):
+    """Delete a single stored application, unless someone else changed it since base was read"""
+    try:
+        service.delete_application(key, base=base)
+        return True
+    except StaleWriteError as e:
+        if base is not None:
+            refresh_edit_base(key, e)
+        st.warning(f"⚠️ {e}")
+        return False
+    except Exception as e:
+        st.error(f"Error saving data: {e}")
+        return False
+
+def refresh_edit_base(key, error, submitted=None):
+    """After an edit or delete was rejected as stale, make the row as stored now the new base
+
+    Reruns the script with a notice of what someone else changed. Fields the user did not
+    edit are reset to the stored values; fields they did edit keep their input, so
+    submitting again applies them on top of the other change.
+    """
+    edit_bases = st.session_state.setdefault('edit_bases', {})
+    old = edit_bases.pop(key, None) or {}
+    current = get_storage().get(key)
+    notice = f"⚠️ {error}"
+    if current is not None:
+        current = {col: current.get(col) for col in APPLICATION_COLUMNS}
+        edit_bases[key] = current
+        changed = [col for col in APPLICATION_COLUMNS if col in old and not same_value(old[col], current[col])]
+
+        def shown(col, value):
+            value = date_value(value) if col in DATE_COLUMNS else text_value(value)
+            return str(value) if value else "(empty)"
+
+        if changed:
+            notice += " Changed since you opened it: " + "; ".join(
+                f"{EDIT_FORM_FIELDS[col][1]}: {shown(col, old[col])} → {shown(col, current[col])}" for col in changed) + "."
+        notice += " The form now starts from the stored application; submit again to go ahead."
+        for col in changed:
+            if submitted is None or same_value(submitted.get(col), old[col]):
+                st.session_state.pop(f"{EDIT_FORM_FIELDS[col][0]}_{key}", None)
+    st.session_state['edit_notice'] = notice
+    st.rerun()
+
+@profiled
 def add_job_application():
     """Add new job application form"""
     st.markdown("### 📝 Add New Job Application")
@@ -192,12 +231,10 @@ def add_job_application():
             deadline = st.date_input("Application Deadline", value=None)
         
         with col2:
-            status = st.selectbox("Status *", 
-                                ["Applied", "Interviewing", "Pending", "Offered", "Rejected", "Withdrawn"])
-            priority = st.selectbox("Priority", ["High", "Medium", "Low"])
-            channel = st.selectbox("Application Channel", 
-                                 ["LinkedIn", "Company Website", "Referral", "Indeed", "Glassdoor", "Other"])
-            referral = st.selectbox("Referral", ["No", "Yes"])
+            status = st.selectbox("Status *", STATUS_OPTIONS)
+            priority = st.selectbox("Priority", PRIORITY_OPTIONS)
+            channel = st.selectbox("Application Channel", CHANNEL_OPTIONS)
+            referral = st.selectbox("Referral", REFERRAL_OPTIONS)
             date_applied = st.date_input("Date Applied *", value=date.today())
             interview_date = st.date_input("Interview Date", value=None)
         
@@ -211,7 +248,7 @@ def add_job_application():
             follow_up_date = st.date_input("Follow-up Date", value=None)
             notes = st.text_area("Notes", placeholder="Add any notes about this application...")
         
-        submitted = st.form_submit_button("💼 Add Application", use_container_width=True)
+        submitted = st.form_submit_button("💼 Add Application", width="stretch")
         
         if submitted:
             if job_title and company and date_applied:
@@ -238,7 +275,85 @@ def add_job_application():
                 return None
     return None
 
-def display_dashboard(df):
+def reminder_lines(hits, col, label):
+    """Build the markdown bullet list for a set of reminder hits without iterating rows"""
+    dates = pd.to_datetime(hits[col]).dt.strftime('%Y-%m-%d')
+    lines = ("• **" + hits['company'].astype(str) + "** - " + hits['job_title'].astype(str)
+             + f" ({label}: " + dates + ", " + hits['days_left'].astype(str) + " days left)")
+    # Two trailing spaces make a hard line break, so each reminder keeps its own line
+    return "  \n".join(lines)
+
+def show_import_report(report):
+    """Summarize a finished bulk import, with the per-row errors"""
+    st.success(f"✅ Imported {report.imported:,} of {report.rows:,} rows in {report.batches:,} batch(es)")
+    if report.duplicates:
+        st.info(f"Skipped {report.duplicates:,} duplicates (same company, job title and date applied)")
+    if report.error_rows:
+        reasons = ", ".join(f"{reason} ({count:,})" for reason, count in report.reasons.most_common())
+        st.warning(f"⚠️ {report.error_rows:,} rows were not imported: {reasons}")
+        errors = report.errors_frame()
+        if report.error_rows > len(errors):
+            st.caption(f"Showing the first {len(errors):,} failing rows")
+        st.dataframe(errors, width="stretch", hide_index=True)
+        st.download_button(
+            label="📥 Download Error Report (CSV)",
+            data=errors.to_csv(index=False),
+            file_name="import_errors.csv",
+            mime="text/csv"
+        )
+
+@profiled
+def display_bulk_import(df):
+    """Bulk import applications from a CSV or JSON-lines export"""
+    with st.expander("📥 Bulk Import (CSV / JSON lines)"):
+        if 'import_report' in st.session_state:
+            show_import_report(st.session_state['import_report'])
+        
+        uploaded = st.file_uploader("Applications file", type=['csv', 'jsonl', 'ndjson', 'json'])
+        if uploaded is None:
+            return
+        fmt = detect_format(uploaded.name, uploaded)
+        try:
+            columns = read_columns(uploaded, fmt)
+        except Exception as e:
+            st.error(f"Error reading file: {e}")
+            return
+        
+        # Column mapping, pre-filled from the column names
+        st.markdown("**Column mapping**")
+        suggested = suggest_mapping(columns)
+        targets = [None] + APPLICATION_COLUMNS
+        mapping = {}
+        grid = st.columns(3)
+        for i, column in enumerate(columns):
+            with grid[i % 3]:
+                mapping[column] = st.selectbox(
+                    f"{column} →", targets,
+                    index=targets.index(suggested[column]),
+                    format_func=lambda target: "(skip)" if target is None else target,
+                    key=f"import_map_{i}_{column}"
+                )
+        missing = [col for col in REQUIRED_COLUMNS if col not in mapping.values()]
+        if missing:
+            st.warning(f"Map a column to each required field: {', '.join(missing)}")
+            return
+        
+        if st.button("📥 Import Applications", width="stretch"):
+            bar = st.progress(0.0, text="Importing...")
+            
+            def progress(fraction, report):
+                bar.progress(fraction, text=f"{report.rows:,} rows read, {report.imported:,} imported")
+            
+            try:
+                report = import_applications(uploaded, fmt, get_storage(), mapping, existing=df, progress=progress)
+            except Exception as e:
+                st.error(f"Error importing data: {e}")
+                return
+            st.session_state['import_report'] = report
+            st.rerun()
+
+@profiled
+def display_dashboard(df, aggregates):
     """Display dashboard with quick actions and alerts"""
     st.markdown("### 🎯 Quick Dashboard")
     
@@ -246,133 +361,80 @@ def display_dashboard(df):
         st.info("No applications yet. Add your first application to see the dashboard!")
         return
     
-    # Alerts and notifications
-    today = pd.Timestamp.now().date()
+    # Alerts, notifications and counters all come from a single pass over the data
+    with step("compute reminders"):
+        reminders = compute_reminders(df)
     
     # Upcoming deadlines
-    if 'deadline' in df.columns:
-        try:
-            # Convert deadline to datetime for comparison
-            df_deadline = df.copy()
-            df_deadline['deadline'] = pd.to_datetime(df_deadline['deadline'])
-            
-            # Convert today to datetime for comparison
-            today_dt = pd.Timestamp(today)
-            
-            upcoming_deadlines = df_deadline[
-                (df_deadline['deadline'] >= today_dt) & 
-                (df_deadline['deadline'] <= today_dt + pd.Timedelta(days=7)) &
-                (df_deadline['deadline'].notna())
-            ]
-            
-            if not upcoming_deadlines.empty:
-                st.markdown('<div class="alert-box">', unsafe_allow_html=True)
-                st.markdown("⚠️ **Upcoming Deadlines**")
-                for _, row in upcoming_deadlines.iterrows():
-                    days_left = (row['deadline'].date() - today).days
-                    st.markdown(f"• **{row['company']}** - {row['job_title']} (Deadline: {row['deadline'].date()}, {days_left} days left)")
-                st.markdown('</div>', unsafe_allow_html=True)
-        except Exception as e:
-            st.warning(f"Could not process deadlines: {e}")
+    if not reminders.upcoming_deadlines.empty:
+        st.markdown('<div class="alert-box">', unsafe_allow_html=True)
+        st.markdown("⚠️ **Upcoming Deadlines**")
+        st.markdown(reminder_lines(reminders.upcoming_deadlines, 'deadline', "Deadline"))
+        st.markdown('</div>', unsafe_allow_html=True)
     
     # Follow-up reminders
-    if 'follow_up_date' in df.columns:
-        try:
-            # Convert follow_up_date to datetime for comparison
-            df_followup = df.copy()
-            df_followup['follow_up_date'] = pd.to_datetime(df_followup['follow_up_date'])
-            
-            # Convert today to datetime for comparison
-            today_dt = pd.Timestamp(today)
-            
-            follow_ups = df_followup[
-                (df_followup['follow_up_date'] >= today_dt) & 
-                (df_followup['follow_up_date'] <= today_dt + pd.Timedelta(days=3)) &
-                (df_followup['follow_up_date'].notna())
-            ]
-            
-            if not follow_ups.empty:
-                st.markdown('<div class="info-box">', unsafe_allow_html=True)
-                st.markdown("📞 **Follow-up Reminders**")
-                for _, row in follow_ups.iterrows():
-                    days_left = (row['follow_up_date'].date() - today).days
-                    st.markdown(f"• **{row['company']}** - {row['job_title']} (Follow-up: {row['follow_up_date'].date()}, {days_left} days left)")
-                st.markdown('</div>', unsafe_allow_html=True)
-        except Exception as e:
-            st.warning(f"Could not process follow-ups: {e}")
+    if not reminders.follow_ups.empty:
+        st.markdown('<div class="info-box">', unsafe_allow_html=True)
+        st.markdown("📞 **Follow-up Reminders**")
+        st.markdown(reminder_lines(reminders.follow_ups, 'follow_up_date', "Follow-up"))
+        st.markdown('</div>', unsafe_allow_html=True)
     
     # Interview reminders
-    if 'interview_date' in df.columns:
-        try:
-            # Convert interview_date to datetime for comparison
-            df_interview = df.copy()
-            df_interview['interview_date'] = pd.to_datetime(df_interview['interview_date'])
-            
-            # Convert today to datetime for comparison
-            today_dt = pd.Timestamp(today)
-            
-            upcoming_interviews = df_interview[
-                (df_interview['interview_date'] >= today_dt) & 
-                (df_interview['interview_date'] <= today_dt + pd.Timedelta(days=2)) &
-                (df_interview['interview_date'].notna())
-            ]
-            
-            if not upcoming_interviews.empty:
-                st.markdown('<div class="success-box">', unsafe_allow_html=True)
-                st.markdown("🎯 **Upcoming Interviews**")
-                for _, row in upcoming_interviews.iterrows():
-                    days_left = (row['interview_date'].date() - today).days
-                    st.markdown(f"• **{row['company']}** - {row['job_title']} (Interview: {row['interview_date'].date()}, {days_left} days left)")
-                st.markdown('</div>', unsafe_allow_html=True)
-        except Exception as e:
-            st.warning(f"Could not process interviews: {e}")
+    if not reminders.upcoming_interviews.empty:
+        st.markdown('<div class="success-box">', unsafe_allow_html=True)
+        st.markdown("🎯 **Upcoming Interviews**")
+        st.markdown(reminder_lines(reminders.upcoming_interviews, 'interview_date', "Interview"))
+        st.markdown('</div>', unsafe_allow_html=True)
     
     # Quick stats
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        active_apps = len(df[df['status'].isin(['Applied', 'Interviewing', 'Pending'])])
-        st.metric("Active Applications", active_apps)
+        st.metric("Active Applications", aggregates.active)
     
     with col2:
-        try:
-            if 'interview_date' in df.columns:
-                df_interview_stats = df.copy()
-                df_interview_stats['interview_date'] = pd.to_datetime(df_interview_stats['interview_date'])
-                today_dt = pd.Timestamp(today)
-                interviews_this_week = len(df_interview_stats[
-                    (df_interview_stats['interview_date'] >= today_dt) & 
-                    (df_interview_stats['interview_date'] <= today_dt + pd.Timedelta(days=7)) &
-                    (df_interview_stats['interview_date'].notna())
-                ])
-            else:
-                interviews_this_week = 0
-        except:
-            interviews_this_week = 0
-        st.metric("Interviews This Week", interviews_this_week)
+        st.metric("Interviews This Week", reminders.interviews_this_week)
     
     with col3:
-        try:
-            if 'follow_up_date' in df.columns:
-                df_followup_stats = df.copy()
-                df_followup_stats['follow_up_date'] = pd.to_datetime(df_followup_stats['follow_up_date'])
-                today_dt = pd.Timestamp(today)
-                follow_ups_this_week = len(df_followup_stats[
-                    (df_followup_stats['follow_up_date'] >= today_dt) & 
-                    (df_followup_stats['follow_up_date'] <= today_dt + pd.Timedelta(days=7)) &
-                    (df_followup_stats['follow_up_date'].notna())
-                ])
-            else:
-                follow_ups_this_week = 0
-        except:
-            follow_ups_this_week = 0
-        st.metric("Follow-ups This Week", follow_ups_this_week)
+        st.metric("Follow-ups This Week", reminders.follow_ups_this_week)
     
     with col4:
-        offers = len(df[df['status'] == 'Offered'])
-        st.metric("Total Offers", offers)
+        st.metric("Total Offers", aggregates.count('status', 'Offered'))
+
+# Tracker table settings
+TRACKER_PAGE_SIZES = [25, 50, 100, 250]
+# Edit form widget key prefix and label for each column
+EDIT_FORM_FIELDS = {
+    'job_title': ("title", "Job Title"),
+    'company': ("company", "Company"),
+    'location': ("location", "Location"),
+    'salary_range': ("salary", "Salary Range"),
+    'application_id': ("id", "Application ID"),
+    'deadline': ("deadline", "Application Deadline"),
+    'status': ("status", "Status"),
+    'priority': ("priority", "Priority"),
+    'channel': ("channel", "Application Channel"),
+    'referral': ("referral", "Referral"),
+    'date_applied': ("date", "Date Applied"),
+    'interview_date': ("interview", "Interview Date"),
+    'contact_person': ("contact", "Contact Person"),
+    'contact_email': ("email", "Contact Email"),
+    'follow_up_date': ("followup", "Follow-up Date"),
+    'notes': ("notes", "Notes"),
+}
+TRACKER_SORT_COLUMNS = {
+    'date_applied': "Date Applied",
+    'company': "Company",
+    'job_title': "Job Title",
+    'status': "Status",
+    'priority': "Priority",
+    'deadline': "Deadline",
+    'follow_up_date': "Follow-up Date",
+    'interview_date': "Interview Date",
+}
 
-def display_tracker(df):
+@profiled
+def display_tracker(df, version=None):
     """Display job applications in an interactive table with edit functionality"""
     st.markdown("### 📊 Job Applications Tracker")
     
@@ -384,67 +446,85 @@ def display_tracker(df):
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        status_filter = st.multiselect("Filter by Status", df['status'].unique(), default=df['status'].unique())
+        status_options = [s for s in STATUS_OPTIONS if s in set(df['status'].dropna())]
+        status_filter = st.multiselect("Filter by Status", status_options, default=status_options)
     
     with col2:
-        priority_filter = st.multiselect("Filter by Priority", df['priority'].unique(), default=df['priority'].unique())
+        priority_options = [p for p in PRIORITY_OPTIONS if p in set(df['priority'].dropna())]
+        priority_filter = st.multiselect("Filter by Priority", priority_options, default=priority_options)
     
     with col3:
-        channel_filter = st.multiselect("Filter by Channel", df['channel'].unique(), default=df['channel'].unique())
+        channel_options = [c for c in CHANNEL_OPTIONS if c in set(df['channel'].dropna())]
+        channel_filter = st.multiselect("Filter by Channel", channel_options, default=channel_options)
     
     with col4:
-        search_term = st.text_input("Search", placeholder="Search by company or job title...")
-    
-    # Apply filters
-    filtered_df = df.copy()
-    if status_filter:
-        filtered_df = filtered_df[filtered_df['status'].isin(status_filter)]
-    if priority_filter:
-        filtered_df = filtered_df[filtered_df['priority'].isin(priority_filter)]
-    if channel_filter:
-        filtered_df = filtered_df[filtered_df['channel'].isin(channel_filter)]
-    if search_term:
-        filtered_df = filtered_df[
-            filtered_df['company'].str.contains(search_term, case=False, na=False) |
-            filtered_df['job_title'].str.contains(search_term, case=False, na=False)
-        ]
+        search_term = st.text_input("Search", placeholder="Search titles, companies, notes, contacts...")
+    
+    # Filtering, sorting and paging run in the storage layer; only the visible page is loaded
+    filters = {'status': status_filter, 'priority': priority_filter, 'channel': channel_filter}
+    with step("search"):
+        keys = get_search_index(df, version).search(search_term) if search_term else None
+    storage = get_storage()
+    total = storage.count(filters, keys=keys)
     
     # Display filtered data
-    if not filtered_df.empty:
-        st.dataframe(
-            filtered_df,
-            use_container_width=True,
-            height=400,
-            hide_index=True
-        )
+    if total:
+        col1, col2, col3 = st.columns([2, 1, 1])
+        with col1:
+            sort_labels = {None: "Best match" if search_term else "Date added", **TRACKER_SORT_COLUMNS}
+            order_by = st.selectbox("Sort by", list(sort_labels), format_func=sort_labels.get)
+        with col2:
+            page_size = st.selectbox("Rows per page", TRACKER_PAGE_SIZES, index=1)
+        with col3:
+            descending = st.checkbox("Descending", value=order_by in DATE_COLUMNS)
+        
+        pages = -(-total // page_size)
+        # A new query starts again from page 1
+        query_key = hashlib.md5(repr((filters, search_term, order_by, descending, page_size, pages)).encode()).hexdigest()[:12]
+        page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1, step=1,
+                               key=f"tracker_page_{query_key}")
+        offset = (page - 1) * page_size
+        page_df = storage.query(filters, order_by=order_by, descending=descending, limit=page_size, offset=offset, keys=keys)
+        
+        st.caption(f"Showing {offset + 1:,}–{offset + len(page_df):,} of {total:,} applications")
+        with step("render table"):
+            st.dataframe(
+                page_df,
+                width="stretch",
+                height=400,
+                hide_index=True
+            )
         
         # Edit functionality
         st.markdown("### ✏️ Edit Application")
+        # Set by refresh_edit_base when the last edit was rejected
+        notice = st.session_state.pop('edit_notice', None)
+        if notice:
+            st.warning(notice)
         
         # Select application to edit
-        if not filtered_df.empty:
-            # Create a list of applications for selection
-            application_options = []
-            for idx, row in filtered_df.iterrows():
-                option_text = f"{row['company']} - {row['job_title']} ({row['status']})"
-                application_options.append((idx, option_text))
+        if not page_df.empty:
+            # Options are the application IDs on this page, labelled through an ID -> text lookup;
+            # use the search box to reach any other application
+            option_labels = (page_df['company'].astype(str) + " - " + page_df['job_title'].astype(str)
+                             + " (" + page_df['status'].astype(str) + ")").to_dict()
             
             # Dropdown to select application
-            selected_option = st.selectbox(
-                "Select application to edit:",
-                options=[opt[1] for opt in application_options],
+            selected_idx = st.selectbox(
+                "Select application to edit (type to filter this page):",
+                options=list(option_labels),
+                format_func=option_labels.get,
                 index=0
             )
             
-            # Find the selected application
-            selected_idx = None
-            for idx, opt in application_options:
-                if opt == selected_option:
-                    selected_idx = idx
-                    break
-            
             if selected_idx is not None:
-                selected_app = filtered_df.iloc[selected_idx]
+                selected_app = page_df.loc[selected_idx]
+                # The row as it was when the form was opened, kept across reruns so edits other
+                # sessions make meanwhile can be merged or rejected
+                edit_bases = st.session_state.setdefault('edit_bases', {})
+                if selected_idx not in edit_bases:
+                    edit_bases[selected_idx] = {col: selected_app.get(col) for col in APPLICATION_COLUMNS}
+                original_app = edit_bases[selected_idx]
                 
                 # Edit form
                 with st.expander(f"Edit: {selected_app['company']} - {selected_app['job_title']}", expanded=True):
@@ -452,64 +532,50 @@ def display_tracker(df):
                         col1, col2 = st.columns(2)
                         
                         with col1:
-                            job_title = st.text_input("Job Title *", value=selected_app['job_title'], key=f"title_{selected_idx}")
-                            company = st.text_input("Company *", value=selected_app['company'], key=f"company_{selected_idx}")
-                            location = st.text_input("Location", value=selected_app.get('location', ''), key=f"location_{selected_idx}")
-                            salary_range = st.text_input("Salary Range", value=selected_app.get('salary_range', ''), key=f"salary_{selected_idx}")
-                            application_id = st.text_input("Application ID", value=selected_app.get('application_id', ''), key=f"id_{selected_idx}")
-                            # Handle None/NaT values for deadline
-                            deadline_value = selected_app.get('deadline')
-                            if deadline_value is None or pd.isna(deadline_value):
-                                deadline_value = None
-                            deadline = st.date_input("Application Deadline", value=deadline_value, key=f"deadline_{selected_idx}")
+                            job_title = st.text_input("Job Title *", value=text_value(selected_app['job_title']), key=f"title_{selected_idx}")
+                            company = st.text_input("Company *", value=text_value(selected_app['company']), key=f"company_{selected_idx}")
+                            location = st.text_input("Location", value=text_value(selected_app.get('location')), key=f"location_{selected_idx}")
+                            salary_range = st.text_input("Salary Range", value=text_value(selected_app.get('salary_range')), key=f"salary_{selected_idx}")
+                            application_id = st.text_input("Application ID", value=text_value(selected_app.get('application_id')), key=f"id_{selected_idx}")
+                            deadline = st.date_input("Application Deadline", value=date_value(selected_app.get('deadline')), key=f"deadline_{selected_idx}")
                         
                         with col2:
-                            status = st.selectbox("Status *", 
-                                                ["Applied", "Interviewing", "Pending", "Offered", "Rejected", "Withdrawn"],
-                                                index=["Applied", "Interviewing", "Pending", "Offered", "Rejected", "Withdrawn"].index(selected_app['status']),
+                            status = st.selectbox("Status *", STATUS_OPTIONS,
+                                                index=option_index(STATUS_OPTIONS, selected_app['status']),
                                                 key=f"status_{selected_idx}")
-                            priority = st.selectbox("Priority", ["High", "Medium", "Low"],
-                                                  index=["High", "Medium", "Low"].index(selected_app['priority']),
+                            priority = st.selectbox("Priority", PRIORITY_OPTIONS,
+                                                  index=option_index(PRIORITY_OPTIONS, selected_app['priority']),
                                                   key=f"priority_{selected_idx}")
-                            channel = st.selectbox("Application Channel", 
-                                                 ["LinkedIn", "Company Website", "Referral", "Indeed", "Glassdoor", "Other"],
-                                                 index=["LinkedIn", "Company Website", "Referral", "Indeed", "Glassdoor", "Other"].index(selected_app['channel']),
+                            channel = st.selectbox("Application Channel", CHANNEL_OPTIONS,
+                                                 index=option_index(CHANNEL_OPTIONS, selected_app['channel']),
                                                  key=f"channel_{selected_idx}")
-                            referral = st.selectbox("Referral", ["No", "Yes"],
-                                                  index=["No", "Yes"].index(selected_app['referral']),
+                            referral = st.selectbox("Referral", REFERRAL_OPTIONS,
+                                                  index=option_index(REFERRAL_OPTIONS, selected_app['referral']),
                                                   key=f"referral_{selected_idx}")
-                            date_applied = st.date_input("Date Applied *", value=selected_app['date_applied'], key=f"date_{selected_idx}")
-                            # Handle None/NaT values for interview_date
-                            interview_value = selected_app.get('interview_date')
-                            if interview_value is None or pd.isna(interview_value):
-                                interview_value = None
-                            interview_date = st.date_input("Interview Date", value=interview_value, key=f"interview_{selected_idx}")
+                            date_applied = st.date_input("Date Applied *", value=date_value(selected_app['date_applied']), key=f"date_{selected_idx}")
+                            interview_date = st.date_input("Interview Date", value=date_value(selected_app.get('interview_date')), key=f"interview_{selected_idx}")
                         
                         # Contact information
                         col3, col4 = st.columns(2)
                         with col3:
-                            contact_person = st.text_input("Contact Person", value=selected_app.get('contact_person', ''), key=f"contact_{selected_idx}")
-                            contact_email = st.text_input("Contact Email", value=selected_app.get('contact_email', ''), key=f"email_{selected_idx}")
+                            contact_person = st.text_input("Contact Person", value=text_value(selected_app.get('contact_person')), key=f"contact_{selected_idx}")
+                            contact_email = st.text_input("Contact Email", value=text_value(selected_app.get('contact_email')), key=f"email_{selected_idx}")
                         
                         with col4:
-                            # Handle None/NaT values for follow_up_date
-                            followup_value = selected_app.get('follow_up_date')
-                            if followup_value is None or pd.isna(followup_value):
-                                followup_value = None
-                            follow_up_date = st.date_input("Follow-up Date", value=followup_value, key=f"followup_{selected_idx}")
-                            notes = st.text_area("Notes", value=selected_app.get('notes', ''), key=f"notes_{selected_idx}")
+                            follow_up_date = st.date_input("Follow-up Date", value=date_value(selected_app.get('follow_up_date')), key=f"followup_{selected_idx}")
+                            notes = st.text_area("Notes", value=text_value(selected_app.get('notes')), key=f"notes_{selected_idx}")
                         
                         # Action buttons
                         col5, col6, col7 = st.columns(3)
                         
                         with col5:
-                            update_submitted = st.form_submit_button("💾 Update Application", use_container_width=True)
+                            update_submitted = st.form_submit_button("💾 Update Application", width="stretch")
                         
                         with col6:
-                            delete_submitted = st.form_submit_button("🗑️ Delete Application", use_container_width=True)
+                            delete_submitted = st.form_submit_button("🗑️ Delete Application", width="stretch")
                         
                         with col7:
-                            duplicate_submitted = st.form_submit_button("📋 Duplicate Application", use_container_width=True)
+                            duplicate_submitted = st.form_submit_button("📋 Duplicate Application", width="stretch")
                         
                         if update_submitted:
                             if job_title and company and date_applied:
@@ -533,12 +599,8 @@ def display_tracker(df):
                                     'contact_email': contact_email
                                 }
                                 
-                                # Find the original index in the main dataframe
-                                original_idx = df[df['company'] == selected_app['company']].index[0]
-                                for key, value in updated_app.items():
-                                    df.at[original_idx, key] = value
-                                
-                                if save_data(df):
+                                if update_application(selected_idx, updated_app, base=original_app):
+                                    edit_bases.pop(selected_idx, None)
                                     st.success("✅ Application updated successfully!")
                                     st.rerun()
                                 else:
@@ -547,11 +609,8 @@ def display_tracker(df):
                                 st.error("Please fill in all required fields (marked with *)")
                         
                         if delete_submitted:
-                            # Find the original index in the main dataframe
-                            original_idx = df[df['company'] == selected_app['company']].index[0]
-                            df = df.drop(original_idx).reset_index(drop=True)
-                            
-                            if save_data(df):
+                            if delete_application(selected_idx, base=original_app):
+                                edit_bases.pop(selected_idx, None)
                                 st.success("✅ Application deleted successfully!")
                                 st.rerun()
                             else:
@@ -578,28 +637,179 @@ def display_tracker(df):
                                 'contact_email': contact_email
                             }
                             
-                            # Add to dataframe
-                            new_df = pd.DataFrame([duplicated_app])
-                            df = pd.concat([df, new_df], ignore_index=True)
-                            
-                            if save_data(df):
+                            # Store as a new row
+                            if insert_application(duplicated_app) is not None:
                                 st.success("✅ Application duplicated successfully!")
                                 st.rerun()
                             else:
                                 st.error("❌ Failed to duplicate application.")
         
-        # Download button
-        csv = filtered_df.to_csv(index=False)
-        st.download_button(
-            label="📥 Download Filtered Data (CSV)",
-            data=csv,
-            file_name=f"job_applications_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv"
-        )
+        # Download: the export is only built when the button is clicked, and kept per data version and query
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            export_format = st.selectbox("Export format", available_formats(), format_func=lambda fmt: EXPORT_FORMATS[fmt][0],
+                                         label_visibility="collapsed")
+        query = {'filters': filters, 'order_by': order_by, 'descending': descending, 'keys': keys}
+        with col2:
+            st.download_button(
+                label=f"📥 Download Filtered Data ({EXPORT_FORMATS[export_format][0]})",
+                data=lambda: export_bytes(storage, export_format, query, version),
+                file_name=export_file_name(export_format, f"job_applications_{datetime.now().strftime('%Y%m%d_%H%M%S')}"),
+                mime=EXPORT_FORMATS[export_format][2],
+                on_click="ignore"
+            )
     else:
         st.warning("No applications match your current filters.")
 
-def display_insights(df):
+# Insights chart settings (the figure builders import plotly on first use)
+FIGURE_CACHE_MAX_ENTRIES = 32
+TIMELINE_WEBGL_POINTS = 1000  # Draw the timeline with WebGL above this many points
+TIMELINE_MAX_POINTS = 20000  # Bin (then sample) the timeline down to this many points
+SALARY_HISTOGRAM_BINS = 30
+SALARY_TOP_RANGES = 20  # Raw salary strings listed under the salary charts
+
+def status_figure(df, version):
+    """Status distribution pie"""
+    import plotly.express as px
+    status_counts = get_aggregates(df, version).value_counts('status')
+    fig_status = px.pie(
+        values=status_counts.values,
+        names=status_counts.index,
+        title="Application Status Distribution",
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    fig_status.update_layout(height=400)
+    return fig_status
+
+def channel_figure(df, version):
+    """Applications per channel bar chart"""
+    import plotly.express as px
+    channel_counts = get_aggregates(df, version).value_counts('channel')
+    fig_channel = px.bar(
+        x=channel_counts.index,
+        y=channel_counts.values,
+        title="Applications by Channel",
+        color=channel_counts.values,
+        color_continuous_scale="viridis"
+    )
+    fig_channel.update_layout(height=400, xaxis_title="Channel", yaxis_title="Count")
+    return fig_channel
+
+def timeline_figure(df, version):
+    """Application timeline scatter and a note on how it was reduced (None when it was not)
+
+    Up to TIMELINE_WEBGL_POINTS points are drawn as SVG with full hover details. Above
+    that the chart switches to WebGL; above TIMELINE_MAX_POINTS applications sharing a
+    day, company and status are binned into one point sized by their count, and the bins
+    are sampled if there are still too many.
+    """
+    import plotly.express as px
+    df_timeline = df[df['date_applied'].notna()].sort_values('date_applied')
+    
+    # Convert priority to numeric for size mapping
+    priority_mapping = {'High': 3, 'Medium': 2, 'Low': 1}
+    df_timeline = df_timeline.assign(priority_size=df_timeline['priority'].map(priority_mapping).astype(float))
+    hover_data = ['job_title', 'location', 'salary_range', 'priority']
+    note = None
+    
+    if len(df_timeline) > TIMELINE_MAX_POINTS:
+        df_timeline = (df_timeline.groupby(['date_applied', 'company', 'status'], observed=True)
+                       .size().reset_index(name='applications'))
+        df_timeline['priority_size'] = df_timeline['applications']
+        hover_data = ['applications']
+        note = f"{len(df):,} applications binned by day, company and status into {len(df_timeline):,} points"
+        if len(df_timeline) > TIMELINE_MAX_POINTS:
+            df_timeline = df_timeline.sample(TIMELINE_MAX_POINTS, random_state=0).sort_values('date_applied')
+            note += f", of which a random {TIMELINE_MAX_POINTS:,} are shown"
+    
+    fig_timeline = px.scatter(
+        df_timeline,
+        x='date_applied',
+        y='company',
+        color='status',
+        size='priority_size',
+        title="Application Timeline",
+        hover_data=hover_data,
+        render_mode='webgl' if len(df_timeline) > TIMELINE_WEBGL_POINTS else 'svg'
+    )
+    fig_timeline.update_layout(height=500)
+    return fig_timeline, note
+
+def heatmap_figure(df, version):
+    """Priority vs status heatmap"""
+    import plotly.express as px
+    return px.imshow(
+        get_aggregates(df, version).crosstab(),
+        title="Priority vs Status Heatmap",
+        color_continuous_scale="Reds"
+    )
+
+def salary_figures(df, version):
+    """Salary histogram, salary-by-status box plot and summary stats (None without salary data)
+
+    Uses yearly midpoints of the parsed salaries in the most common currency (amounts with
+    no currency are counted in it). Both charts get pre-binned / pre-computed quartiles so
+    the figure size does not grow with the number of applications.
+    """
+    import plotly.express as px
+    import plotly.graph_objects as go
+    salaries = get_salary_index(df, version).frame
+    known = salaries[salaries['salary_min'].notna()]
+    if known.empty:
+        return None
+    currencies = known['salary_currency'].value_counts()
+    currency = currencies.index[0] if currencies.any() else None
+    if currency is not None:
+        known = known[known['salary_currency'].isna() | (known['salary_currency'] == currency)]
+    annual = annual_midpoints(known)
+    label = f"Yearly salary ({currency})" if currency else "Yearly salary"
+    
+    counts, edges = np.histogram(annual, bins=SALARY_HISTOGRAM_BINS)
+    fig_hist = px.bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, title="Salary Distribution",
+                      labels={'x': label, 'y': "Applications"})
+    fig_hist.update_traces(width=np.diff(edges))
+    fig_hist.update_layout(height=400, bargap=0)
+    
+    by_status = annual.groupby(df['status'].reindex(annual.index), observed=True)
+    quartiles = by_status.quantile([0, 0.25, 0.5, 0.75, 1]).unstack()
+    quartiles = quartiles.reindex([s for s in STATUS_OPTIONS if s in quartiles.index])
+    fig_box = go.Figure(go.Box(x=quartiles.index, lowerfence=quartiles[0], q1=quartiles[0.25], median=quartiles[0.5],
+                               q3=quartiles[0.75], upperfence=quartiles[1], boxpoints=False))
+    fig_box.update_layout(height=400, title="Salary by Status", xaxis_title="Status", yaxis_title=label)
+    
+    stats = {
+        'count': len(salaries) - int(salaries['salary_min'].isna().sum()),
+        'currency': currency,
+        'median': annual.median(),
+        'p25': annual.quantile(0.25),
+        'p75': annual.quantile(0.75),
+    }
+    return fig_hist, fig_box, stats
+
+FIGURE_BUILDERS = {
+    'status': status_figure,
+    'channel': channel_figure,
+    'timeline': timeline_figure,
+    'heatmap': heatmap_figure,
+    'salary': salary_figures,
+}
+
+@st.cache_resource(max_entries=FIGURE_CACHE_MAX_ENTRIES, show_spinner=False)
+def cached_figure(kind, workspace, version, _df):
+    """Insights figure of one kind for one workspace's data version (the data itself is not hashed)
+
+    Every workspace counts its versions from 0, so the workspace is part of the key.
+    """
+    with step(f"build {kind} figure"):
+        return FIGURE_BUILDERS[kind](_df, version)
+
+def show_figure(fig, name):
+    """st.plotly_chart, timed as its own step since serializing large figures is costly"""
+    with step(f"plotly_chart {name}"):
+        st.plotly_chart(fig, width="stretch")
+
+@profiled
+def display_insights(df, aggregates, version=None):
     """Display analytics and insights"""
     st.markdown("### 📈 Analytics & Insights")
     
@@ -611,94 +821,90 @@ def display_insights(df):
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Applications", len(df))
+        st.metric("Total Applications", aggregates.total)
     
     with col2:
-        offers = len(df[df['status'] == 'Offered'])
-        st.metric("Offers Received", offers)
+        st.metric("Offers Received", aggregates.count('status', 'Offered'))
     
     with col3:
-        interviews = len(df[df['status'] == 'Interviewing'])
-        st.metric("In Interview Process", interviews)
+        st.metric("In Interview Process", aggregates.count('status', 'Interviewing'))
     
     with col4:
-        rejection_rate = len(df[df['status'] == 'Rejected']) / len(df) * 100
-        st.metric("Rejection Rate", f"{rejection_rate:.1f}%")
+        st.metric("Rejection Rate", f"{aggregates.rate('Rejected'):.1f}%")
     
-    # Charts
+    # Charts (built once per workspace and data version and shared between sessions)
+    workspace = current_workspace()
     col1, col2 = st.columns(2)
     
     with col1:
-        # Status distribution
-        status_counts = df['status'].value_counts()
-        fig_status = px.pie(
-            values=status_counts.values,
-            names=status_counts.index,
-            title="Application Status Distribution",
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
-        fig_status.update_layout(height=400)
-        st.plotly_chart(fig_status, use_container_width=True)
+        show_figure(cached_figure('status', workspace, version, df), 'status')
     
     with col2:
-        # Channel effectiveness
-        channel_counts = df['channel'].value_counts()
-        fig_channel = px.bar(
-            x=channel_counts.index,
-            y=channel_counts.values,
-            title="Applications by Channel",
-            color=channel_counts.values,
-            color_continuous_scale="viridis"
-        )
-        fig_channel.update_layout(height=400, xaxis_title="Channel", yaxis_title="Count")
-        st.plotly_chart(fig_channel, use_container_width=True)
+        show_figure(cached_figure('channel', workspace, version, df), 'channel')
     
     # Timeline chart
     st.markdown("### 📅 Application Timeline")
-    df_timeline = df.copy()
-    df_timeline['date_applied'] = pd.to_datetime(df_timeline['date_applied'])
-    df_timeline = df_timeline.sort_values('date_applied')
-    
-    # Convert priority to numeric for size mapping
-    priority_mapping = {'High': 3, 'Medium': 2, 'Low': 1}
-    df_timeline['priority_size'] = df_timeline['priority'].map(priority_mapping)
-    
-    fig_timeline = px.scatter(
-        df_timeline,
-        x='date_applied',
-        y='company',
-        color='status',
-        size='priority_size',
-        title="Application Timeline",
-        hover_data=['job_title', 'location', 'salary_range', 'priority']
-    )
-    fig_timeline.update_layout(height=500)
-    st.plotly_chart(fig_timeline, use_container_width=True)
+    fig_timeline, timeline_note = cached_figure('timeline', workspace, version, df)
+    if timeline_note:
+        st.caption(timeline_note)
+    show_figure(fig_timeline, 'timeline')
     
     # Priority vs Status heatmap
     st.markdown("### 🔥 Priority vs Status Analysis")
-    pivot_table = pd.crosstab(df['priority'], df['status'])
-    fig_heatmap = px.imshow(
-        pivot_table,
-        title="Priority vs Status Heatmap",
-        color_continuous_scale="Reds"
-    )
-    st.plotly_chart(fig_heatmap, use_container_width=True)
+    show_figure(cached_figure('heatmap', workspace, version, df), 'heatmap')
     
     # Salary analysis (if salary data exists)
-    if 'salary_range' in df.columns and not df['salary_range'].isna().all():
+    salary = cached_figure('salary', workspace, version, df)
+    if salary is not None:
+        fig_hist, fig_box, stats = salary
         st.markdown("### 💰 Salary Analysis")
-        # Extract numeric values from salary ranges for analysis
-        salary_data = df[df['salary_range'].notna()].copy()
-        if not salary_data.empty:
-            # Simple salary analysis - you can enhance this
-            st.write(f"Applications with salary info: {len(salary_data)}")
-            st.write("Salary ranges in your applications:")
-            for salary in salary_data['salary_range'].unique():
-                count = len(salary_data[salary_data['salary_range'] == salary])
-                st.write(f"• {salary}: {count} applications")
-
-def display_calendar(df):
+        currency = f" {stats['currency']}" if stats['currency'] else ""
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Applications with salary info", f"{stats['count']:,}")
+        
+        with col2:
+            st.metric("Median yearly salary", f"{stats['median']:,.0f}{currency}")
+        
+        with col3:
+            st.metric("Middle 50%", f"{stats['p25']:,.0f} – {stats['p75']:,.0f}{currency}")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            show_figure(fig_hist, 'salary histogram')
+        
+        with col2:
+            show_figure(fig_box, 'salary by status')
+        
+        with st.expander("Most common salary ranges"):
+            for salary_range, count in aggregates.value_counts('salary_range').head(SALARY_TOP_RANGES).items():
+                st.write(f"• {salary_range}: {count} applications")
+
+@profiled
+def render_month_grid(events, year, month):
+    """Render a month as a Monday-first markdown grid with per-type event counts"""
+    emojis = {kind: emoji for _, kind, _, emoji in EVENT_COLUMNS}
+    counts = events.groupby([events['date'].dt.day, 'type']).size()
+    today = date.today()
+    rows = ["| Mon | Tue | Wed | Thu | Fri | Sat | Sun |", "|---|---|---|---|---|---|---|"]
+    for week in calendar.monthcalendar(year, month):
+        cells = []
+        for day in week:
+            if day == 0:
+                cells.append(" ")
+                continue
+            label = f"**{day}**" if date(year, month, day) == today else str(day)
+            day_counts = counts.get(day)
+            if day_counts is not None:
+                label += "<br>" + " ".join(f"{emojis[kind]}{n}" for kind, n in day_counts.items())
+            cells.append(label)
+        rows.append("| " + " | ".join(cells) + " |")
+    st.markdown("\n".join(rows), unsafe_allow_html=True)
+
+@profiled
+def display_calendar(df, version=None):
     """Display calendar view of applications and events"""
     st.markdown("### 📅 Calendar View")
     
@@ -706,131 +912,204 @@ def display_calendar(df):
         st.info("No applications to display in calendar view.")
         return
     
-    # Create calendar data
-    calendar_data = []
-    
-    # Add application dates
-    for _, row in df.iterrows():
-        calendar_data.append({
-            'date': row['date_applied'],
-            'event': f"Applied: {row['company']} - {row['job_title']}",
-            'type': 'application'
-        })
-    
-    # Add follow-up dates
-    if 'follow_up_date' in df.columns:
-        for _, row in df[df['follow_up_date'].notna()].iterrows():
-            calendar_data.append({
-                'date': row['follow_up_date'],
-                'event': f"Follow-up: {row['company']}",
-                'type': 'follow_up'
-            })
-    
-    # Add interview dates
-    if 'interview_date' in df.columns:
-        for _, row in df[df['interview_date'].notna()].iterrows():
-            calendar_data.append({
-                'date': row['interview_date'],
-                'event': f"Interview: {row['company']} - {row['job_title']}",
-                'type': 'interview'
-            })
-    
-    # Add deadlines
-    if 'deadline' in df.columns:
-        for _, row in df[df['deadline'].notna()].iterrows():
-            calendar_data.append({
-                'date': row['deadline'],
-                'event': f"Deadline: {row['company']} - {row['job_title']}",
-                'type': 'deadline'
-            })
-    
-    if calendar_data:
-        # Create calendar dataframe
-        calendar_df = pd.DataFrame(calendar_data)
-        calendar_df['date'] = pd.to_datetime(calendar_df['date'])
-        calendar_df = calendar_df.sort_values('date')
-        
-        # Display upcoming events
-        today = pd.Timestamp.now().date()
-        upcoming_events = calendar_df[calendar_df['date'].dt.date >= today].head(10)
-        
-        if not upcoming_events.empty:
-            st.markdown("#### 🗓️ Upcoming Events")
-            for _, event in upcoming_events.iterrows():
-                days_until = (event['date'].date() - today).days
-                if days_until == 0:
-                    time_text = "**TODAY**"
-                elif days_until == 1:
-                    time_text = "**TOMORROW**"
-                else:
-                    time_text = f"in {days_until} days"
-                
-                st.write(f"📅 **{event['date'].strftime('%B %d, %Y')}** ({time_text})")
-                st.write(f"   {event['event']}")
-                st.write("---")
+    index = get_event_index(df, version)
+    if not len(index):
+        st.info("No events to display in calendar view.")
+        return
+    
+    today = pd.Timestamp.now().date()
+    
+    # Month grid
+    st.markdown("#### 🗓️ Month View")
+    years = range(index.events['date'].iloc[0].year, max(index.events['date'].iloc[-1].year, today.year) + 1)
+    col1, col2 = st.columns(2)
+    with col1:
+        year = st.selectbox("Year", list(years), index=list(years).index(today.year) if today.year in years else len(years) - 1)
+    with col2:
+        month = st.selectbox("Month", range(1, 13), index=today.month - 1, format_func=lambda m: calendar.month_name[m])
+    render_month_grid(index.month(year, month), year, month)
+    
+    # Display upcoming events
+    upcoming_events = index.upcoming(today, limit=10)
+    
+    if not upcoming_events.empty:
+        st.markdown("#### 🗓️ Upcoming Events")
+        for event in upcoming_events.itertuples():
+            days_until = (event.date.date() - today).days
+            if days_until == 0:
+                time_text = "**TODAY**"
+            elif days_until == 1:
+                time_text = "**TOMORROW**"
+            else:
+                time_text = f"in {days_until} days"
+            
+            st.write(f"📅 **{event.date.strftime('%B %d, %Y')}** ({time_text})")
+            st.write(f"   {event.event}")
+            st.write("---")
+    else:
+        st.info("No upcoming events in the next 30 days.")
+    
+    # The feed is kept up to date by the reminder scheduler, so this is only a join of cached blocks
+    _, feed = service.get_reminder_scheduler().feed()
+    st.download_button(
+        label="📥 Download Calendar (.ics)",
+        data=feed,
+        file_name="job_applications.ics",
+        mime="text/calendar",
+        help="Deadlines, follow-ups and interviews with alarms. The API serves the same feed at /calendar.ics."
+    )
+
+def display_add_application(df):
+    """Add form plus bulk import"""
+    new_job = add_job_application()
+    if new_job:
+        # Save data
+        if insert_application(new_job) is not None:
+            st.success("✅ Job application added successfully!")
+            st.balloons()
+            st.rerun()
         else:
-            st.info("No upcoming events in the next 30 days.")
+            st.error("❌ Failed to save application. Please try again.")
+    display_bulk_import(df)
+
+# Navigation: "sidebar" computes only the selected view, "tabs" computes every view on each rerun
+NAVIGATION_MODE = os.environ.get("JOB_TRACKER_NAVIGATION", "sidebar")
+
+# Views by label, each called as view(df, aggregates, data_version)
+VIEWS = {
+    "🏠 Dashboard": lambda df, aggregates, version: display_dashboard(df, aggregates),
+    "➕ Add Application": lambda df, aggregates, version: display_add_application(df),
+    "📊 Tracker": lambda df, aggregates, version: display_tracker(df, version),
+    "📈 Insights": display_insights,
+    "📅 Calendar": lambda df, aggregates, version: display_calendar(df, version),
+}
+
+def display_profiler(run):
+    """Sidebar debug panel: the profiler switches and, when on, every step of this rerun"""
+    with st.sidebar.expander("🐞 Profiler", expanded=run is not None):
+        st.toggle("Profile each rerun", key="profiler_enabled")
+        st.checkbox("Count allocations (slower)", key="profiler_allocations")
+        if run is None:
+            st.caption("Times each view, storage call, index build and chart on every rerun.")
+            return
+        st.caption(f"This rerun: {run.total_ms:,.0f} ms, logged to `{PROFILE_LOG_FILE}`")
+        if run.steps:
+            steps = pd.DataFrame(run.steps)
+            steps['step'] = steps['depth'].map(lambda depth: "· " * depth) + steps['step']
+            st.dataframe(steps.drop(columns='depth'), hide_index=True, width="stretch")
+
+def display_workspace_picker():
+    """Sidebar switch between workspaces; the choice is kept in the URL as ?workspace=name"""
+    current = current_workspace() or ""
+    name = st.sidebar.text_input("👤 Workspace", value=current, placeholder="default",
+                                 help="Each workspace has its own applications. Leave empty for the default one.").strip()
+    if name == current:
+        return
+    try:
+        if name:
+            check_workspace_name(name)
+    except ValueError as e:
+        st.sidebar.error(str(e))
+        return
+    if name:
+        st.query_params["workspace"] = name
     else:
-        st.info("No events to display in calendar view.")
+        del st.query_params["workspace"]
+    st.session_state.pop('import_report', None)
+    st.session_state.pop('edit_bases', None)
+    st.session_state.pop('edit_notice', None)
+    st.rerun()
 
 def main():
+    """Run the app in the workspace named in the URL, profiling the rerun when the sidebar profiler is on"""
+    workspace = st.query_params.get("workspace") or None
+    try:
+        if workspace:
+            check_workspace_name(workspace)
+    except ValueError as e:
+        st.error(str(e))
+        return
+    with use_workspace(workspace):
+        if st.session_state.get("profiler_enabled"):
+            profiling = profile_run(st.session_state.get("view", "tabs"),
+                                    allocations=st.session_state.get("profiler_allocations", False))
+        else:
+            profiling = nullcontext()
+        with profiling as run:
+            render_app()
+        display_profiler(run)
+
+def render_app():
     """Main application function"""
     # Header
     st.markdown('<h1 class="main-header">💼 Job Application Tracker</h1>', unsafe_allow_html=True)
     
-    # Load data
+    # Load data (the version is read first so a save based on this df can detect newer writes)
+    data_version = get_storage().version()
     df = load_data()
     
     # Create sample data if no data exists
     if df.empty:
         if st.button("🚀 Create Sample Data"):
             df = create_sample_data()
-            save_data(df)
+            save_data(df, expected_version=data_version)
             st.success("Sample data created! You can now explore the app.")
             st.rerun()
     
+    # Counts shared by the sidebar, dashboard and insights
+    aggregates = get_aggregates(df, data_version)
+    
     # Sidebar
+    display_workspace_picker()
     st.sidebar.markdown("## 🎯 Quick Stats")
     if not df.empty:
-        st.sidebar.metric("Total Applications", len(df))
-        st.sidebar.metric("Active Applications", len(df[df['status'].isin(['Applied', 'Interviewing', 'Pending'])]))
-        st.sidebar.metric("Success Rate", f"{len(df[df['status'] == 'Offered']) / len(df) * 100:.1f}%")
-    
-    st.sidebar.markdown("---")
-    st.sidebar.markdown("### 📋 Navigation")
+        st.sidebar.metric("Total Applications", aggregates.total)
+        st.sidebar.metric("Active Applications", aggregates.active)
+        st.sidebar.metric("Success Rate", f"{aggregates.rate('Offered'):.1f}%")
     
-    # Tabs
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["🏠 Dashboard", "➕ Add Application", "📊 Tracker", "📈 Insights", "📅 Calendar"])
+    cache_stats = get_data_cache().stats()
+    st.sidebar.caption(f"🗄️ Data cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses")
     
-    with tab1:
-        display_dashboard(df)
+    # Backups are taken by a background thread; this only reads its manifest
+    backups = service.get_backup_manager()
+    latest_backup = backups.latest()
+    if backups.last_error:
+        st.sidebar.caption(f"⚠️ Last backup attempt failed: {backups.last_error}")
+    elif latest_backup:
+        minutes = int((datetime.now().timestamp() - latest_backup['created']) // 60)
+        st.sidebar.caption(f"💾 Backup #{latest_backup['generation']} ({latest_backup['kind']}), {minutes} min ago")
     
-    with tab2:
-        new_job = add_job_application()
-        if new_job:
-            # Add to dataframe
-            new_df = pd.DataFrame([new_job])
-            if df.empty:
-                df = new_df
-            else:
-                df = pd.concat([df, new_df], ignore_index=True)
-            
-            # Save data
-            if save_data(df):
-                st.success("✅ Job application added successfully!")
-                st.balloons()
-                st.rerun()
-            else:
-                st.error("❌ Failed to save application. Please try again.")
+    # Reminders are fired by a background thread as they fall due
+    scheduler = service.get_reminder_scheduler()
+    next_reminder = scheduler.next_reminder()
+    if scheduler.last_error:
+        st.sidebar.caption(f"⚠️ Last reminder attempt failed: {scheduler.last_error}")
+    elif next_reminder:
+        st.sidebar.caption(f"🔔 Next reminder {next_reminder['due'][:10]}: {next_reminder['company']} "
+                           f"({next_reminder['type'].replace('_', '-')} on {next_reminder['date']})")
     
-    with tab3:
-        display_tracker(df)
+    # In write-behind mode edits are saved by a background thread shortly after they are made
+    storage = get_storage()
+    if isinstance(storage, WriteBehindStore):
+        pending = storage.pending_writes()
+        if storage.last_error:
+            st.sidebar.caption(f"⚠️ {pending} change(s) not saved yet, retrying: {storage.last_error}")
+        elif pending:
+            st.sidebar.caption(f"⏳ {pending} change(s) waiting to be saved")
+        else:
+            st.sidebar.caption(f"✅ All changes saved ({storage.flushed_ops} edits in {storage.writes} writes)")
     
-    with tab4:
-        display_insights(df)
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("### 📋 Navigation")
     
-    with tab5:
-        display_calendar(df)
+    if NAVIGATION_MODE == "tabs":
+        # Every tab body runs on every rerun
+        for tab, render in zip(st.tabs(list(VIEWS)), VIEWS.values()):
+            with tab:
+                render(df, aggregates, data_version)
+    else:
+        view = st.sidebar.radio("View", list(VIEWS), key="view", label_visibility="collapsed")
+        VIEWS[view](df, aggregates, data_version)
     
     # Footer
     st.markdown("---")
@@ -846,4 +1125,4 @@ def main():
     )
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main() 
@@ -0,0 +1,65 @@
+"""Job application tracker core: schema, storage, reminders, search and analytics with no UI
+
+Importing the package is cheap. The names below are loaded from their submodule (and pandas
+with it) the first time they are accessed, so scripts only pay for what they use:
+
+    from job_tracker import get_storage, compute_reminders
+    reminders = compute_reminders(get_storage().load())
+"""
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'APPLICATION_COLUMNS': 'schema',
+    'CATEGORY_COLUMNS': 'schema',
+    'DATE_COLUMNS': 'schema',
+    'STATUS_OPTIONS': 'schema',
+    'apply_schema': 'schema',
+    'coerce_record': 'schema',
+    'empty_frame': 'schema',
+    'StaleWriteError': 'storage',
+    'StorageBackend': 'storage',
+    'CSVBackend': 'storage',
+    'SQLiteBackend': 'storage',
+    'ArrowBackend': 'storage',
+    'migrate_csv_to_sqlite': 'storage',
+    'migrate_to_arrow': 'storage',
+    'WriteBehindStore': 'write_behind',
+    'open_storage': 'service',
+    'get_storage': 'service',
+    'load_data': 'service',
+    'save_data': 'service',
+    'insert_application': 'service',
+    'update_application': 'service',
+    'delete_application': 'service',
+    'Reminders': 'reminders',
+    'compute_reminders': 'reminders',
+    'ReminderScheduler': 'scheduler',
+    'SearchIndex': 'search',
+    'EventIndex': 'events',
+    'Aggregates': 'analytics',
+    'SalaryIndex': 'analytics',
+    'parse_salaries': 'salary',
+    'ImportReport': 'bulk_import',
+    'import_applications': 'bulk_import',
+    'generate_applications': 'synthetic',
+    'iter_export': 'exports',
+    'stream_export': 'exports',
+    'use_workspace': 'workspaces',
+    'current_workspace': 'workspaces',
+    'list_workspaces': 'workspaces',
+    'make_server': 'api',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,118 @@
+"""Incrementally maintained counts and parsed salaries behind the dashboard and insights"""
+from collections import Counter
+
+import pandas as pd
+
+from .salary import parse_salaries
+from .schema import ACTIVE_STATUSES, PRIORITY_OPTIONS, STATUS_OPTIONS
+
+# Columns the aggregate store counts values of
+AGGREGATE_COLUMNS = ['status', 'priority', 'channel', 'salary_range']
+
+def aggregate_value(value):
+    """A column value as a count key (None when missing)"""
+    return None if value is None or (not isinstance(value, str) and pd.isna(value)) else value
+
+class Aggregates:
+    """Counts behind the sidebar, dashboard and insights metrics, kept current with deltas
+
+    Each application contributes one (status, priority, channel, salary range) row.
+    upsert/remove subtract its old row and add the new one, so a write costs O(1) instead
+    of a rescan; matches(df) checks the counts against a full recompute.
+    """
+
+    def __init__(self, df, version=None):
+        self.version = version
+        self.counts = {col: Counter() for col in AGGREGATE_COLUMNS}
+        self.priority_status = Counter()
+        columns = [df[col].astype(object).where(df[col].notna(), None) if col in df.columns
+                   else pd.Series(None, index=df.index, dtype=object) for col in AGGREGATE_COLUMNS]
+        self._rows = dict(zip(df.index, zip(*columns)))
+        for col, values in zip(AGGREGATE_COLUMNS, columns):
+            self.counts[col].update(values.value_counts().to_dict())
+        pairs = pd.DataFrame({'priority': columns[1], 'status': columns[0]}).dropna().value_counts()
+        self.priority_status.update(pairs.to_dict())
+
+    def _apply(self, row, sign):
+        for col, value in zip(AGGREGATE_COLUMNS, row):
+            if value is not None:
+                self._bump(self.counts[col], value, sign)
+        status, priority = row[0], row[1]
+        if status is not None and priority is not None:
+            self._bump(self.priority_status, (priority, status), sign)
+
+    @staticmethod
+    def _bump(counter, value, sign):
+        counter[value] += sign
+        if not counter[value]:
+            del counter[value]
+
+    def remove(self, key):
+        """Take the application with this key out of the counts"""
+        row = self._rows.pop(key, None)
+        if row is not None:
+            self._apply(row, -1)
+
+    def upsert(self, key, record):
+        """Count one application from its record, replacing its previous contribution"""
+        self.remove(key)
+        row = tuple(aggregate_value(record.get(col)) for col in AGGREGATE_COLUMNS)
+        self._rows[key] = row
+        self._apply(row, 1)
+
+    def matches(self, df):
+        """Whether the counts equal a full recompute over df"""
+        fresh = Aggregates(df)
+        return (self._rows.keys() == fresh._rows.keys() and self.counts == fresh.counts
+                and self.priority_status == fresh.priority_status)
+
+    @property
+    def total(self):
+        return len(self._rows)
+
+    def count(self, col, value):
+        """Number of applications with value in col"""
+        return self.counts[col][value]
+
+    @property
+    def active(self):
+        return sum(self.counts['status'][status] for status in ACTIVE_STATUSES)
+
+    def rate(self, status):
+        """Percentage of applications with this status"""
+        return self.count('status', status) / self.total * 100 if self.total else 0.0
+
+    def value_counts(self, col):
+        """Counts for col as a Series, most common first (like Series.value_counts)"""
+        return pd.Series(self.counts[col], dtype='int64').sort_values(ascending=False, kind='stable')
+
+    def crosstab(self):
+        """Priority x status counts (like pd.crosstab), in option order"""
+        table = pd.Series(self.priority_status, dtype='int64')
+        if table.empty:
+            return pd.DataFrame(dtype='int64')
+        table = table.unstack(fill_value=0)
+        return table.reindex(index=[p for p in PRIORITY_OPTIONS if p in table.index],
+                             columns=[s for s in STATUS_OPTIONS if s in table.columns])
+
+class SalaryIndex:
+    """Parsed salary columns (see salary.py) per application, indexed by row key
+
+    Parsed once per data version; upsert/remove re-parse only the changed application.
+    """
+
+    def __init__(self, df, version=None):
+        self.version = version
+        salary_range = df['salary_range'] if 'salary_range' in df.columns else pd.Series(None, index=df.index, dtype=object)
+        self.frame = parse_salaries(salary_range)
+
+    def remove(self, key):
+        """Drop the application with this key"""
+        if key in self.frame.index:
+            self.frame = self.frame.drop(index=key)
+
+    def upsert(self, key, record):
+        """Re-parse one application's salary"""
+        row = parse_salaries(pd.Series([record.get('salary_range')], index=[key], dtype=object))
+        frame = pd.concat([self.frame.drop(index=key, errors='ignore'), row])
+        self.frame = frame.astype({'salary_currency': 'category', 'salary_period': 'category'})
@@ -0,0 +1,409 @@
+"""JSON HTTP API over the applications, served by a thread per connection
+
+    python -m job_tracker.api --port 8502
+
+Endpoints (add ?workspace=<name> to any of them for a named workspace):
+
+    GET    /applications         list: ?status=Applied&status=Pending (any category or text
+                                 column, repeatable), q=<text>, order_by=<column>, descending=1,
+                                 limit=<n>, cursor=<next_cursor from the previous page>; q
+                                 searches every text field like the tracker's search box, best
+                                 matches first unless order_by is given
+    GET    /applications/<id>    one application
+    POST   /applications          create from a JSON object; returns it with its id
+    PATCH  /applications/<id>    change the fields in a JSON object
+    DELETE /applications/<id>    delete
+    GET    /applications/export  download: ?format=csv|csv.gz|jsonl|xlsx|parquet, with the same
+                                 filters, q, order_by and descending as the list
+    GET    /calendar.ics         iCalendar feed of deadlines, follow-ups and interviews
+
+Reads carry the data version as their ETag, so a client repeating a request with
+If-None-Match gets 304 Not Modified, without the data being loaded, until something
+changes. Writes accept If-Match with that ETag and fail with 412 if the data has moved on
+since, which is how a client avoids overwriting someone else's edit; the version is checked
+again under the store's write lock, so of several writes with the same If-Match only one
+succeeds. Without it a PATCH still only writes the fields it names.
+The calendar feed is the reminder scheduler's cached one, revalidated the same way.
+Exports are sent with chunked transfer encoding as they are encoded, and kept per data
+version (see job_tracker.exports), so downloading an unchanged export again streams a file.
+
+Pages are cut with a keyset cursor (the last row's sort value and id) instead of an
+offset, so inserts and deletes between two requests never skip or repeat a row. Best-match
+search results have no sort value to seek on: their pages continue after the cursor's row,
+or at its position once it no longer matches. The
+filtered, sorted rows of recent queries are kept per data version, so following a
+cursor through an unchanged listing only slices out the next page.
+"""
+import argparse
+import base64
+import itertools
+import json
+import re
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from . import service
+from .bulk_import import REQUIRED_COLUMNS
+from .exports import EXPORT_FORMATS, check_format, export_file_name, stream_export
+from .indexes import get_search_index
+from .schema import APPLICATION_COLUMNS, CATEGORY_COLUMNS, DATE_COLUMNS, TEXT_COLUMNS
+from .storage import StaleWriteError, filter_applications, to_storage_value
+from .workspaces import check_workspace_name, current_workspace, use_workspace
+
+API_HOST = "127.0.0.1"
+API_PORT = 8502
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 500
+API_MAX_BODY_BYTES = 1024 * 1024
+API_RESULT_CACHE_ENTRIES = 32  # Filtered, sorted listings kept for paging through them
+
+ITEM_PATH = re.compile(r"/applications/(\d+)")
+
+_results = OrderedDict()  # (workspace, version, query) -> sorted rows, least recently used first
+_results_lock = threading.Lock()
+
+class ApiError(Exception):
+    """An error answered with status and a JSON {"error": message} body"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def etag(version):
+    return f'"{version}"'
+
+def to_json_record(key, record):
+    """A stored row as a JSON object with its id"""
+    return {'id': int(key), **{col: to_storage_value(record.get(col)) for col in APPLICATION_COLUMNS}}
+
+def encode_cursor(order_by, descending, key, value):
+    text = json.dumps({'o': order_by, 'd': descending, 'k': int(key), 'v': to_storage_value(value)})
+    return base64.urlsafe_b64encode(text.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor, order_by, descending):
+    """(key, sort value) a page continues after; ApiError if the cursor is not for this ordering"""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        key, value = int(data['k']), data['v']
+    except (ValueError, KeyError, TypeError):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Invalid cursor")
+    if data.get('o') != order_by or bool(data.get('d')) != descending:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "The cursor belongs to a different order_by/descending")
+    return key, value
+
+def _sort_values(df, order_by):
+    """The column a page is ordered by, as comparable values (option order for categories)"""
+    values = df[order_by]
+    if order_by in CATEGORY_COLUMNS:
+        codes = values.cat.codes.astype(float)
+        return codes.where(codes >= 0)
+    return values
+
+def sort_applications(df, order_by, descending):
+    """df sorted by order_by (missing last), then id"""
+    if order_by is None:
+        return df.sort_index()
+    values = _sort_values(df, order_by)
+    order = pd.DataFrame({'missing': values.isna(), 'value': values, 'key': df.index}, index=df.index)
+    return df.loc[order.sort_values(['missing', 'value', 'key'], ascending=[True, not descending, True],
+                                    na_position='last', kind='stable').index]
+
+def search_keys(search, version, df=None):
+    """Keys of the applications matching q through the workspace's search index, best first
+
+    None without q. df is only read when the index has to be rebuilt for this version.
+    """
+    if not search:
+        return None
+    if df is None:
+        df = service.load_data(TEXT_COLUMNS)
+    return get_search_index(df, version).search(search)
+
+def sorted_results(version, filters, search, order_by, descending):
+    """The applications matching a listing query, sorted, cached for this data version"""
+    key = (current_workspace(), version, json.dumps(filters, sort_keys=True), search, order_by, descending)
+    with _results_lock:
+        if key in _results:
+            _results.move_to_end(key)
+            return _results[key]
+    df = service.load_data()
+    df = filter_applications(df, filters, keys=search_keys(search, version, df))
+    if order_by is not None or not search:
+        df = sort_applications(df, order_by, descending)
+    with _results_lock:
+        _results[key] = df
+        while len(_results) > API_RESULT_CACHE_ENTRIES:
+            _results.popitem(last=False)
+    return df
+
+def rows_after(df, order_by, descending, after, ranked=False):
+    """The rows of a sorted listing after the (key, sort value) cursor
+
+    For ranked (best-match) listings the sort value is the row's position in the listing.
+    """
+    if after is None:
+        return df
+    key, value = after
+    if ranked:
+        start = df.index.get_loc(key) + 1 if key in df.index else int(value or 0) + 1
+        return df.iloc[start:]
+    if order_by is None:
+        return df[df.index > key]
+    if key in df.index and to_storage_value(df.at[key, order_by]) == value:
+        # The cursor's row has not moved, so the page starts right after it
+        return df.iloc[df.index.get_loc(key) + 1:]
+    values = _sort_values(df, order_by)
+    if value is None:
+        return df[values.isna() & (df.index > key)]
+    if order_by in CATEGORY_COLUMNS:
+        value = CATEGORY_COLUMNS[order_by].index(value)
+    elif order_by in DATE_COLUMNS:
+        value = pd.Timestamp(value)
+    beyond = values < value if descending else values > value
+    return df[(beyond | ((values == value) & (df.index > key)) | values.isna()).fillna(False).astype(bool)]
+
+def parse_query(params):
+    """The filters, q, order_by and descending of a listing as storage.query keyword arguments
+
+    Every parameter left in params is taken as a column filter.
+    """
+    order_by = params.pop('order_by', [None])[0]
+    if order_by is not None and order_by not in APPLICATION_COLUMNS:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Unknown order_by column '{order_by}'")
+    descending = params.pop('descending', ['0'])[0] in ('1', 'true')
+    search = params.pop('q', [None])[0]
+    filters = {}
+    for col, values in params.items():
+        if col not in APPLICATION_COLUMNS or col in DATE_COLUMNS:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Cannot filter on '{col}'")
+        filters[col] = values
+    return {'filters': filters, 'search': search, 'order_by': order_by, 'descending': descending}
+
+def list_applications(params, version):
+    """The page of applications a GET /applications query asks for, as a JSON-ready dict"""
+    try:
+        limit = min(int(params.pop('limit', [API_PAGE_SIZE])[0]), API_MAX_PAGE_SIZE)
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "limit must be a number")
+    if limit < 1:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "limit must be at least 1")
+    cursor = params.pop('cursor', [None])[0]
+    query = parse_query(params)
+    order_by, descending = query['order_by'], query['descending']
+
+    df = sorted_results(version, query['filters'], query['search'], order_by, descending)
+    ranked = order_by is None and bool(query['search'])
+    total = len(df)
+    rows = rows_after(df, order_by, descending, cursor and decode_cursor(cursor, order_by, descending), ranked)
+    page = rows.iloc[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = page.index[-1]
+        value = page.at[last, order_by] if order_by else df.index.get_loc(last) if ranked else None
+        next_cursor = encode_cursor(order_by, descending, last, value)
+    return {'items': [to_json_record(key, record) for key, record in zip(page.index, page.to_dict('records'))],
+            'total': total, 'next_cursor': next_cursor}
+
+def clean_body(body, partial):
+    """Validate a JSON application from a request body; partial allows leaving out required fields"""
+    if not isinstance(body, dict):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Expected a JSON object")
+    unknown = sorted(set(body) - set(APPLICATION_COLUMNS))
+    if unknown:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Unknown fields: {', '.join(unknown)}")
+    required = [] if partial else REQUIRED_COLUMNS
+    missing = [col for col in required if body.get(col) in (None, '')]
+    if missing:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Missing required fields: {', '.join(missing)}")
+    return body
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """One request: route it, run it in its workspace and answer with JSON"""
+
+    protocol_version = "HTTP/1.1"  # Keep connections alive between requests
+    disable_nagle_algorithm = True  # Headers and body go out in separate writes; don't let the body wait for an ACK
+    server_version = "JobTrackerAPI/1.0"
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PATCH(self):
+        self._handle('PATCH')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+    def log_message(self, format, *args):
+        if not getattr(self.server, 'quiet', False):
+            super().log_message(format, *args)
+
+    def _handle(self, method):
+        url = urlsplit(self.path)
+        params = parse_qs(url.query)
+        try:
+            # Read the whole body up front, so the connection stays usable whatever the answer
+            length = int(self.headers.get('Content-Length') or 0)
+            if length > API_MAX_BODY_BYTES:
+                self.close_connection = True
+                raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+            self._body = self.rfile.read(length)
+            workspace = params.pop('workspace', [None])[0]
+            if workspace is not None:
+                check_workspace_name(workspace)
+            with use_workspace(workspace):
+                status, body, headers = self._route(method, url.path, params)
+        except ApiError as e:
+            status, body, headers = e.status, {'error': str(e)}, {}
+        except StaleWriteError as e:
+            status, body, headers = HTTPStatus.PRECONDITION_FAILED, {'error': str(e)}, {}
+        except ValueError as e:
+            status, body, headers = HTTPStatus.BAD_REQUEST, {'error': str(e)}, {}
+        except Exception as e:  # Answer rather than drop the connection
+            status, body, headers = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f"{type(e).__name__}: {e}"}, {}
+        self._send(status, body, headers)
+
+    def _route(self, method, path, params):
+        """(status, JSON body, extra headers) for one request in the current workspace"""
+        storage = service.get_storage()
+        version = storage.version()
+        match = ITEM_PATH.fullmatch(path)
+        if path == "/calendar.ics" and method == 'GET':
+            if self.headers.get('If-None-Match') == etag(version):
+                return HTTPStatus.NOT_MODIFIED, None, {'ETag': etag(version)}
+            feed_version, data = service.get_reminder_scheduler().feed()
+            return HTTPStatus.OK, data, {'ETag': etag(feed_version), 'Content-Type': 'text/calendar; charset=utf-8'}
+        if path == "/applications/export" and method == 'GET':
+            fmt = check_format(params.pop('format', ['csv'])[0])
+            if self.headers.get('If-None-Match') == etag(version):
+                return HTTPStatus.NOT_MODIFIED, None, {'ETag': etag(version)}
+            query = parse_query(params)
+            query['keys'] = search_keys(query.pop('search'), version)
+            chunks = stream_export(storage, fmt, query, version)
+            # Encode the first chunk now, so a failing export is still answered with an error status
+            chunks = itertools.chain([next(chunks, b"")], chunks)
+            return HTTPStatus.OK, chunks, {'ETag': etag(version), 'Content-Type': EXPORT_FORMATS[fmt][2],
+                                           'Content-Disposition': f'attachment; filename="{export_file_name(fmt)}"'}
+        if path == "/applications" and method == 'GET':
+            if self.headers.get('If-None-Match') == etag(version):
+                return HTTPStatus.NOT_MODIFIED, None, {'ETag': etag(version)}
+            return HTTPStatus.OK, {**list_applications(params, version), 'version': version}, {'ETag': etag(version)}
+        if path == "/applications" and method == 'POST':
+            expected_version = self._check_if_match(version)
+            key = service.insert_application(clean_body(self._read_json(), partial=False), expected_version)
+            return HTTPStatus.CREATED, to_json_record(key, storage.get(key)), {
+                'Location': f"/applications/{key}", 'ETag': etag(storage.version())}
+        if path in ("/applications", "/applications/export", "/calendar.ics"):
+            raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} is not supported on {path}")
+        if match is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"No such endpoint: {path}")
+
+        key = int(match.group(1))
+        if method == 'GET':
+            if self.headers.get('If-None-Match') == etag(version):
+                return HTTPStatus.NOT_MODIFIED, None, {'ETag': etag(version)}
+            # Served from the cached listing of this version rather than a query per request
+            df = sorted_results(version, {}, None, None, False)
+            if key not in df.index:
+                raise ApiError(HTTPStatus.NOT_FOUND, f"No application {key}")
+            return HTTPStatus.OK, to_json_record(key, df.loc[key].to_dict()), {'ETag': etag(version)}
+        if storage.get(key) is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"No application {key}")
+        # A request carries no earlier read of the row to merge against; If-Match guards
+        # against concurrent changes instead
+        if method == 'PATCH':
+            expected_version = self._check_if_match(version)
+            service.update_application(key, clean_body(self._read_json(), partial=True),
+                                       expected_version=expected_version)
+            return HTTPStatus.OK, to_json_record(key, storage.get(key)), {'ETag': etag(storage.version())}
+        if method == 'DELETE':
+            expected_version = self._check_if_match(version)
+            service.delete_application(key, expected_version=expected_version)
+            return HTTPStatus.NO_CONTENT, None, {'ETag': etag(storage.version())}
+        raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} is not supported on {path}")
+
+    def _check_if_match(self, version):
+        """The version an If-Match header asks the write to be made against, or None
+
+        A mismatch is answered at once; a write made in the meantime is caught by the store.
+        """
+        expected = self.headers.get('If-Match')
+        if expected is None or expected == '*':
+            return None
+        if expected != etag(version):
+            raise ApiError(HTTPStatus.PRECONDITION_FAILED, "The data was changed since; reload and try again.")
+        return version
+
+    def _read_json(self):
+        try:
+            return json.loads(self._body or b'null')
+        except json.JSONDecodeError as e:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {e}")
+
+    def _send(self, status, body, headers):
+        """Answer with body: a JSON-ready value, None, or bytes or an iterator of bytes typed by headers"""
+        if hasattr(body, '__next__'):
+            self._send_chunked(status, body, headers)
+            return
+        data = body if isinstance(body, bytes) else b"" if body is None else json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        if body is not None and 'Content-Type' not in headers:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Cache-Control', 'no-cache')  # Always revalidate against the ETag
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+    def _send_chunked(self, status, chunks, headers):
+        """Answer with chunked transfer encoding, writing each chunk as it is produced"""
+        self.send_response(status)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('Cache-Control', 'no-cache')
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            for data in chunks:
+                if data:
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        except Exception as e:
+            # Too late for an error status: end the connection without the closing chunk
+            self.close_connection = True
+            self.log_error("Export failed while streaming: %s", e)
+            return
+        self.wfile.write(b"0\r\n\r\n")
+
+def make_server(host=API_HOST, port=API_PORT, quiet=False):
+    """A threaded API server (not yet serving; call serve_forever)"""
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    server.daemon_threads = True
+    server.quiet = quiet
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default=API_HOST)
+    parser.add_argument('--port', type=int, default=API_PORT)
+    parser.add_argument('--quiet', action='store_true', help="do not log every request")
+    args = parser.parse_args()
+    server = make_server(args.host, args.port, args.quiet)
+    print(f"Serving the job tracker API on http://{args.host}:{server.server_port}/applications")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
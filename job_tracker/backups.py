@@ -0,0 +1,218 @@
+"""Rotating, compressed backups taken by a background thread, off the write path
+
+A BackupManager polls the store's version. Once BACKUP_EVERY_CHANGES writes have happened
+since the last backup, or BACKUP_INTERVAL_SECONDS have passed with at least one, it writes a
+new generation into the backup directory:
+
+- a full snapshot (gzipped CSV) to start each chain
+- then up to BACKUP_DELTAS_PER_FULL deltas: gzipped journal operations (inserts, changed
+  fields and deletes) against the previous generation, replayed with replay_journal
+
+manifest.json lists the generations. Retention keeps the newest BACKUP_KEEP_FULL chains.
+Every file is written atomically before the manifest points at it, so a crash leaves at
+worst an orphaned file that the next run removes. restore_generation() rebuilds any
+listed generation as a DataFrame.
+"""
+import gzip
+import io
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+from .schema import APPLICATION_COLUMNS, apply_schema
+from .storage import FileLock, atomic_write, replay_journal, to_storage_value
+
+BACKUP_DIR = "backups"
+BACKUP_EVERY_CHANGES = 25  # Back up once this many writes have happened...
+BACKUP_INTERVAL_SECONDS = 15 * 60  # ...or this long after the last backup, if anything changed
+BACKUP_POLL_SECONDS = 5
+BACKUP_DELTAS_PER_FULL = 10
+BACKUP_KEEP_FULL = 5
+BACKUP_COMPRESS_LEVEL = 6
+MANIFEST_FILE = "manifest.json"
+
+def read_manifest(directory=BACKUP_DIR):
+    """Generations in the backup directory, oldest first"""
+    path = os.path.join(directory, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['generations']
+
+def _write_manifest(directory, generations):
+    with atomic_write(os.path.join(directory, MANIFEST_FILE)) as f:
+        json.dump({'generations': generations}, f, indent=1)
+
+def _write_gzip(path, text):
+    with atomic_write(path, mode='wb') as f:
+        f.write(gzip.compress(text.encode('utf-8'), compresslevel=BACKUP_COMPRESS_LEVEL))
+
+def _read_full(path):
+    df = apply_schema(pd.read_csv(io.BytesIO(gzip.decompress(open(path, 'rb').read()))))
+    df = df.set_index('id')
+    df.index.name = None
+    return df
+
+def _read_delta(path):
+    return [json.loads(line) for line in gzip.decompress(open(path, 'rb').read()).decode('utf-8').splitlines()]
+
+def _encoded(df):
+    """df as plain storage values (dates as ISO strings, missing as None) for comparisons"""
+    encoded = pd.DataFrame(index=df.index)
+    for col in APPLICATION_COLUMNS:
+        values = df[col]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            values = values.dt.strftime('%Y-%m-%d')
+        values = values.astype(object)
+        encoded[col] = values.where(values.notna(), None)
+    return encoded
+
+def diff_ops(before, after):
+    """Journal operations turning the before DataFrame into after"""
+    return _diff_encoded(_encoded(before), _encoded(after))
+
+def _diff_encoded(before, after):
+    """diff_ops for frames already passed through _encoded"""
+    ops = [{'op': 'delete', 'key': int(key)} for key in before.index.difference(after.index)]
+    added = after.index.difference(before.index)
+    for key, record in after.loc[added].to_dict('index').items():
+        ops.append({'op': 'insert', 'key': int(key), 'record': record})
+    common = after.index.intersection(before.index)
+    old, new = before.loc[common], after.loc[common]
+    changed = (old != new) & ~(old.isna() & new.isna())
+    for key in changed.index[changed.any(axis=1)]:
+        cols = changed.columns[changed.loc[key]]
+        ops.append({'op': 'update', 'key': int(key), 'record': new.loc[key, cols].to_dict()})
+    return ops
+
+def restore_generation(generation=None, directory=BACKUP_DIR):
+    """The applications as of a generation (the newest when None), rebuilt from its chain"""
+    generations = read_manifest(directory)
+    if generation is None and generations:
+        generation = generations[-1]['generation']
+    chain = []
+    for entry in generations:
+        if entry['kind'] == 'full':
+            chain = []
+        chain.append(entry)
+        if entry['generation'] == generation:
+            break
+    else:
+        raise ValueError(f"No backup generation {generation} in {directory}")
+    df = _read_full(os.path.join(directory, chain[0]['file']))
+    for entry in chain[1:]:
+        df = replay_journal(df, _read_delta(os.path.join(directory, entry['file'])))
+    return df.sort_index()
+
+class BackupManager:
+    """Background thread writing backup generations of a store as it changes"""
+
+    def __init__(self, storage, directory=BACKUP_DIR, every_changes=BACKUP_EVERY_CHANGES,
+                 interval=BACKUP_INTERVAL_SECONDS, deltas_per_full=BACKUP_DELTAS_PER_FULL,
+                 keep_full=BACKUP_KEEP_FULL, poll_seconds=BACKUP_POLL_SECONDS):
+        self.storage = storage
+        self.directory = directory
+        self.every_changes = every_changes
+        self.interval = interval
+        self.deltas_per_full = deltas_per_full
+        self.keep_full = keep_full
+        self.poll_seconds = poll_seconds
+        self.last_error = None
+        os.makedirs(directory, exist_ok=True)
+        self._lock = FileLock(os.path.join(directory, "backups.lock"))
+        self._base = None  # (generation, encoded DataFrame) of the newest generation, for diffing
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the background thread (once)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="backups", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, final_backup=True):
+        """Stop the thread, first backing up any changes not yet in a generation"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if final_backup:
+            self.maybe_backup(force=True)
+
+    def _run(self):
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.maybe_backup()
+                self.last_error = None
+            except Exception as e:  # Keep the thread alive; the next poll retries
+                self.last_error = e
+
+    def latest(self):
+        """Manifest entry of the newest generation, or None"""
+        generations = read_manifest(self.directory)
+        return generations[-1] if generations else None
+
+    def maybe_backup(self, force=False):
+        """Write a generation if enough has changed (or anything has, with force)
+
+        Returns the new manifest entry, or None when no backup was due.
+        """
+        latest = self.latest()
+        version = self.storage.version()
+        if latest is not None and latest['version'] == version:
+            return None
+        due = (latest is None or force or abs(version - latest['version']) >= self.every_changes
+               or time.time() - latest['created'] >= self.interval)
+        return self.backup() if due else None
+
+    def backup(self):
+        """Write the next generation now: a delta, or a full snapshot to start a new chain"""
+        with self._lock:
+            generations = read_manifest(self.directory)
+            # The version is read first, so a write racing with load() is picked up next time
+            version = self.storage.version()
+            df = _encoded(self.storage.load())
+            since_full = 0
+            for entry in reversed(generations):
+                if entry['kind'] == 'full':
+                    break
+                since_full += 1
+            number = generations[-1]['generation'] + 1 if generations else 1
+            entry = {'generation': number, 'version': version, 'created': time.time(), 'rows': len(df)}
+
+            if generations and since_full < self.deltas_per_full:
+                previous = generations[-1]['generation']
+                if self._base is None or self._base[0] != previous:
+                    self._base = (previous, _encoded(restore_generation(previous, self.directory)))
+                ops = _diff_encoded(self._base[1], df)
+                text = "".join(json.dumps(op, default=to_storage_value) + "\n" for op in ops)
+                entry.update(kind='delta', file=f"{number:06d}-delta.jsonl.gz", changes=len(ops))
+            else:
+                text = df.to_csv(index_label='id')
+                entry.update(kind='full', file=f"{number:06d}-full.csv.gz")
+            _write_gzip(os.path.join(self.directory, entry['file']), text)
+            entry['bytes'] = os.path.getsize(os.path.join(self.directory, entry['file']))
+            generations.append(entry)
+            generations = self._apply_retention(generations)
+            _write_manifest(self.directory, generations)
+            self._remove_unlisted(generations)
+            self._base = (number, df)
+            return entry
+
+    def _apply_retention(self, generations):
+        """Drop whole chains older than the newest keep_full full snapshots"""
+        fulls = [i for i, entry in enumerate(generations) if entry['kind'] == 'full']
+        if len(fulls) <= self.keep_full:
+            return generations
+        return generations[fulls[-self.keep_full]:]
+
+    def _remove_unlisted(self, generations):
+        """Delete generation files the manifest no longer lists (expired or orphaned)"""
+        listed = {entry['file'] for entry in generations}
+        for name in os.listdir(self.directory):
+            if name.endswith(".gz") and name not in listed:
+                os.remove(os.path.join(self.directory, name))
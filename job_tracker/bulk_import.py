@@ -0,0 +1,199 @@
+"""Streaming bulk import of applications from CSV or JSON-lines exports
+
+Files are read in chunks of IMPORT_CHUNK_ROWS rows. Each chunk is mapped onto the
+application fields, validated with vectorized checks against the add form's required
+fields and the schema's enum lists, de-duplicated against existing applications (and
+earlier rows of the same file) and written with a single storage.insert_many call.
+"""
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from .schema import APPLICATION_COLUMNS, CATEGORY_COLUMNS, DATE_COLUMNS, STATUS_OPTIONS, apply_schema
+
+IMPORT_CHUNK_ROWS = 1000
+IMPORT_MAX_ERROR_ROWS = 1000  # Failing rows kept with their messages; the rest are only counted
+
+# Fields the add form requires; status falls back to the form's default
+REQUIRED_COLUMNS = ['job_title', 'company', 'date_applied']
+IMPORT_DEFAULTS = {'status': STATUS_OPTIONS[0]}
+
+# Common export column names (normalized) and the field they hold
+COLUMN_ALIASES = {
+    'title': 'job_title', 'job': 'job_title', 'position': 'job_title', 'role': 'job_title',
+    'company_name': 'company', 'employer': 'company', 'organization': 'company',
+    'applied': 'date_applied', 'applied_on': 'date_applied', 'application_date': 'date_applied', 'date': 'date_applied',
+    'follow_up': 'follow_up_date', 'interview': 'interview_date', 'application_deadline': 'deadline',
+    'salary': 'salary_range', 'compensation': 'salary_range',
+    'source': 'channel', 'application_channel': 'channel',
+    'contact': 'contact_person', 'recruiter': 'contact_person',
+    'email': 'contact_email', 'recruiter_email': 'contact_email',
+    'note': 'notes', 'comments': 'notes', 'city': 'location',
+}
+
+@dataclass
+class ImportReport:
+    """What an import did: row counts, batches written and a per-row error summary"""
+    rows: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    batches: int = 0
+    error_rows: int = 0
+    reasons: Counter = field(default_factory=Counter)
+    errors: list = field(default_factory=list)  # (row number, message), first IMPORT_MAX_ERROR_ROWS only
+
+    def errors_frame(self):
+        """The kept row errors as a DataFrame for display or download"""
+        return pd.DataFrame(self.errors, columns=['row', 'error'])
+
+def normalize_column(name):
+    """Lowercase a column name and turn runs of other characters into underscores"""
+    return re.sub(r"[^0-9a-z]+", "_", str(name).strip().lower()).strip("_")
+
+def suggest_mapping(columns):
+    """Map each source column to the application field it most likely holds (None to skip it)"""
+    mapping = {}
+    for column in columns:
+        name = normalize_column(column)
+        target = name if name in APPLICATION_COLUMNS else COLUMN_ALIASES.get(name)
+        mapping[column] = target if target not in mapping.values() else None
+    return mapping
+
+def detect_format(name, source):
+    """'csv', 'jsonl' or 'json' (a single JSON array) from the file name and first character"""
+    extension = name.rsplit(".", 1)[-1].lower() if "." in name else ""
+    if extension == "csv":
+        return "csv"
+    if extension in ("jsonl", "ndjson"):
+        return "jsonl"
+    start = source.read(64).lstrip()
+    source.seek(0)
+    return "json" if start[:1] in (b"[", "[") else "jsonl" if start[:1] in (b"{", "{") else "csv"
+
+def read_columns(source, fmt):
+    """Column names of a file without reading past its first record"""
+    try:
+        if fmt == "csv":
+            return list(pd.read_csv(source, nrows=0).columns)
+        if fmt == "jsonl":
+            return list(json.loads(source.readline() or "{}"))
+        records = json.load(source)
+        return list(records[0]) if records else []
+    finally:
+        source.seek(0)
+
+def read_chunks(source, fmt, chunk_rows=IMPORT_CHUNK_ROWS):
+    """Yield DataFrames of at most chunk_rows raw rows
+
+    CSV and JSON lines are streamed; a JSON array has to be parsed whole first.
+    """
+    if fmt == "csv":
+        yield from pd.read_csv(source, dtype=str, keep_default_na=False, chunksize=chunk_rows)
+    elif fmt == "jsonl":
+        yield from pd.read_json(source, lines=True, dtype=False, convert_dates=False, chunksize=chunk_rows)
+    else:
+        records = pd.DataFrame(json.load(source))
+        for start in range(0, len(records), chunk_rows):
+            yield records.iloc[start:start + chunk_rows]
+
+def clean_text(values):
+    """Strings with surrounding whitespace removed and blanks as missing"""
+    values = values.astype('string').str.strip()
+    return values.mask(values == "")
+
+def parse_dates(values):
+    """Parse date strings, trying ISO 8601 for the whole column before per-value formats"""
+    parsed = pd.to_datetime(values, format='ISO8601', errors='coerce')
+    retry = values.notna() & parsed.isna()
+    if retry.any():
+        parsed[retry] = pd.to_datetime(values[retry], format='mixed', errors='coerce')
+    return parsed.dt.normalize()
+
+def validate_chunk(chunk, mapping, first_row=1):
+    """Map and validate one chunk
+
+    Returns the valid rows as a schema-typed DataFrame, plus a Series of error messages for
+    the invalid rows and a Counter of error reasons. Both are indexed by row number.
+    """
+    rows = pd.RangeIndex(first_row, first_row + len(chunk))
+    frame = pd.DataFrame(index=rows)
+    for source, target in mapping.items():
+        if target and source in chunk.columns:
+            frame[target] = clean_text(chunk[source].set_axis(rows))
+    for col in APPLICATION_COLUMNS:
+        if col not in frame.columns:
+            frame[col] = pd.Series(pd.NA, index=rows, dtype='string')
+    for col, default in IMPORT_DEFAULTS.items():
+        frame[col] = frame[col].fillna(default)
+
+    messages = pd.Series("", index=rows, dtype=object)
+    reasons = Counter()
+
+    def flag(mask, reason, detail=None):
+        if mask.any():
+            reasons[reason] += int(mask.sum())
+            text = (reason + ": '" + detail[mask] + "'; ") if detail is not None else reason + "; "
+            messages[mask] = messages[mask] + text
+
+    for col in REQUIRED_COLUMNS:
+        flag(frame[col].isna(), f"missing {col}")
+    for col, options in CATEGORY_COLUMNS.items():
+        lookup = {option.lower(): option for option in options}
+        values = frame[col]
+        frame[col] = values.str.lower().map(lookup)
+        flag(values.notna() & frame[col].isna(), f"invalid {col}", values)
+    for col in DATE_COLUMNS:
+        values = frame[col]
+        frame[col] = parse_dates(values)
+        flag(values.notna() & frame[col].isna(), f"invalid {col}", values)
+
+    invalid = messages != ""
+    valid = apply_schema(frame.loc[~invalid, APPLICATION_COLUMNS].copy())
+    return valid, messages[invalid].str.rstrip("; "), reasons
+
+def dedupe_keys(df):
+    """Identity of an application for de-duplication: company, job title and date applied"""
+    if df.empty:
+        return pd.Series([], index=df.index, dtype=object)
+    return (df['company'].astype('string').str.strip().str.lower() + "\x1f"
+            + df['job_title'].astype('string').str.strip().str.lower() + "\x1f"
+            + pd.to_datetime(df['date_applied']).dt.strftime('%Y-%m-%d')).astype(object)
+
+def import_applications(source, fmt, storage, mapping=None, existing=None, chunk_rows=IMPORT_CHUNK_ROWS,
+                        progress=None):
+    """Stream source into storage, one insert_many write per chunk
+
+    existing is the current applications DataFrame to de-duplicate against (loaded from
+    storage when not given). progress(fraction, report) is called after every chunk.
+    """
+    if mapping is None:
+        mapping = suggest_mapping(read_columns(source, fmt))
+    existing = storage.load() if existing is None else existing
+    seen = set(dedupe_keys(existing).dropna())
+    size = source.seek(0, 2)
+    source.seek(0)
+    report = ImportReport()
+
+    for chunk in read_chunks(source, fmt, chunk_rows):
+        valid, errors, reasons = validate_chunk(chunk, mapping, report.rows + 1)
+        report.rows += len(chunk)
+        report.error_rows += len(errors)
+        report.reasons.update(reasons)
+        room = IMPORT_MAX_ERROR_ROWS - len(report.errors)
+        report.errors.extend(list(errors.items())[:max(room, 0)])
+
+        keys = dedupe_keys(valid)
+        duplicate = keys.isin(seen).to_numpy() | keys.duplicated().to_numpy()
+        report.duplicates += int(duplicate.sum())
+        new = valid[~duplicate]
+        if not new.empty:
+            storage.insert_many(new.to_dict('records'))
+            seen.update(keys[~duplicate])
+            report.imported += len(new)
+            report.batches += 1
+        if progress:
+            progress(min(source.tell() / size, 1.0) if size else 1.0, report)
+    return report
@@ -0,0 +1,83 @@
+"""Calendar events derived from the application date columns"""
+import numpy as np
+import pandas as pd
+
+# Calendar event sources: (date column, event type, label, emoji)
+EVENT_COLUMNS = [
+    ('date_applied', 'application', 'Applied', '📝'),
+    ('follow_up_date', 'follow_up', 'Follow-up', '📞'),
+    ('interview_date', 'interview', 'Interview', '🎯'),
+    ('deadline', 'deadline', 'Deadline', '⚠️'),
+]
+
+def build_events(df):
+    """Melt the date columns into one event per (application, date column), sorted by date"""
+    date_cols = [col for col, *_ in EVENT_COLUMNS if col in df.columns]
+    if df.empty or not date_cols:
+        return pd.DataFrame({'date': pd.Series(dtype='datetime64[ns]'), 'key': [], 'type': [], 'event': []})
+    events = df[['company', 'job_title'] + date_cols].rename_axis('key').reset_index().melt(
+        id_vars=['key', 'company', 'job_title'], value_vars=date_cols, var_name='column', value_name='date'
+    )
+    events['date'] = pd.to_datetime(events['date'], errors='coerce').dt.normalize()
+    events = events[events['date'].notna()]
+    kinds = {col: kind for col, kind, _, _ in EVENT_COLUMNS}
+    labels = {col: label for col, _, label, _ in EVENT_COLUMNS}
+    # Follow-ups only name the company, everything else names the role too
+    title = ("- " + events['job_title'].astype(str)).where(events['column'] != 'follow_up_date', "")
+    events['event'] = (events['column'].map(labels) + ": " + events['company'].astype(str) + " " + title).str.rstrip()
+    events['type'] = events['column'].map(kinds)
+    return events[['date', 'key', 'type', 'event']].sort_values('date', kind='stable').reset_index(drop=True)
+
+class EventIndex:
+    """Calendar events kept sorted by date so range queries are a binary search
+
+    The index remembers which data version it reflects; upsert/remove keep it current
+    when a single application changes instead of rebuilding it.
+    """
+
+    def __init__(self, df, version=None):
+        self.version = version
+        self._set_events(build_events(df))
+
+    def _set_events(self, events):
+        self.events = events
+        self._dates = events['date'].to_numpy(dtype='datetime64[ns]')
+
+    def __len__(self):
+        return len(self.events)
+
+    def between(self, start, end):
+        """Events dated from start to end, both inclusive"""
+        lo = np.searchsorted(self._dates, np.datetime64(pd.Timestamp(start)), side='left')
+        hi = np.searchsorted(self._dates, np.datetime64(pd.Timestamp(end)), side='right')
+        return self.events.iloc[lo:hi]
+
+    def upcoming(self, today, limit=10):
+        """The next limit events on or after today"""
+        lo = np.searchsorted(self._dates, np.datetime64(pd.Timestamp(today)), side='left')
+        return self.events.iloc[lo:lo + limit]
+
+    def next_days(self, today, days):
+        """Events in the next days days, today included"""
+        return self.between(today, pd.Timestamp(today) + pd.Timedelta(days=days))
+
+    def month(self, year, month):
+        """Events in the given calendar month"""
+        start = pd.Timestamp(year=year, month=month, day=1)
+        return self.between(start, start + pd.offsets.MonthEnd(0))
+
+    def remove(self, key):
+        """Drop every event belonging to the application with this key"""
+        keep = (self.events['key'] != key).to_numpy()
+        if not keep.all():
+            self._set_events(self.events[keep].reset_index(drop=True))
+
+    def upsert(self, key, record):
+        """Replace the events for one application, inserting the new ones in date order"""
+        self.remove(key)
+        new_events = build_events(pd.DataFrame([record], index=[key]))
+        if new_events.empty:
+            return
+        positions = np.searchsorted(self._dates, new_events['date'].to_numpy(dtype='datetime64[ns]'), side='right')
+        order = np.argsort(np.concatenate([np.arange(len(self.events)), positions - 0.5]), kind='stable')
+        self._set_events(pd.concat([self.events, new_events], ignore_index=True).iloc[order].reset_index(drop=True))
@@ -0,0 +1,295 @@
+"""On-demand exports of the applications in several formats, streamed in chunks
+
+iter_export(df, fmt) encodes EXPORT_CHUNK_ROWS rows at a time and yields the bytes as it
+goes, so the whole payload is never one string in memory: CSV and JSON lines chunk by
+chunk, gzip through one streaming compressor, Parquet one row group per chunk. Excel is
+written to a temporary file and read back in chunks, since an .xlsx file is a zip archive
+that is only complete once closed; it needs xlsxwriter or openpyxl, and
+available_formats() leaves it out when neither is installed.
+
+stream_export() serves an export of a store query through the process-wide ExportCache:
+the first request for a (store, data version, query, format) tees the chunks into a file
+while they are sent; every later one streams that file, with no query or encoding.
+"""
+import atexit
+import hashlib
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+from .schema import APPLICATION_COLUMNS, DATE_COLUMNS
+
+EXPORT_CHUNK_ROWS = 10_000
+EXPORT_READ_BYTES = 256 * 1024  # Chunk size when streaming a cached or temporary file
+EXPORT_CACHE_MAX_BYTES = int(os.environ.get("JOB_TRACKER_EXPORT_CACHE_MB", "256")) * 1024 * 1024
+EXPORT_GZIP_LEVEL = 6
+EXCEL_MAX_ROWS = 1_048_576  # Rows in an Excel sheet, header included
+EXCEL_SHEET_NAME = "Applications"
+
+# Export formats: name -> (label, file extension, MIME type)
+EXPORT_FORMATS = {
+    'csv': ("CSV", "csv", "text/csv"),
+    'csv.gz': ("CSV (gzip)", "csv.gz", "application/gzip"),
+    'jsonl': ("JSON lines", "jsonl", "application/x-ndjson"),
+    'xlsx': ("Excel", "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    'parquet': ("Parquet", "parquet", "application/vnd.apache.parquet"),
+}
+
+def _excel_engine():
+    """The installed Excel writer pandas can use, preferring the faster one, or None"""
+    for engine in ('xlsxwriter', 'openpyxl'):
+        if importlib.util.find_spec(engine) is not None:
+            return engine
+    return None
+
+def available_formats():
+    """Names of the export formats whose writer is installed, in EXPORT_FORMATS order"""
+    missing = set()
+    if _excel_engine() is None:
+        missing.add('xlsx')
+    if importlib.util.find_spec('pyarrow') is None:
+        missing.add('parquet')
+    return [fmt for fmt in EXPORT_FORMATS if fmt not in missing]
+
+def _chunks(df, chunk_rows):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+def _csv_chunks(df, chunk_rows):
+    yield df.iloc[:0].to_csv(index=False).encode('utf-8')
+    for chunk in _chunks(df, chunk_rows):
+        yield chunk.to_csv(index=False, header=False).encode('utf-8')
+
+def _gzip_chunks(df, chunk_rows):
+    compressor = zlib.compressobj(EXPORT_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip framing
+    for data in _csv_chunks(df, chunk_rows):
+        compressed = compressor.compress(data)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def _jsonl_chunks(df, chunk_rows):
+    # to_json(lines=True) builds a JSON array and rewrites it as lines, peaking near ten times
+    # its output, so JSON lines are encoded in smaller chunks
+    for chunk in _chunks(df, max(1, chunk_rows // 5)):
+        chunk = chunk.copy()
+        for col in DATE_COLUMNS:
+            chunk[col] = chunk[col].dt.strftime('%Y-%m-%d')
+        text = chunk.to_json(orient='records', lines=True, force_ascii=False)
+        yield (text if text.endswith("\n") else text + "\n").encode('utf-8')
+
+class _Spool:
+    """Write-only file that hands its contents out as they come, for writers that need tell()"""
+
+    closed = False
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+def _parquet_chunks(df, chunk_rows):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+    spool = _Spool()
+    with pq.ParquetWriter(spool, schema) as writer:
+        for chunk in _chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            yield spool.drain()
+    yield spool.drain()
+
+def _read_chunks(f):
+    while data := f.read(EXPORT_READ_BYTES):
+        yield data
+
+def _excel_chunks(df, chunk_rows):
+    import pandas as pd
+
+    engine = _excel_engine()
+    if engine is None:
+        raise ValueError("Excel export needs the xlsxwriter or openpyxl package")
+    if len(df) + 1 > EXCEL_MAX_ROWS:
+        raise ValueError(f"{len(df):,} applications do not fit in one Excel sheet; export CSV or Parquet instead")
+    # Not xlsxwriter's constant_memory mode: pandas does not write cells in the row order it needs
+    with tempfile.TemporaryFile() as f:
+        with pd.ExcelWriter(f, engine=engine, date_format='YYYY-MM-DD', datetime_format='YYYY-MM-DD') as writer:
+            df.iloc[:0].to_excel(writer, sheet_name=EXCEL_SHEET_NAME, index=False)
+            for i, chunk in enumerate(_chunks(df, chunk_rows)):
+                chunk.to_excel(writer, sheet_name=EXCEL_SHEET_NAME, index=False, header=False,
+                               startrow=1 + i * chunk_rows)
+        f.seek(0)
+        yield from _read_chunks(f)
+
+EXPORT_WRITERS = {
+    'csv': _csv_chunks,
+    'csv.gz': _gzip_chunks,
+    'jsonl': _jsonl_chunks,
+    'xlsx': _excel_chunks,
+    'parquet': _parquet_chunks,
+}
+
+def check_format(fmt):
+    """Return fmt if it names an export format, else raise ValueError"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}': use one of {', '.join(EXPORT_FORMATS)}")
+    return fmt
+
+def iter_export(df, fmt, chunk_rows=EXPORT_CHUNK_ROWS):
+    """The application columns of df encoded as fmt, as a stream of byte chunks"""
+    return EXPORT_WRITERS[check_format(fmt)](df[APPLICATION_COLUMNS], chunk_rows)
+
+def export_file_name(fmt, stem="job_applications"):
+    return f"{stem}.{EXPORT_FORMATS[fmt][1]}"
+
+class ExportCache:
+    """Finished exports spooled to files, one per (store, data version, query, format)
+
+    Bounded by the bytes the files take; the least recently used are deleted first, and an
+    entry is dropped as soon as the same store has a newer version exported. The files live
+    in a private temporary directory removed when the process exits.
+    """
+
+    def __init__(self, max_bytes=EXPORT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        self._entries = OrderedDict()  # key -> (path, bytes)
+        self._directory = None
+        self._lock = threading.Lock()
+
+    def _spool_dir(self):
+        with self._lock:
+            if self._directory is None:
+                self._directory = tempfile.mkdtemp(prefix="job_tracker_exports-")
+                atexit.register(self.clear)
+            return self._directory
+
+    def stream(self, key, produce):
+        """The chunks of the export for key: from its file on a hit, else from produce() while it is saved"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None:
+            try:
+                f = open(entry[0], 'rb')
+            except FileNotFoundError:  # Evicted meanwhile
+                pass
+            else:
+                with self._lock:
+                    self.hits += 1
+                with f:
+                    yield from _read_chunks(f)
+                return
+
+        with self._lock:
+            self.misses += 1
+        fd, tmp_path = tempfile.mkstemp(dir=self._spool_dir(), suffix=".part")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for data in produce():
+                    f.write(data)
+                    yield data
+        except BaseException:  # Including a client that stopped reading
+            os.remove(tmp_path)
+            raise
+        self._store(key, tmp_path)
+
+    def _store(self, key, tmp_path):
+        path = tmp_path[:-len(".part")]
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+        with self._lock:
+            # Older versions of the same store can never be hit again
+            stale = [k for k in self._entries if k[0] == key[0] and k[1] < key[1]] + ([key] if key in self._entries else [])
+            for stale_key in stale:
+                self._drop(stale_key)
+            self._entries[key] = (path, size)
+            self.bytes += size
+            while len(self._entries) > 1 and self.bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key):
+        """Remove one entry and its file; lock must be held"""
+        path, size = self._entries.pop(key)
+        self.bytes -= size
+        try:
+            os.remove(path)
+        except OSError:  # Still open for reading on Windows; the directory goes at exit
+            pass
+
+    def clear(self):
+        """Drop every entry and the spool directory"""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+            if self._directory is not None:
+                shutil.rmtree(self._directory, ignore_errors=True)
+                self._directory = None
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries),
+                    'bytes': self.bytes, 'evictions': self.evictions}
+
+_export_cache = ExportCache()
+
+def get_export_cache():
+    """Process-wide export cache shared by every caller in this process"""
+    return _export_cache
+
+def _query_key(query):
+    """query as a hashable value, with a long keys list reduced to a digest"""
+    query = dict(query)
+    if query.get('keys') is not None:
+        query['keys'] = hashlib.blake2b(np.asarray(query['keys'], dtype=np.int64).tobytes(), digest_size=16).hexdigest()
+    return json.dumps(query, sort_keys=True, default=str)
+
+def stream_export(storage, fmt, query=None, version=None):
+    """Chunks of the applications storage.query(**query) returns, encoded as fmt
+
+    version is the data version the caller read before deciding what to export (read here
+    when None); it keys the cache, so repeating an export of unchanged data streams the
+    saved file.
+    """
+    check_format(fmt)
+    query = query or {}
+    if version is None:
+        version = storage.version()
+    key = (os.path.abspath(storage.path), version, _query_key(query), fmt)
+
+    return get_export_cache().stream(key, lambda: iter_export(storage.query(**query), fmt))
+
+def export_bytes(storage, fmt, query=None, version=None):
+    """The whole export as bytes, for callers that need it in one piece (such as a download button)"""
+    return b"".join(stream_export(storage, fmt, query, version))
@@ -0,0 +1,94 @@
+"""Process-wide registry of derived indexes, each cached for one data version
+
+Indexes are held per workspace. Their memory grows with the applications they cover, so
+once more than DERIVED_INDEX_MAX_ROWS applications are indexed across workspaces, the least
+recently used workspaces drop theirs and rebuild them on their next request.
+"""
+import threading
+from collections import OrderedDict
+
+from .analytics import Aggregates, SalaryIndex
+from .events import EventIndex
+from .profiling import step
+from .search import SearchIndex
+from .workspaces import current_workspace
+
+# Derived structures kept per data version and patched on single-application writes
+DERIVED_INDEXES = {
+    'events': EventIndex,
+    'search': SearchIndex,
+    'aggregates': Aggregates,
+    'salaries': SalaryIndex,
+}
+
+DERIVED_INDEX_MAX_ROWS = 2_000_000  # Applications indexed across all workspaces
+
+_workspaces = OrderedDict()  # Workspace -> {'holders': {index name: holder}, 'rows': int}, least recently used first
+_holders_lock = threading.Lock()
+
+def get_derived_index_holder(name):
+    """Process-wide slot for the current workspace's most recent derived index of one kind"""
+    workspace = current_workspace()
+    with _holders_lock:
+        entry = _workspaces.get(workspace)
+        if entry is None:
+            entry = _workspaces[workspace] = {'holders': {}, 'rows': 0}
+        _workspaces.move_to_end(workspace)
+        return entry['holders'].setdefault(name, {'index': None, 'lock': threading.Lock()})
+
+def _account_rows(workspace, rows):
+    """Record how many applications a workspace's indexes cover, evicting the coldest past the budget"""
+    with _holders_lock:
+        if workspace not in _workspaces:
+            return
+        _workspaces[workspace]['rows'] = rows
+        total = sum(entry['rows'] for entry in _workspaces.values())
+        while total > DERIVED_INDEX_MAX_ROWS and len(_workspaces) > 1:
+            cold = next(iter(_workspaces))
+            if cold == workspace:
+                break
+            total -= _workspaces.pop(cold)['rows']
+
+def get_derived_index(name, df, version):
+    """Derived index for this data version, rebuilt only when the version has moved on"""
+    holder = get_derived_index_holder(name)
+    with holder['lock']:
+        index = holder['index']
+        if index is None or index.version != version:
+            with step(f"build {name} index"):
+                index = holder['index'] = DERIVED_INDEXES[name](df, version)
+            _account_rows(current_workspace(), len(df))
+        return index
+
+def update_derived_index(name, key, before_version, after_version, record):
+    """Apply a single-application change to a cached derived index
+
+    Only done when this write was the only change between the two versions; otherwise
+    the index is left alone and rebuilt on the next read.
+    """
+    holder = get_derived_index_holder(name)
+    with holder['lock']:
+        index = holder['index']
+        if index is None or index.version != before_version or after_version != before_version + 1:
+            return
+        if record is None:
+            index.remove(key)
+        else:
+            index.upsert(key, record)
+        index.version = after_version
+
+def get_event_index(df, version):
+    """Calendar event index for this data version"""
+    return get_derived_index('events', df, version)
+
+def get_search_index(df, version):
+    """Tracker search index for this data version"""
+    return get_derived_index('search', df, version)
+
+def get_aggregates(df, version):
+    """Aggregate counts for this data version"""
+    return get_derived_index('aggregates', df, version)
+
+def get_salary_index(df, version):
+    """Parsed salaries for this data version"""
+    return get_derived_index('salaries', df, version)
@@ -0,0 +1,130 @@
+"""Opt-in timing of named steps, per run, with a rolling JSON-lines log
+
+A run is started with profile_run() around one unit of work (an app rerun, a script).
+Inside it, step(name) blocks, @profiled functions and the methods of @profile_methods
+classes are each recorded with their wall time, nesting depth and, when the run asks for
+allocations, the net memory they allocated (via tracemalloc, which counts every thread).
+
+The active run lives in a context variable, so concurrent sessions record separately.
+With no run active, instrumented code pays a single context-variable lookup per step.
+"""
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+PROFILE_LOG_FILE = "job_tracker_profile.jsonl"
+PROFILE_LOG_MAX_BYTES = 2 * 1024 * 1024  # Rolled over to PROFILE_LOG_FILE + ".1" past this size
+PROFILE_HISTORY = 50  # Finished runs kept in memory for recent_runs()
+
+_current = contextvars.ContextVar('profile_run', default=None)
+_history = deque(maxlen=PROFILE_HISTORY)
+_lock = threading.Lock()
+_tracing_runs = 0  # Runs currently counting allocations; tracemalloc stops when it drops to 0
+_NO_STEP = nullcontext()
+
+class ProfileRun:
+    """The steps recorded during one run, in the order they started"""
+
+    def __init__(self, label, allocations=False):
+        self.label = label
+        self.allocations = allocations
+        self.started = time.time()
+        self.total_ms = None
+        self.steps = []
+        self._depth = 0
+
+    @contextmanager
+    def record(self, name):
+        """Time the enclosed block as a step of this run"""
+        entry = {'step': name, 'depth': self._depth, 'ms': None}
+        self.steps.append(entry)
+        self._depth += 1
+        allocated = tracemalloc.get_traced_memory()[0] if self.allocations else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry['ms'] = round((time.perf_counter() - start) * 1000, 3)
+            if self.allocations:
+                entry['alloc_kb'] = round((tracemalloc.get_traced_memory()[0] - allocated) / 1024, 1)
+            self._depth -= 1
+
+    def to_dict(self):
+        return {'label': self.label, 'started': round(self.started, 3), 'total_ms': self.total_ms,
+                'allocations': self.allocations, 'steps': self.steps}
+
+def step(name):
+    """Context manager recording the enclosed block as a step of the active run, if any"""
+    run = _current.get()
+    return _NO_STEP if run is None else run.record(name)
+
+def profiled(fn=None, *, name=None):
+    """Decorator recording each call as a step named after the function (or name)"""
+    if fn is None:
+        return functools.partial(profiled, name=name)
+    label = name or fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        run = _current.get()
+        if run is None:
+            return fn(*args, **kwargs)
+        with run.record(label):
+            return fn(*args, **kwargs)
+    wrapper.profiled_fn = fn
+    return wrapper
+
+def profile_methods(prefix, *names):
+    """Class decorator recording the named methods as '<prefix>.<method>' steps"""
+    def decorate(cls):
+        for method in names:
+            # A method inherited from a profiled class is relabelled, not recorded twice
+            fn = getattr(cls, method)
+            setattr(cls, method, profiled(getattr(fn, 'profiled_fn', fn), name=f"{prefix}.{method}"))
+        return cls
+    return decorate
+
+def append_log(run, path=PROFILE_LOG_FILE, max_bytes=PROFILE_LOG_MAX_BYTES):
+    """Append one run to the JSON-lines log, rolling the file over once it is too big"""
+    line = json.dumps(run.to_dict(), default=str) + "\n"
+    with _lock:
+        if os.path.exists(path) and os.path.getsize(path) + len(line) > max_bytes:
+            os.replace(path, path + ".1")
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(line)
+
+@contextmanager
+def profile_run(label, allocations=False, log_path=PROFILE_LOG_FILE):
+    """Record every step in the enclosed block as one run, then log it (unless log_path is None)"""
+    global _tracing_runs
+    run = ProfileRun(label, allocations)
+    if allocations:
+        with _lock:
+            _tracing_runs += 1
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+    token = _current.set(run)
+    start = time.perf_counter()
+    try:
+        yield run
+    finally:
+        run.total_ms = round((time.perf_counter() - start) * 1000, 3)
+        _current.reset(token)
+        if allocations:
+            with _lock:
+                _tracing_runs -= 1
+                if not _tracing_runs:
+                    tracemalloc.stop()
+        _history.append(run)
+        if log_path:
+            append_log(run, log_path)
+
+def recent_runs():
+    """The last PROFILE_HISTORY finished runs in this process, oldest first"""
+    return list(_history)
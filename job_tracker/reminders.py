@@ -0,0 +1,48 @@
+"""Deadline, follow-up and interview reminders for the dashboard"""
+from dataclasses import dataclass
+
+import pandas as pd
+
+# Reminder windows, in days from today (inclusive)
+DEADLINE_ALERT_DAYS = 7
+FOLLOW_UP_ALERT_DAYS = 3
+INTERVIEW_ALERT_DAYS = 2
+WEEK_DAYS = 7
+
+@dataclass
+class Reminders:
+    """Everything the dashboard shows, computed in one pass over the applications"""
+    upcoming_deadlines: pd.DataFrame
+    follow_ups: pd.DataFrame
+    upcoming_interviews: pd.DataFrame
+    interviews_this_week: int = 0
+    follow_ups_this_week: int = 0
+
+def days_until(df, col, today):
+    """Whole days from today until each date in col (NaN where missing)"""
+    if col not in df.columns:
+        return pd.Series(float('nan'), index=df.index)
+    return (pd.to_datetime(df[col], errors='coerce') - pd.Timestamp(today)).dt.days
+
+def compute_reminders(df, today=None):
+    """Normalize each reminder date column once and evaluate every alert window and counter"""
+    today = today or pd.Timestamp.now().date()
+    deadline_days = days_until(df, 'deadline', today)
+    follow_up_days = days_until(df, 'follow_up_date', today)
+    interview_days = days_until(df, 'interview_date', today)
+
+    def alerts(days, col, window):
+        if col not in df.columns:
+            return pd.DataFrame(columns=['company', 'job_title', col, 'days_left'])
+        mask = days.between(0, window)
+        hits = df.loc[mask, ['company', 'job_title', col]].copy()
+        hits['days_left'] = days[mask].astype(int)
+        return hits.sort_values('days_left')
+
+    return Reminders(
+        upcoming_deadlines=alerts(deadline_days, 'deadline', DEADLINE_ALERT_DAYS),
+        follow_ups=alerts(follow_up_days, 'follow_up_date', FOLLOW_UP_ALERT_DAYS),
+        upcoming_interviews=alerts(interview_days, 'interview_date', INTERVIEW_ALERT_DAYS),
+        interviews_this_week=int(interview_days.between(0, WEEK_DAYS).sum()),
+        follow_ups_this_week=int(follow_up_days.between(0, WEEK_DAYS).sum()),
+    )
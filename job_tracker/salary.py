@@ -0,0 +1,113 @@
+"""Free-text salary parsing
+
+parse_salaries turns strings such as "$80k-$100k", "4,000", "€50-60k/yr" or "$45/hr" into
+numeric salary_min/salary_max plus a currency code and pay period. Parsing runs once per
+distinct string with vectorized (Arrow) regexes, so large columns with repeated values are cheap.
+pyarrow is only imported on the first parse, keeping it off the import path of the package.
+"""
+import numpy as np
+import pandas as pd
+
+SALARY_COLUMNS = ['salary_min', 'salary_max', 'salary_currency', 'salary_period']
+
+# Currency markers, most specific first: (regex, ISO code)
+CURRENCY_PATTERNS = [
+    (r"ca\$|c\$|\bcad\b", 'CAD'),
+    (r"a\$|au\$|\baud\b", 'AUD'),
+    (r"us\$|\$|\busd\b", 'USD'),
+    (r"€|\beur\b|euros?\b", 'EUR'),
+    (r"£|\bgbp\b", 'GBP'),
+    (r"₹|\binr\b|\brs\.?", 'INR'),
+    (r"¥|\bjpy\b", 'JPY'),
+    (r"\bchf\b", 'CHF'),
+]
+
+# Pay period markers: (regex, period)
+PERIOD_PATTERNS = [
+    (r"/\s*h(?:ou)?r\b|per\s+hour|hourly|\bph\b", 'hour'),
+    (r"/\s*day\b|per\s+day|daily", 'day'),
+    (r"/\s*w(?:ee)?k\b|per\s+week|weekly", 'week'),
+    (r"/\s*mo(?:nth)?\b|per\s+month|monthly|\bpm\b", 'month'),
+    (r"/\s*y(?:ea)?r\b|per\s+year|per\s+annum|annual|yearly|\bp\.?a\b\.?", 'year'),
+]
+
+# Multipliers to turn a salary in each period into a yearly amount
+ANNUAL_FACTORS = {'hour': 2080, 'day': 260, 'week': 52, 'month': 12, 'year': 1}
+
+# Amounts without a stated period: below HOURLY_MAX are hourly, below MONTHLY_MAX monthly
+HOURLY_MAX = 300
+MONTHLY_MAX = 20000
+
+RANGE_RE = (r"(?P<low>\d[\d,]*(?:\.\d+)?)\s*(?P<low_suffix>[km])?\b"
+            r"(?:\s*(?:-|–|—|to)\s*\D{0,4}?(?P<high>\d[\d,]*(?:\.\d+)?)\s*(?P<high_suffix>[km])?\b)?")
+SUFFIXES = {'k': 1e3, 'm': 1e6}
+
+def _group(parts, name):
+    """One named regex group, null where it did not take part in the match"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    values = pc.struct_field(parts, [name])
+    return pc.if_else(pc.equal(values, ""), pa.scalar(None, pa.string()), values)
+
+def _amount(number, suffix):
+    """Numbers like '80', '4,000' or '1.5' with an optional k/m suffix applied, as floats"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    value = pc.cast(pc.replace_substring(number, ",", ""), pa.float64())
+    scale = pc.fill_null(pc.if_else(pc.equal(suffix, "k"), SUFFIXES['k'], SUFFIXES['m']), 1.0)
+    return pc.multiply(value, scale).to_numpy(zero_copy_only=False)
+
+def _first_match(text, patterns):
+    """Label of the first pattern that matches each string (None when none does)"""
+    import pyarrow.compute as pc
+    return np.select([pc.match_substring_regex(text, pattern).to_numpy(zero_copy_only=False) for pattern, _ in patterns],
+                     [label for _, label in patterns], default=None)
+
+def _parse_unique(text):
+    """Parse an Arrow array of distinct lowercase salary strings into the SALARY_COLUMNS frame
+
+    The regexes run in Arrow's C++ engine, not per row in Python.
+    """
+    import pyarrow.compute as pc
+    parts = pc.extract_regex(text, RANGE_RE)
+    low_number, high_number = _group(parts, 'low'), _group(parts, 'high')
+    low_suffix, high_suffix = _group(parts, 'low_suffix'), _group(parts, 'high_suffix')
+    # "80-100k": a bare low end borrows the high end's suffix
+    borrow = pc.fill_null(pc.and_(pc.is_null(low_suffix), pc.less_equal(pc.utf8_length(low_number), 3)), False)
+    low_suffix = pc.if_else(borrow, high_suffix, low_suffix)
+    low = _amount(low_number, low_suffix)
+    high = _amount(high_number, high_suffix)
+    high = np.where(np.isnan(high), low, high)
+    low, high = np.fmin(low, high), np.fmax(low, high)
+
+    currency = _first_match(text, CURRENCY_PATTERNS)
+    period = _first_match(text, PERIOD_PATTERNS)
+    inferred = np.select([high < HOURLY_MAX, high < MONTHLY_MAX], ['hour', 'month'], default='year')
+    period = np.where(pd.isna(period), inferred, period)
+
+    frame = pd.DataFrame({'salary_min': low, 'salary_max': high, 'salary_currency': currency,
+                          'salary_period': period})
+    frame.loc[np.isnan(low), ['salary_currency', 'salary_period']] = None
+    return frame
+
+def parse_salaries(salary_range):
+    """Parse a salary_range Series into the SALARY_COLUMNS frame with the same index
+
+    Values with no number in them (missing, "Competitive", ...) get missing amounts.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    codes, uniques = pd.factorize(salary_range.astype(object), use_na_sentinel=True)
+    parsed = _parse_unique(pc.utf8_lower(pa.array(uniques, type=pa.string())))
+    # One extra all-missing row for the values factorize marked as missing (code -1)
+    parsed = pd.concat([parsed, pd.DataFrame([[np.nan, np.nan, None, None]], columns=SALARY_COLUMNS)],
+                       ignore_index=True)
+    frame = parsed.iloc[np.where(codes < 0, len(parsed) - 1, codes)]
+    frame.index = salary_range.index
+    return frame.astype({'salary_min': float, 'salary_max': float,
+                         'salary_currency': 'category', 'salary_period': 'category'})
+
+def annual_midpoints(salaries):
+    """Midpoint of each parsed salary converted to a yearly amount"""
+    factors = salaries['salary_period'].astype(object).map(ANNUAL_FACTORS).astype(float)
+    return (salaries['salary_min'] + salaries['salary_max']) / 2 * factors
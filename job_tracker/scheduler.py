@@ -0,0 +1,329 @@
+"""Reminder scheduler: upcoming reminders in a min-heap, fired by a background thread
+
+Every deadline, follow-up and interview date is one reminder, due at midnight (local time)
+on the day it enters its dashboard alert window: DEADLINE_ALERT_DAYS before a deadline,
+and so on. Pending reminders wait in a heap ordered by due time. The thread sleeps until
+the earliest one is due (or an edit schedules an earlier one), pops everything due and
+passes each reminder to a hook, by default one appending it to the outbox file as a JSON
+line. Fired reminder ids are kept in fired.json under a lock file, so neither a restart
+nor a second process serving the same workspace sends one twice.
+
+The service patches the heap on each single-application write, like the derived indexes;
+any other change (a full save, a write from another process) is noticed from the data
+version and rebuilds it. Entries of changed or deleted applications stay in the heap and
+are skipped when popped, since they no longer match the application's reminders.
+
+The same events make up an iCalendar feed, kept as one cached block of VEVENTs per
+application: an edit re-renders only that application's block, and the feed (also written
+to reminders.ics) is those blocks joined, so calendar clients polling it never cause a
+recompute.
+"""
+import heapq
+import json
+import os
+import threading
+from datetime import datetime, time, timedelta, timezone
+
+import pandas as pd
+
+from .reminders import DEADLINE_ALERT_DAYS, FOLLOW_UP_ALERT_DAYS, INTERVIEW_ALERT_DAYS
+from .storage import FileLock, atomic_write
+
+REMINDER_DIR = "reminders"
+OUTBOX_FILE = "outbox.jsonl"
+ICS_FILE = "reminders.ics"
+FIRED_FILE = "fired.json"
+REMINDER_POLL_SECONDS = 30  # Longest sleep; also how soon changes made elsewhere are picked up
+REMINDER_RETRY_SECONDS = 60  # Wait before retrying reminders whose hook failed
+ICS_PRODID = "-//Job Application Tracker//Reminders//EN"
+
+# Reminder sources: date column -> (type, label, days of notice before the date)
+REMINDER_COLUMNS = {
+    'deadline': ('deadline', "Deadline", DEADLINE_ALERT_DAYS),
+    'follow_up_date': ('follow_up', "Follow-up", FOLLOW_UP_ALERT_DAYS),
+    'interview_date': ('interview', "Interview", INTERVIEW_ALERT_DAYS),
+}
+
+# Columns a rebuild reads from the store
+REMINDER_SOURCE_COLUMNS = ['company', 'job_title', *REMINDER_COLUMNS]
+
+def _text(value):
+    return "" if value is None or value is pd.NA or (isinstance(value, float) and value != value) else str(value)
+
+def make_reminder(key, column, day, company, job_title):
+    """The reminder for one application date, as a JSON-ready dict"""
+    kind, label, notice = REMINDER_COLUMNS[column]
+    return {'id': f"{int(key)}-{kind}-{day:%Y%m%d}", 'key': int(key), 'type': kind, 'column': column,
+            'date': day.isoformat(), 'due': datetime.combine(day - timedelta(days=notice), time()).isoformat(),
+            'notice_days': notice, 'company': _text(company), 'job_title': _text(job_title)}
+
+def application_reminders(key, record):
+    """{reminder id: reminder} for one application's dates"""
+    reminders = {}
+    for column in REMINDER_COLUMNS:
+        day = pd.to_datetime(record.get(column), errors='coerce')
+        if not pd.isna(day):
+            reminder = make_reminder(key, column, day.date(), record.get('company'), record.get('job_title'))
+            reminders[reminder['id']] = reminder
+    return reminders
+
+def all_reminders(df):
+    """{key: {reminder id: reminder}} for every application in df"""
+    reminders = {}
+    for column in REMINDER_COLUMNS:
+        if column not in df.columns:
+            continue
+        dates = pd.to_datetime(df[column], errors='coerce')
+        present = dates.notna().to_numpy()
+        rows = df.loc[present, ['company', 'job_title']]
+        for key, day, company, job_title in zip(rows.index, dates[present].dt.date, rows['company'], rows['job_title']):
+            reminder = make_reminder(key, column, day, company, job_title)
+            reminders.setdefault(int(key), {})[reminder['id']] = reminder
+    return reminders
+
+def _ics_escape(text):
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+def _ics_fold(line):
+    """Split a content line into 75-octet pieces joined by CRLF + space, as RFC 5545 asks"""
+    data = line.encode('utf-8')
+    if len(data) <= 75:
+        return line + "\r\n"
+    pieces, start, limit = [], 0, 75
+    while start < len(data):
+        end = min(start + limit, len(data))
+        while end < len(data) and (data[end] & 0xC0) == 0x80:  # Never split a UTF-8 sequence
+            end -= 1
+        pieces.append(data[start:end].decode('utf-8'))
+        start, limit = end, 74  # Continuation lines start with the space
+    return "\r\n ".join(pieces) + "\r\n"
+
+def ics_events(reminders, stamp):
+    """The VEVENT block for one application's reminders"""
+    lines = []
+    for reminder in reminders.values():
+        _, label, notice = REMINDER_COLUMNS[reminder['column']]
+        day = datetime.fromisoformat(reminder['date']).date()
+        title = " - ".join(part for part in (reminder['company'], reminder['job_title']) if part)
+        summary = _ics_escape(f"{label}: {title}")
+        lines += ["BEGIN:VEVENT", f"UID:{reminder['id']}@job-tracker", f"DTSTAMP:{stamp}",
+                  f"DTSTART;VALUE=DATE:{day:%Y%m%d}", f"DTEND;VALUE=DATE:{day + timedelta(days=1):%Y%m%d}",
+                  f"SUMMARY:{summary}", f"CATEGORIES:{reminder['type'].upper()}",
+                  "BEGIN:VALARM", "ACTION:DISPLAY", f"DESCRIPTION:{summary}", f"TRIGGER:-P{notice}D", "END:VALARM",
+                  "END:VEVENT"]
+    return "".join(_ics_fold(line) for line in lines)
+
+def outbox_hook(path):
+    """A hook appending each fired reminder to path as one JSON line"""
+    def write(reminder):
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({**reminder, 'fired_at': datetime.now().isoformat(timespec='seconds')}) + "\n")
+    return write
+
+class ReminderScheduler:
+    """Background thread firing reminders of a store when they fall due, and keeping its .ics feed"""
+
+    def __init__(self, storage, directory=REMINDER_DIR, hook=None, poll_seconds=REMINDER_POLL_SECONDS,
+                 retry_seconds=REMINDER_RETRY_SECONDS, clock=datetime.now):
+        self.storage = storage
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.hook = hook or outbox_hook(os.path.join(directory, OUTBOX_FILE))
+        self.poll_seconds = poll_seconds
+        self.retry_seconds = retry_seconds
+        self.clock = clock
+        self.version = None  # Data version the heap and feed reflect
+        self.fired = 0  # Reminders passed to the hook by this scheduler
+        self.rebuilds = 0
+        self.last_error = None
+        self._heap = []  # (due datetime, reminder id, key); may hold entries no longer current
+        self._reminders = {}  # Key -> {reminder id: reminder}, the current ones
+        self._blocks = {}  # Key -> that application's VEVENT block
+        self._stamp = None
+        self._feed = None  # (version, bytes) of the joined feed
+        self._feed_written = None  # Version of the feed in ICS_FILE
+        self._lock = threading.RLock()
+        self._file_lock = FileLock(os.path.join(directory, "reminders.lock"))
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Build the heap and start the background thread (once)"""
+        if self._thread is None:
+            self.sync()
+            self._thread = threading.Thread(target=self._run, name="reminders", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the thread and bring the feed file up to date"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.write_feed()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.sync()
+                self.fire_due()
+                self.write_feed()
+                self.last_error = None
+            except Exception as e:  # Keep the thread alive; the next wake-up retries
+                self.last_error = e
+            timeout = self.poll_seconds
+            due = self.next_due()
+            if due is not None:
+                timeout = min(timeout, max(0.0, (due - self.clock()).total_seconds()))
+            self._wake.wait(timeout)
+            self._wake.clear()
+
+    def _read_fired(self):
+        path = os.path.join(self.directory, FIRED_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def sync(self):
+        """Rebuild the heap and feed from the store if its version moved on without us"""
+        version = self.storage.version()
+        with self._lock:
+            if version == self.version:
+                return False
+        df = self.storage.load(columns=REMINDER_SOURCE_COLUMNS)
+        with self._file_lock:
+            fired = self._read_fired()
+        today = self.clock().date().isoformat()
+        reminders = all_reminders(df)
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        heap = [(datetime.fromisoformat(r['due']), rid, key) for key, items in reminders.items()
+                for rid, r in items.items() if r['date'] >= today and rid not in fired]
+        heapq.heapify(heap)
+        blocks = {key: ics_events(items, stamp) for key, items in reminders.items()}
+        with self._lock:
+            self._heap, self._reminders, self._blocks, self._stamp = heap, reminders, blocks, stamp
+            self.version = version
+            self.rebuilds += 1
+        self._wake.set()  # The thread's next wake-up may have moved
+        return True
+
+    def apply(self, key, before_version, after_version, record):
+        """Patch in one application's change (record None: deleted), made as version before -> after
+
+        Applied only when this write was the only change between the two versions; otherwise
+        the thread is woken to rebuild from the store.
+        """
+        key = int(key)
+        with self._lock:
+            if self.version != before_version or after_version != before_version + 1:
+                self._wake.set()
+                return
+            old = self._reminders.pop(key, {})
+            self._blocks.pop(key, None)
+            if record is not None:
+                new = application_reminders(key, record)
+                if new:
+                    self._reminders[key] = new
+                    self._blocks[key] = ics_events(new, self._stamp)
+                today = self.clock().date().isoformat()
+                earliest = self._heap[0][0] if self._heap else None
+                for rid, reminder in new.items():
+                    if rid not in old and reminder['date'] >= today:
+                        entry = (datetime.fromisoformat(reminder['due']), rid, key)
+                        heapq.heappush(self._heap, entry)
+                        if earliest is None or entry[0] < earliest:
+                            self._wake.set()
+            self.version = after_version
+            self._compact()
+
+    def _compact(self):
+        """Drop stale heap entries once they outnumber the current ones"""
+        if len(self._heap) > 64 and len(self._heap) > 2 * sum(len(items) for items in self._reminders.values()):
+            self._heap = [entry for entry in self._heap if entry[1] in self._reminders.get(entry[2], ())]
+            heapq.heapify(self._heap)
+
+    def _peek(self):
+        """The earliest current heap entry, discarding stale ones above it"""
+        while self._heap and self._heap[0][1] not in self._reminders.get(self._heap[0][2], ()):
+            heapq.heappop(self._heap)
+        return self._heap[0] if self._heap else None
+
+    def next_due(self):
+        """When the next reminder is due, or None"""
+        with self._lock:
+            entry = self._peek()
+            return entry and entry[0]
+
+    def next_reminder(self):
+        """The next reminder to fire, or None, brought up to date first"""
+        self.sync()
+        with self._lock:
+            entry = self._peek()
+            return entry and self._reminders[entry[2]][entry[1]]
+
+    def pending(self):
+        """How many entries wait in the heap (stale ones included until compacted)"""
+        with self._lock:
+            return len(self._heap)
+
+    def fire_due(self):
+        """Pass every reminder due by now to the hook, once; returns the ones fired"""
+        now = self.clock()
+        with self._lock:
+            due = []
+            while (entry := self._peek()) is not None and entry[0] <= now:
+                heapq.heappop(self._heap)
+                due.append(self._reminders[entry[2]][entry[1]])
+        if not due:
+            return []
+        today = now.date().isoformat()
+        done = []
+        with self._file_lock:
+            fired = {rid: day for rid, day in self._read_fired().items() if day >= today}
+            for i, reminder in enumerate(due):
+                if reminder['id'] in fired or reminder['date'] < today:
+                    continue
+                try:
+                    self.hook(reminder)
+                except Exception:
+                    # Put this one and the rest back for a retry
+                    retry = now + timedelta(seconds=self.retry_seconds)
+                    with self._lock:
+                        for rest in due[i:]:
+                            heapq.heappush(self._heap, (retry, rest['id'], rest['key']))
+                    self._write_fired(fired)
+                    raise
+                fired[reminder['id']] = reminder['date']
+                done.append(reminder)
+            self._write_fired(fired)
+        self.fired += len(done)
+        return done
+
+    def _write_fired(self, fired):
+        with atomic_write(os.path.join(self.directory, FIRED_FILE)) as f:
+            json.dump(fired, f)
+
+    def feed(self):
+        """(data version, iCalendar bytes) of every reminder date, brought up to date first"""
+        self.sync()
+        with self._lock:
+            if self._feed is None or self._feed[0] != self.version:
+                text = ("BEGIN:VCALENDAR\r\nVERSION:2.0\r\n" + _ics_fold(f"PRODID:{ICS_PRODID}")
+                        + "CALSCALE:GREGORIAN\r\nX-WR-CALNAME:Job applications\r\n"
+                        + "".join(self._blocks.values()) + "END:VCALENDAR\r\n")
+                self._feed = (self.version, text.encode('utf-8'))
+            return self._feed
+
+    def write_feed(self):
+        """Write the feed to ICS_FILE if it changed since it was last written"""
+        version, data = self.feed()
+        if version == self._feed_written:
+            return
+        with self._file_lock:
+            with atomic_write(os.path.join(self.directory, ICS_FILE), mode='wb') as f:
+                f.write(data)
+        self._feed_written = version
@@ -0,0 +1,107 @@
+"""Column schema for job applications
+
+Every column's dtype is defined here once. The loaders, the add/edit forms and the
+savers all go through apply_schema/coerce_record so filters compare typed values:
+closed categoricals for the enum fields, datetime64 (NaT when missing) for the dates
+and pandas strings for free text.
+"""
+from datetime import date, datetime
+
+import pandas as pd
+
+# Allowed values for the enum fields, in display order
+STATUS_OPTIONS = ["Applied", "Interviewing", "Pending", "Offered", "Rejected", "Withdrawn"]
+PRIORITY_OPTIONS = ["High", "Medium", "Low"]
+CHANNEL_OPTIONS = ["LinkedIn", "Company Website", "Referral", "Indeed", "Glassdoor", "Other"]
+REFERRAL_OPTIONS = ["No", "Yes"]
+ACTIVE_STATUSES = ['Applied', 'Interviewing', 'Pending']  # Statuses still awaiting an outcome
+
+CATEGORY_COLUMNS = {
+    'status': STATUS_OPTIONS,
+    'priority': PRIORITY_OPTIONS,
+    'channel': CHANNEL_OPTIONS,
+    'referral': REFERRAL_OPTIONS,
+}
+DATE_COLUMNS = ['date_applied', 'follow_up_date', 'deadline', 'interview_date']
+TEXT_COLUMNS = ['job_title', 'company', 'salary_range', 'location', 'notes', 'application_id',
+                'contact_person', 'contact_email']
+
+# Column order used for storage and display
+APPLICATION_COLUMNS = [
+    'job_title', 'company', 'status', 'priority', 'channel', 'salary_range', 'location',
+    'date_applied', 'follow_up_date', 'deadline', 'interview_date', 'notes', 'referral',
+    'application_id', 'contact_person', 'contact_email'
+]
+
+DATE_DTYPE = 'datetime64[ns]'
+TEXT_DTYPE = pd.StringDtype()
+
+SCHEMA = {
+    **{col: pd.CategoricalDtype(options) for col, options in CATEGORY_COLUMNS.items()},
+    **{col: DATE_DTYPE for col in DATE_COLUMNS},
+    **{col: TEXT_DTYPE for col in TEXT_COLUMNS},
+}
+
+def apply_schema(df):
+    """Add any missing schema columns and cast every column to its dtype, in place
+
+    Enum values outside the allowed options become missing. Extra columns are kept as is.
+    Returns df for chaining.
+    """
+    for col in APPLICATION_COLUMNS:
+        dtype = SCHEMA[col]
+        if col not in df.columns:
+            df[col] = pd.Series(pd.NA if dtype is TEXT_DTYPE else None, index=df.index, dtype=dtype)
+        elif col in DATE_COLUMNS:
+            if df[col].dtype != DATE_DTYPE:
+                df[col] = pd.to_datetime(df[col], errors='coerce').astype(DATE_DTYPE)
+        elif df[col].dtype != dtype:
+            values = df[col]
+            if col in CATEGORY_COLUMNS:
+                values = values.astype(object).where(values.notna(), None)
+            df[col] = values.astype(dtype)
+    return df
+
+def empty_frame():
+    """An empty DataFrame with the full schema"""
+    return apply_schema(pd.DataFrame(index=pd.Index([], dtype='int64')))
+
+def coerce_record(record):
+    """Validate and convert one record from a form, journal or import
+
+    Raises ValueError for enum values outside the allowed options.
+    """
+    clean = {}
+    for col, value in record.items():
+        if col not in SCHEMA:
+            clean[col] = value
+            continue
+        missing = value is None or value == '' or (not isinstance(value, str) and pd.isna(value))
+        if col in CATEGORY_COLUMNS:
+            if missing:
+                clean[col] = None
+            elif value not in CATEGORY_COLUMNS[col]:
+                raise ValueError(f"Invalid {col} '{value}'; expected one of {', '.join(CATEGORY_COLUMNS[col])}")
+            else:
+                clean[col] = value
+        elif col in DATE_COLUMNS:
+            clean[col] = pd.NaT if missing else pd.Timestamp(value).normalize()
+        else:
+            clean[col] = None if missing else str(value)
+    return clean
+
+def option_index(options, value, default=0):
+    """Position of value in options for a selectbox, falling back to default"""
+    return options.index(value) if value in options else default
+
+def text_value(value):
+    """A text column value as a plain string for text inputs ('' when missing)"""
+    return '' if value is None or (not isinstance(value, str) and pd.isna(value)) else str(value)
+
+def date_value(value):
+    """A date column value as a datetime.date for date inputs (None when missing)"""
+    if value is None or pd.isna(value):
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    return value if isinstance(value, date) else pd.Timestamp(value).date()
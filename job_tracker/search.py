@@ -0,0 +1,149 @@
+"""Inverted index for the tracker's free-text search"""
+import bisect
+import re
+
+import numpy as np
+
+from .schema import TEXT_COLUMNS
+
+# Search index settings: text fields that rank higher when they match
+SEARCH_FIELD_WEIGHTS = {'job_title': 2, 'company': 2}
+SEARCH_TOKEN_RE = re.compile(r"\w+")
+
+def search_tokens(text):
+    """Lowercased word tokens of a piece of text"""
+    return SEARCH_TOKEN_RE.findall(text.lower())
+
+def trigrams(token):
+    """The set of three-character substrings of a token"""
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+class SearchIndex:
+    """Inverted index over every text field for the tracker search box
+
+    Postings map each token to {key: field weight}. A sorted vocabulary answers prefix
+    matches with a binary search, and a trigram -> tokens map answers matches inside a
+    word. Like EventIndex it remembers its data version; upsert/remove keep it current.
+    """
+
+    def __init__(self, df, version=None):
+        self.version = version
+        self._postings = {}
+        self._doc_tokens = {}
+        self._vocab = []
+        self._trigrams = {}
+        self._arrays = {}
+        docs = {}
+        for col in TEXT_COLUMNS:
+            if col not in df.columns:
+                continue
+            weight = SEARCH_FIELD_WEIGHTS.get(col, 1)
+            for key, text in zip(df.index, df[col].to_numpy(dtype=object)):
+                if isinstance(text, str) and text:
+                    doc = docs.setdefault(key, {})
+                    for token in search_tokens(text):
+                        if doc.get(token, 0) < weight:
+                            doc[token] = weight
+        for key, doc in docs.items():
+            self._add_doc(key, doc, sort_vocab=False)
+        self._vocab.sort()
+
+    def __len__(self):
+        return len(self._doc_tokens)
+
+    def _add_doc(self, key, doc, sort_vocab=True):
+        self._doc_tokens[key] = doc
+        for token, weight in doc.items():
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = {}
+                if sort_vocab:
+                    bisect.insort(self._vocab, token)
+                else:
+                    self._vocab.append(token)
+                for gram in trigrams(token):
+                    self._trigrams.setdefault(gram, set()).add(token)
+            posting[key] = weight
+            self._arrays.pop(token, None)
+
+    def remove(self, key):
+        """Drop the application with this key from the index"""
+        doc = self._doc_tokens.pop(key, None)
+        if not doc:
+            return
+        for token in doc:
+            posting = self._postings[token]
+            del posting[key]
+            self._arrays.pop(token, None)
+            if posting:
+                continue
+            # Last application using this token: forget the token entirely
+            del self._postings[token]
+            del self._vocab[bisect.bisect_left(self._vocab, token)]
+            for gram in trigrams(token):
+                tokens = self._trigrams[gram]
+                tokens.discard(token)
+                if not tokens:
+                    del self._trigrams[gram]
+
+    def upsert(self, key, record):
+        """Re-index one application from its record"""
+        self.remove(key)
+        doc = {}
+        for col in TEXT_COLUMNS:
+            text = record.get(col)
+            if isinstance(text, str) and text:
+                weight = SEARCH_FIELD_WEIGHTS.get(col, 1)
+                for token in search_tokens(text):
+                    if doc.get(token, 0) < weight:
+                        doc[token] = weight
+        if doc:
+            self._add_doc(key, doc)
+
+    def _posting_arrays(self, token):
+        """(keys, weights) arrays for a token, cached until the token's postings change"""
+        arrays = self._arrays.get(token)
+        if arrays is None:
+            posting = self._postings[token]
+            arrays = self._arrays[token] = (np.fromiter(posting.keys(), dtype=np.int64, count=len(posting)),
+                                            np.fromiter(posting.values(), dtype=np.int64, count=len(posting)))
+        return arrays
+
+    def _term_scores(self, term):
+        """Sorted keys and scores for one query term: whole word 3, word prefix 2, inside a word 1"""
+        start = bisect.bisect_left(self._vocab, term)
+        end = bisect.bisect_left(self._vocab, term + "\uffff", start)
+        matches = [(token, 3 if token == term else 2) for token in self._vocab[start:end]]
+        if len(term) >= 3:
+            grams = sorted((self._trigrams.get(gram, set()) for gram in trigrams(term)), key=len)
+            inside = set.intersection(*grams) if grams[0] else set()
+            matches += [(token, 1) for token in inside if term in token and not token.startswith(term)]
+        if not matches:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        parts = [self._posting_arrays(token) for token, _ in matches]
+        keys = np.concatenate([part_keys for part_keys, _ in parts])
+        scores = np.concatenate([weights * boost for (_, weights), (_, boost) in zip(parts, matches)])
+        # Keep each application's best match for this term
+        order = np.lexsort((-scores, keys))
+        keys, scores = keys[order], scores[order]
+        first = np.ones(len(keys), dtype=bool)
+        first[1:] = keys[1:] != keys[:-1]
+        return keys[first], scores[first]
+
+    def search(self, query, limit=None):
+        """Keys of applications matching every term in query, best matches first"""
+        terms = list(dict.fromkeys(search_tokens(query)))
+        if not terms:
+            return []
+        keys = scores = None
+        # Most selective terms first so the running intersection stays small
+        for term_keys, term_scores in sorted((self._term_scores(term) for term in terms), key=lambda ks: len(ks[0])):
+            if keys is None:
+                keys, scores = term_keys, term_scores
+            else:
+                keys, left, right = np.intersect1d(keys, term_keys, assume_unique=True, return_indices=True)
+                scores = scores[left] + term_scores[right]
+            if not len(keys):
+                return []
+        ranked = keys[np.lexsort((keys, -scores))]
+        return (ranked if limit is None else ranked[:limit]).tolist()
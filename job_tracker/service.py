@@ -0,0 +1,226 @@
+"""Headless entry points over the configured storage backend
+
+These are what the Streamlit app, scripts and scheduled jobs call to read and write
+applications. Errors are raised (StaleWriteError for conflicting writes) rather than
+reported, so each caller decides how to surface them. Single-application writes also
+patch the cached derived indexes and the reminder scheduler's heap. Everything acts on the current workspace (see
+job_tracker.workspaces), each of which has its own store and backups.
+
+A process keeps the store, backup thread and reminder thread of at most
+ACTIVE_WORKSPACES_MAX workspaces. Opening one more shuts down the least recently used
+workspace's threads (writing out its last backup, feed and queued edits) and drops them;
+they are started again the next time that workspace is used.
+"""
+import atexit
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+
+import pandas as pd
+
+from .backups import BACKUP_DIR, BackupManager
+from .indexes import DERIVED_INDEXES, update_derived_index
+from .scheduler import REMINDER_DIR, ReminderScheduler
+from .schema import apply_schema
+from .storage import (ARROW_FILE, DATA_FILE, DB_FILE, STORAGE_BACKEND, ArrowBackend, CSVBackend, SQLiteBackend,
+                      migrate_csv_to_sqlite, migrate_to_arrow)
+from .workspaces import current_workspace, workspace_path
+from .write_behind import WRITE_BEHIND, WriteBehindStore
+
+# Workspaces with an open store and running threads; one used again after its eviction pays
+# for starting its reminder scheduler (a rebuild of its heap and feed) once more
+ACTIVE_WORKSPACES_MAX = int(os.environ.get("JOB_TRACKER_ACTIVE_WORKSPACES", "64"))
+
+# Workspace name (None: default) -> {'storage', 'backups', 'scheduler', 'lock', 'closed'} (the
+# threads are None until first used), least recently used first
+_workspaces = OrderedDict()
+_evicting = {}  # Workspace -> event set once its evicted threads and store are shut down
+_storage_lock = threading.Lock()
+
+def open_storage(backend=STORAGE_BACKEND, workspace=None):
+    """A new storage backend of the given kind ("sqlite", "csv" or "arrow") on a workspace's files"""
+    data_file = workspace_path(DATA_FILE, workspace)
+    if backend == "csv":
+        return CSVBackend(data_file)
+    if backend == "arrow":
+        arrow_file = workspace_path(ARROW_FILE, workspace)
+        if not os.path.exists(arrow_file):
+            migrate_to_arrow(data_file, arrow_file)
+        return ArrowBackend(arrow_file)
+    if backend == "sqlite":
+        db_file = workspace_path(DB_FILE, workspace)
+        if not os.path.exists(db_file):
+            migrate_csv_to_sqlite(data_file, db_file)
+        return SQLiteBackend(db_file)
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+def _open_workspace(workspace):
+    storage = open_storage(workspace=workspace)
+    if WRITE_BEHIND:
+        storage = WriteBehindStore(storage).start()
+        atexit.register(storage.close)
+    return {'storage': storage, 'backups': None, 'scheduler': None, 'lock': threading.Lock(), 'closed': False}
+
+def _start_backups(workspace, storage):
+    backups = BackupManager(storage, workspace_path(BACKUP_DIR, workspace)).start()
+    atexit.register(backups.stop)
+    return backups
+
+def _start_scheduler(workspace, storage):
+    scheduler = ReminderScheduler(storage, workspace_path(REMINDER_DIR, workspace)).start()
+    atexit.register(scheduler.stop)
+    return scheduler
+
+def _close_workspace(entry):
+    """Stop an evicted workspace's threads, writing out what they still hold"""
+    with entry['lock']:
+        entry['closed'] = True
+    try:
+        if entry['scheduler'] is not None:
+            atexit.unregister(entry['scheduler'].stop)
+            entry['scheduler'].stop()
+        if entry['backups'] is not None:
+            atexit.unregister(entry['backups'].stop)
+            entry['backups'].stop()
+    finally:
+        if isinstance(entry['storage'], WriteBehindStore):
+            atexit.unregister(entry['storage'].close)
+            entry['storage'].close()
+
+def _workspace_part(part, start=None):
+    """The current workspace's storage, backups or scheduler, opened or started on first use
+
+    Marks the workspace as the most recently used, and evicts the least recently used one
+    once more than ACTIVE_WORKSPACES_MAX are open.
+    """
+    workspace = current_workspace()
+    while True:
+        with _storage_lock:
+            evicting = _evicting.get(workspace)
+            if evicting is None:
+                entry = _workspaces.get(workspace)
+                if entry is None:
+                    entry = _workspaces[workspace] = _open_workspace(workspace)
+                _workspaces.move_to_end(workspace)
+                evicted = None
+                if len(_workspaces) > max(ACTIVE_WORKSPACES_MAX, 1):
+                    evicted, evicted_entry = _workspaces.popitem(last=False)
+                    _evicting[evicted] = threading.Event()
+        if evicting is not None:
+            # Only reopen it once its queued edits, last backup and feed are written
+            evicting.wait()
+            continue
+        if evicted is not None:
+            # Not a daemon thread, so the interpreter waits for it before exiting
+            threading.Thread(target=_finish_eviction, args=(evicted, evicted_entry), name="workspace-eviction").start()
+        if entry[part] is not None:
+            return entry[part]
+        # Started under the workspace's own lock, so other workspaces' requests are not held up
+        with entry['lock']:
+            if not entry['closed']:
+                if entry[part] is None:
+                    entry[part] = start(workspace, entry['storage'])
+                return entry[part]
+        # Evicted in the meantime; open it again
+
+def _finish_eviction(workspace, entry):
+    try:
+        _close_workspace(entry)
+    finally:
+        with _storage_lock:
+            _evicting.pop(workspace).set()
+
+def close_workspaces():
+    """Shut down every open workspace as eviction does, e.g. before their files are removed"""
+    with _storage_lock:
+        entries = list(_workspaces.values())
+        _workspaces.clear()
+    for entry in entries:
+        _close_workspace(entry)
+
+def get_storage():
+    """Process-wide storage backend of the current workspace, selected by STORAGE_BACKEND
+
+    With WRITE_BEHIND (JOB_TRACKER_WRITE_BEHIND=1) it is wrapped in a WriteBehindStore,
+    whose queued edits are flushed when the interpreter exits or the workspace is evicted.
+    """
+    return _workspace_part('storage')
+
+def get_backup_manager():
+    """Process-wide backup thread for the current workspace's store, started on first use
+
+    Any changes not yet backed up are written when the interpreter exits.
+    """
+    return _workspace_part('backups', _start_backups)
+
+def get_reminder_scheduler():
+    """Process-wide reminder thread for the current workspace's store, started on first use
+
+    Due reminders go to the outbox file in its reminder directory, next to the .ics feed.
+    """
+    return _workspace_part('scheduler', _start_scheduler)
+
+def load_data(columns=None):
+    """Load job applications data (or just the given columns) from the configured storage backend"""
+    return get_storage().load(columns)
+
+def save_data(df, expected_version=None):
+    """Replace all stored job applications with df"""
+    get_storage().save(df, expected_version=expected_version)
+
+def sync_derived_indexes(key, before_version):
+    """Bring in-memory indexes up to date after a single-application write"""
+    storage = get_storage()
+    after_version, record = storage.version(), storage.get(key)
+    for name in DERIVED_INDEXES:
+        update_derived_index(name, key, before_version, after_version, record)
+    entry = _workspaces.get(current_workspace())
+    scheduler = entry and entry['scheduler']
+    if scheduler is not None:
+        scheduler.apply(key, before_version, after_version, record)
+
+def insert_application(record, expected_version=None):
+    """Store a single new application, returning its row key
+
+    With expected_version, the insert fails with StaleWriteError if the data has changed
+    since that version (the same goes for update_application and delete_application).
+    """
+    before_version = get_storage().version()
+    key = get_storage().insert(record, expected_version=expected_version)
+    sync_derived_indexes(key, before_version)
+    return key
+
+def update_application(key, record, base=None, expected_version=None):
+    """Update a single stored application, merging with concurrent edits when base is given"""
+    before_version = get_storage().version()
+    get_storage().update(key, record, base=base, expected_version=expected_version)
+    sync_derived_indexes(key, before_version)
+
+def delete_application(key, base=None, expected_version=None):
+    """Delete a single stored application, unless someone else changed it since base was read"""
+    before_version = get_storage().version()
+    get_storage().delete(key, base=base, expected_version=expected_version)
+    sync_derived_indexes(key, before_version)
+
+def create_sample_data():
+    """Sample applications for an empty tracker"""
+    sample_data = {
+        'job_title': ['Software Engineer', 'Data Analyst', 'Product Manager', 'Strategy Consulting Intern'],
+        'company': ['Tech Corp', 'Data Inc', 'Product Co', 'JLL'],
+        'status': ['Applied', 'Interviewing', 'Pending', 'Pending'],
+        'priority': ['High', 'Medium', 'Low', 'High'],
+        'channel': ['LinkedIn', 'Company Website', 'Referral', 'LinkedIn'],
+        'salary_range': ['$80k-$100k', '$60k-$80k', '$100k-$120k', '4,000'],
+        'location': ['Remote', 'New York', 'San Francisco', 'Dubai'],
+        'date_applied': [date.today() - timedelta(days=5), date.today() - timedelta(days=3), date.today() - timedelta(days=1), date.today()],
+        'follow_up_date': [date.today() + timedelta(days=7), None, None, None],
+        'deadline': [date.today() + timedelta(days=14), None, None, None],
+        'interview_date': [None, date.today() + timedelta(days=2), None, None],
+        'notes': ['Great opportunity', 'Good company culture', 'Interesting role', 'Strategy consulting role'],
+        'referral': ['No', 'Yes', 'No', 'No'],
+        'application_id': ['APP001', 'APP002', 'APP003', 'APP004'],
+        'contact_person': ['John Doe', 'Jane Smith', 'Bob Johnson', 'Sarah Wilson'],
+        'contact_email': ['john@techcorp.com', 'jane@datainc.com', 'bob@productco.com', 'sarah@jll.com']
+    }
+    return apply_schema(pd.DataFrame(sample_data))
@@ -0,0 +1,996 @@
+"""Application storage: the parsed-data cache and the CSV (journaled), Arrow and SQLite backends
+
+Every backend implements StorageBackend and hands out a version number that moves on with
+every write, so callers can key caches on it and detect concurrent changes.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import closing, contextmanager, nullcontext
+from datetime import date, datetime
+
+import pandas as pd
+
+from .profiling import profile_methods, step
+from .schema import APPLICATION_COLUMNS, CATEGORY_COLUMNS, apply_schema, coerce_record, empty_frame
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Data file path
+DATA_FILE = "job_applications.csv"
+DB_FILE = "job_applications.db"
+ARROW_FILE = "job_applications.arrow"
+JOURNAL_COMPACT_BYTES = 512 * 1024  # Fold the CSV journal into a new snapshot past this size
+STORAGE_BACKEND = os.environ.get("JOB_TRACKER_STORAGE", "sqlite")  # "sqlite", "csv" or "arrow"
+ARROW_BATCH_ROWS = 64 * 1024  # Rows per record batch in the Arrow snapshot
+# Windows cannot replace a file while it is memory-mapped, so Arrow snapshots are read into memory there
+ARROW_MEMORY_MAP = fcntl is not None
+
+# Parsed-data cache settings (one entry per store file, so per workspace)
+DATA_CACHE_MAX_ENTRIES = 1024
+DATA_CACHE_MAX_BYTES = int(os.environ.get("JOB_TRACKER_CACHE_MB", "512")) * 1024 * 1024
+DATA_CACHE_VERIFY_HASH = False  # Also key on a content hash (costs one extra file read per rerun)
+
+class DataCache:
+    """LRU cache of parsed DataFrames keyed on file mtime, size and optional content hash
+
+    Callers whose file can change without its mtime or size changing (SQLite in WAL mode
+    commits to the -wal file) pass a token, such as the store's version, to key on as well.
+
+    Bounded both in entries and in the memory the cached frames use; the least recently
+    used files are evicted first.
+    """
+
+    def __init__(self, max_entries=DATA_CACHE_MAX_ENTRIES, verify_hash=DATA_CACHE_VERIFY_HASH,
+                 max_bytes=DATA_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.verify_hash = verify_hash
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        self._entries = OrderedDict()  # key -> (DataFrame, bytes)
+        self._lock = threading.Lock()
+        self._parse_locks = {}  # path -> lock held while that file is parsed
+
+    def _key(self, path, token=None):
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        if token is not None:
+            key += (token,)
+        if self.verify_hash:
+            with open(path, 'rb') as f:
+                key += (hashlib.blake2b(f.read(), digest_size=16).hexdigest(),)
+        return key
+
+    def get_or_load(self, path, loader, copy=True, token=None):
+        """Return a copy of the cached DataFrame for path, parsing it with loader on a miss
+
+        Pass copy=False only for read-only access to the shared frame. token, when given, is
+        part of the key; it must be read before the loader runs, so that a change between the
+        two makes the next call miss rather than hit a frame older than its key.
+        """
+        key = self._key(path, token)
+        with self._lock:
+            df = self._hit(key)
+            parse_lock = self._parse_locks.setdefault(key[0], threading.Lock())
+        if df is not None:
+            return df.copy() if copy else df
+
+        # Concurrent misses on one file wait for a single parse instead of each parsing it
+        with parse_lock:
+            with self._lock:
+                df = self._hit(key)
+                if df is None:
+                    self.misses += 1
+            if df is not None:
+                return df.copy() if copy else df
+            with step(f"parse {os.path.basename(path)}"):
+                df = loader(path)
+            self._store(key, df)
+        return df.copy() if copy else df
+
+    def _hit(self, key):
+        """The cached frame for key (counted as a hit), or None; lock must be held"""
+        if key not in self._entries:
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return self._entries[key][0]
+
+    def _store(self, key, df):
+        size = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            # Older versions of the same file can never be hit again
+            for stale_key in [k for k in self._entries if k[0] == key[0]]:
+                self._drop(stale_key)
+            self._entries[key] = (df, size)
+            self.bytes += size
+            while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key):
+        """Remove one entry; lock must be held"""
+        self.bytes -= self._entries.pop(key)[1]
+
+    def invalidate(self, path=None):
+        """Drop cached entries for path, or everything when path is None"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self.bytes = 0
+                return
+            abs_path = os.path.abspath(path)
+            for key in [k for k in self._entries if k[0] == abs_path]:
+                self._drop(key)
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries),
+                    'bytes': self.bytes, 'evictions': self.evictions}
+
+_data_cache = DataCache()
+
+def get_data_cache():
+    """Process-wide data cache shared by every caller in this process"""
+    return _data_cache
+
+def read_data_file(path):
+    """Parse the CSV data file into the typed application schema"""
+    df = pd.read_csv(path)
+    return apply_schema(df)
+
+def read_arrow_file(path, columns=None):
+    """Read an Arrow snapshot file, memory-mapped, with only the given columns (None: all)
+
+    The columns keep the types they were written with. Text stays in the mapped file
+    instead of being copied onto the heap, so only the pages a caller touches are read.
+    """
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    if ARROW_MEMORY_MAP:
+        # The mapping stays open for as long as the returned frame uses it
+        table = ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    else:
+        with pa.OSFile(path, 'rb') as source:
+            table = ipc.open_file(source).read_all()
+    if columns is not None:
+        table = table.select(['id'] + list(columns))
+    df = table.to_pandas().set_index('id')
+    df.index.name = None
+    return apply_schema(df) if columns is None else df
+
+def write_arrow_file(f, df):
+    """Write df, with its index as the id column, to f as an uncompressed Arrow file"""
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    table = pa.Table.from_pandas(df.rename_axis('id').reset_index(), preserve_index=False)
+    with ipc.new_file(f, table.schema) as writer:
+        writer.write_table(table, max_chunksize=ARROW_BATCH_ROWS)
+
+def read_json_backup(path):
+    """Parse a JSON backup (a list of records, with or without their id) into the typed schema"""
+    with open(path, 'r', encoding='utf-8') as f:
+        df = pd.DataFrame(json.load(f))
+    if 'id' in df.columns:
+        df = df.set_index('id')
+        df.index.name = None
+    return apply_schema(df)
+
+def to_storage_value(value):
+    """Convert a form/DataFrame value into a plain value that can be stored"""
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        return None
+    if isinstance(value, (datetime, date, pd.Timestamp)):
+        return value.isoformat()[:10]
+    if hasattr(value, 'item'):
+        # numpy scalar
+        return value.item()
+    return value
+
+def encode_record(record):
+    """A form/DataFrame record as the plain storage values of its application columns"""
+    record = coerce_record(record)
+    return {col: to_storage_value(value) for col, value in record.items() if col in APPLICATION_COLUMNS}
+
+def filter_applications(df, filters=None, search=None, order_by=None, descending=False, limit=None, offset=0, keys=None):
+    """Apply query filters to an in-memory DataFrame
+
+    keys restricts the result to those row keys, in that order unless order_by is given.
+    """
+    if keys is not None:
+        positions = df.index.get_indexer(keys)
+        df = df.iloc[positions[positions >= 0]]
+    if filters:
+        for col, values in filters.items():
+            if values and col in df.columns:
+                df = df[df[col].isin(values)]
+    if search:
+        df = df[
+            df['company'].str.contains(search, case=False, na=False, regex=False) |
+            df['job_title'].str.contains(search, case=False, na=False, regex=False)
+        ]
+    if order_by and order_by in df.columns:
+        df = df.sort_values(order_by, ascending=not descending, na_position='last', kind='stable')
+    if offset:
+        df = df.iloc[offset:]
+    if limit is not None:
+        df = df.iloc[:limit]
+    return df
+
+class StaleWriteError(Exception):
+    """Raised when a write is based on data that another session has changed since"""
+
+class FileLock:
+    """Reentrant lock shared by threads in this process and by other processes, via a lock file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._handle = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                handle = open(self.path, 'a+')
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+                else:
+                    handle.seek(0)
+                    while True:
+                        try:
+                            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                            break
+                        except OSError:
+                            # LK_LOCK gives up after ~10 seconds; keep waiting
+                            continue
+            except BaseException:
+                self._thread_lock.release()
+                raise
+            self._handle = handle
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._handle.fileno(), fcntl.LOCK_UN)
+            else:
+                self._handle.seek(0)
+                msvcrt.locking(self._handle.fileno(), msvcrt.LK_UNLCK, 1)
+            self._handle.close()
+            self._handle = None
+        self._thread_lock.release()
+
+@contextmanager
+def atomic_write(path, mode='w', lock=None):
+    """Write to a temp file next to path and rename it over path once complete
+
+    When lock is given it is only held for the rename, not while the temp file is written.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, **({} if 'b' in mode else {'encoding': 'utf-8', 'newline': ''})) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        with lock or nullcontext():
+            os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def same_value(a, b):
+    """Compare stored values, treating None, NaN and empty strings as equal"""
+    a, b = to_storage_value(a), to_storage_value(b)
+    return (a if a != '' else None) == (b if b != '' else None)
+
+def merge_changes(current, base, record):
+    """Three-way merge of an edit against the row as it is stored now
+
+    base is the row as the user saw it when they opened the edit form. Only the fields the
+    user changed are returned for writing; it is a conflict if someone else changed one of
+    those same fields to a different value in the meantime.
+    """
+    if current is None:
+        raise StaleWriteError("This application was deleted by someone else.")
+    changes, conflicts = {}, []
+    for col, value in record.items():
+        if same_value(value, base.get(col)):
+            continue
+        if not same_value(current.get(col), base.get(col)) and not same_value(current.get(col), value):
+            conflicts.append(col)
+        changes[col] = value
+    if conflicts:
+        raise StaleWriteError(f"Someone else changed {', '.join(conflicts)} since you opened this application.")
+    return changes
+
+def check_unchanged(current, base):
+    """Reject a delete when the row was edited by someone else since base was read"""
+    if current is not None and any(not same_value(current.get(col), value) for col, value in base.items()):
+        raise StaleWriteError("This application was changed by someone else; reload before deleting it.")
+
+def check_version(current_version, expected_version):
+    """Reject a write made against a version of the data that is no longer current"""
+    if expected_version is not None and current_version != expected_version:
+        raise StaleWriteError("The data was changed by someone else; reload and try again.")
+
+class StorageBackend:
+    """Interface for application storage backends
+
+    Records are dicts keyed by column name. Every row has an immutable, never reused
+    integer ID (the DataFrame index returned by load/query) that get, update and delete
+    use to address a single row.
+    Every change bumps version(). save, insert, update and delete take an expected_version
+    and fail with StaleWriteError, without writing, when the version is no longer that one;
+    the check and the write happen under the same lock. update and delete can also merge
+    with or reject concurrent edits of the row itself through base.
+    """
+
+    path = None
+
+    def load(self, columns=None):
+        """Return all applications as a DataFrame indexed by row key
+
+        columns limits the frame to those application columns, for callers that only need
+        a few of them.
+        """
+        raise NotImplementedError
+
+    def version(self):
+        """Return the data version, which increases on every change"""
+        raise NotImplementedError
+
+    def save(self, df, expected_version=None):
+        """Replace the whole store with df, failing if the version is no longer expected_version"""
+        raise NotImplementedError
+
+    def get(self, key):
+        """Return the stored row for key as a dict, or None if it does not exist"""
+        df = self.load()
+        return df.loc[key].to_dict() if key in df.index else None
+
+    def insert(self, record, expected_version=None):
+        """Add one application and return its row key"""
+        raise NotImplementedError
+
+    def insert_many(self, records):
+        """Add several applications in a single write and return their row keys"""
+        return [self.insert(record) for record in records]
+
+    def next_key(self):
+        """The ID the next insert will get"""
+        df = self.load()
+        return int(df.index.max()) + 1 if len(df) else 0
+
+    def apply_ops(self, ops):
+        """Apply journal operations (inserts with their keys, updates, deletes) in a single write"""
+        raise NotImplementedError
+
+    def update(self, key, record, base=None, expected_version=None):
+        """Overwrite the fields in record for the row with the given key
+
+        When base (the row as originally read) is given, only fields changed from base are
+        written and concurrent edits to other fields are kept.
+        """
+        raise NotImplementedError
+
+    def delete(self, key, base=None, expected_version=None):
+        """Remove the row with the given key, unless it changed since base was read"""
+        raise NotImplementedError
+
+    def query(self, filters=None, search=None, order_by=None, descending=False, limit=None, offset=0, keys=None):
+        """Return the applications matching filters ({column: [values]}) and search text
+
+        keys limits the result to those row keys, kept in the given order when order_by is
+        not set (used for ranked search results).
+        """
+        return filter_applications(self.load(), filters, search, order_by, descending, limit, offset, keys)
+
+    def count(self, filters=None, search=None, keys=None):
+        """Return how many applications query would match without limit/offset"""
+        return len(filter_applications(self.load(), filters, search, keys=keys))
+
+def decode_record(record):
+    """Turn a journal record back into typed values"""
+    return coerce_record(record)
+
+def read_journal(path, offset=0):
+    """Read journal operations from offset, returning them with the offset they end at
+
+    A torn final line from an interrupted append is ignored.
+    """
+    if not os.path.exists(path):
+        return [], 0
+    ops = []
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                ops.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+            offset += len(line)
+    return ops, offset
+
+def replay_journal(df, ops):
+    """Apply journal operations on top of a snapshot DataFrame
+
+    Every operation assigns absolute values, so replaying operations that are already part
+    of the snapshot leaves it unchanged.
+    """
+    inserted, changes, deleted = {}, {}, set()
+    for op in ops:
+        key, kind = op['key'], op['op']
+        if kind == 'insert':
+            deleted.discard(key)
+            changes.pop(key, None)
+            inserted[key] = decode_record(op['record'])
+        elif kind == 'update':
+            target = inserted[key] if key in inserted else changes.setdefault(key, {})
+            target.update(decode_record(op['record']))
+        elif kind == 'delete':
+            inserted.pop(key, None)
+            changes.pop(key, None)
+            deleted.add(key)
+
+    if not (inserted or changes or deleted):
+        return df
+    for key, values in changes.items():
+        if key in df.index:
+            for col, value in values.items():
+                # Columns missing from a projected snapshot stay missing
+                if col in df.columns:
+                    df.at[key, col] = value
+    df = df.drop([key for key in deleted | set(inserted) if key in df.index])
+    if inserted:
+        new_df = apply_schema(pd.DataFrame(list(inserted.values()), index=list(inserted.keys())))
+        new_df = new_df[new_df.columns.intersection(df.columns, sort=False)]
+        df = new_df if df.empty else pd.concat([df, new_df])
+    return df
+
+# Public storage calls show up as steps when profiling
+STORAGE_PROFILED_METHODS = ['load', 'version', 'save', 'get', 'insert', 'insert_many', 'update', 'delete',
+                            'apply_ops', 'query', 'count']
+
+@profile_methods('csv', *STORAGE_PROFILED_METHODS)
+class CSVBackend(StorageBackend):
+    """CSV snapshot plus an append-only journal of inserts, updates and deletes
+
+    Each change appends one JSON line to the journal and load() replays it on top of the
+    snapshot. Once the journal grows past compact_bytes a background thread folds it into
+    a new snapshot (and the optional JSON copy at backup_path). A small meta file records the snapshot's version and
+    next row key. All file changes happen under an inter-process lock, and snapshots are
+    written to a temp file and renamed into place.
+    """
+
+    # Appended to the snapshot's name without extension to name the journal, meta and lock files
+    sidecar_suffix = ""
+
+    def __init__(self, path=DATA_FILE, backup_path=None, journal_path=None,
+                 compact_bytes=JOURNAL_COMPACT_BYTES):
+        self.path = path
+        self.backup_path = backup_path
+        base_path = os.path.splitext(path)[0] + self.sidecar_suffix
+        self.journal_path = journal_path or base_path + "_journal.jsonl"
+        self.compacting_path = self.journal_path + ".compacting"
+        self.meta_path = base_path + "_meta.json"
+        self.compact_bytes = compact_bytes
+        self._lock = FileLock(base_path + ".lock")
+        self._compact_lock = FileLock(base_path + ".compact.lock")
+        self._compactor = None
+        self._state = None
+
+    def _read_snapshot(self, path):
+        df = read_data_file(path)
+        if 'id' in df.columns:
+            df = df.set_index('id')
+            df.index.name = None
+        return df
+
+    def _snapshot(self, copy=True, columns=None):
+        if not os.path.exists(self.path):
+            return empty_frame() if columns is None else empty_frame()[columns]
+        if columns is not None:
+            return get_data_cache().get_or_load(self.path, self._read_snapshot, copy=False)[columns].copy()
+        return get_data_cache().get_or_load(self.path, self._read_snapshot, copy=copy)
+
+    def _read_meta(self):
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        # Snapshot written before meta files existed
+        snapshot = self._snapshot(copy=False)
+        return {'version': 0, 'next_key': int(snapshot.index.max()) + 1 if len(snapshot) else 0}
+
+    def _write_meta(self, meta):
+        with atomic_write(self.meta_path) as f:
+            json.dump(meta, f)
+
+    def _journal_state(self):
+        """Current version and next row key, reading only journal lines appended since last time
+
+        Must be called with the lock held.
+        """
+        meta = self._read_meta()
+        try:
+            stat = os.stat(self.journal_path)
+            journal_id, journal_size = stat.st_ino, stat.st_size
+        except FileNotFoundError:
+            journal_id, journal_size = None, 0
+
+        state = self._state
+        if (state is None or state['meta'] != meta or state['journal_id'] != journal_id
+                or journal_size < state['offset']):
+            ops, _ = read_journal(self.compacting_path)
+            state = {'meta': meta, 'journal_id': journal_id, 'offset': 0,
+                     'version': meta['version'] + len(ops), 'next_key': meta['next_key']}
+            state['next_key'] = max([state['next_key']] + [op['key'] + 1 for op in ops])
+        if journal_size > state['offset']:
+            ops, state['offset'] = read_journal(self.journal_path, state['offset'])
+            state['version'] += len(ops)
+            state['next_key'] = max([state['next_key']] + [op['key'] + 1 for op in ops])
+        self._state = state
+        return state
+
+    def _pending_ops(self, include_journal=True):
+        ops, _ = read_journal(self.compacting_path)
+        if include_journal:
+            ops += read_journal(self.journal_path)[0]
+        return ops
+
+    def _current_record(self, key):
+        """The stored row for key, or None if it does not exist; lock must be held"""
+        snapshot = self._snapshot(copy=False)
+        record = snapshot.loc[key].to_dict() if key in snapshot.index else None
+        for op in self._pending_ops():
+            if op['key'] != key:
+                continue
+            if op['op'] == 'insert':
+                record = decode_record(op['record'])
+            elif op['op'] == 'update' and record is not None:
+                record.update(decode_record(op['record']))
+            elif op['op'] == 'delete':
+                record = None
+        return record
+
+    def load(self, columns=None):
+        with self._lock:
+            df = self._snapshot(columns=columns)
+            ops = self._pending_ops()
+        df = replay_journal(df, ops)
+        return df if columns is None else df[columns]
+
+    def version(self):
+        with self._lock:
+            return self._journal_state()['version']
+
+    def get(self, key):
+        with self._lock:
+            return self._current_record(int(key))
+
+    def next_key(self):
+        """The ID the next insert will get"""
+        with self._lock:
+            return self._journal_state()['next_key']
+
+    def _write_snapshot(self, df):
+        """Atomically replace the snapshot (and the JSON copy, if kept) with df"""
+        with atomic_write(self.path, lock=self._lock) as f:
+            df.to_csv(f, index_label='id')
+        self._write_backup(df)
+
+    def _write_backup(self, df):
+        if not self.backup_path:
+            return
+        with atomic_write(self.backup_path, lock=self._lock) as f:
+            json.dump(df.rename_axis('id').reset_index().to_dict('records'), f, default=str)
+
+    def save(self, df, expected_version=None):
+        with self._compact_lock, self._lock:
+            try:
+                state = self._journal_state()
+                check_version(state['version'], expected_version)
+                df = apply_schema(df.copy())
+                next_key = max([state['next_key']] + [int(key) + 1 for key in df.index])
+                for path in (self.journal_path, self.compacting_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+                self._write_snapshot(df)
+                self._write_meta({'version': state['version'] + 1, 'next_key': next_key})
+            finally:
+                self._state = None
+                get_data_cache().invalidate(self.path)
+
+    def _append(self, *ops):
+        """Append operations to the journal in one write and fsync; lock must be held"""
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write("".join(json.dumps(op, default=str) + "\n" for op in ops))
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.getsize(self.journal_path) >= self.compact_bytes and not (self._compactor and self._compactor.is_alive()):
+            self._compactor = threading.Thread(target=self.compact, name="journal-compactor", daemon=True)
+            self._compactor.start()
+
+    def _encode(self, record):
+        return encode_record(record)
+
+    def insert(self, record, expected_version=None):
+        with self._lock:
+            state = self._journal_state()
+            check_version(state['version'], expected_version)
+            key = state['next_key']
+            self._append({'op': 'insert', 'key': key, 'record': self._encode(record)})
+        return key
+
+    def insert_many(self, records):
+        records = [self._encode(record) for record in records]
+        if not records:
+            return []
+        with self._lock:
+            first_key = self._journal_state()['next_key']
+            keys = list(range(first_key, first_key + len(records)))
+            self._append(*({'op': 'insert', 'key': key, 'record': record} for key, record in zip(keys, records)))
+        return keys
+
+    def update(self, key, record, base=None, expected_version=None):
+        key = int(key)
+        with self._lock:
+            check_version(self._journal_state()['version'], expected_version)
+            if base is not None:
+                record = merge_changes(self._current_record(key), base, record)
+                if not record:
+                    return
+            self._append({'op': 'update', 'key': key, 'record': self._encode(record)})
+
+    def delete(self, key, base=None, expected_version=None):
+        key = int(key)
+        with self._lock:
+            check_version(self._journal_state()['version'], expected_version)
+            if base is not None:
+                check_unchanged(self._current_record(key), base)
+            self._append({'op': 'delete', 'key': key})
+
+    def apply_ops(self, ops):
+        if ops:
+            with self._lock:
+                self._append(*ops)
+
+    def reserve_ids(self, next_id):
+        """Make sure new rows get IDs of at least next_id"""
+        with self._lock:
+            meta = self._read_meta()
+            if meta['next_key'] < next_id:
+                self._write_meta({**meta, 'next_key': next_id})
+                self._state = None
+
+    def compact(self):
+        """Fold the journal into a new snapshot"""
+        with self._compact_lock:
+            with self._lock:
+                # Resume an interrupted compaction, otherwise rotate the journal so
+                # appends carry on in a fresh file while the snapshot is rebuilt
+                if not os.path.exists(self.compacting_path):
+                    if not os.path.exists(self.journal_path):
+                        return
+                    os.replace(self.journal_path, self.compacting_path)
+                df = self._snapshot()
+                ops = self._pending_ops(include_journal=False)
+                meta = self._read_meta()
+            df = replay_journal(df, ops)
+            meta = {'version': meta['version'] + len(ops),
+                    'next_key': max([meta['next_key']] + [op['key'] + 1 for op in ops])}
+            # Replaying the compacted operations again is harmless, so the new snapshot can
+            # go live before the compacting journal is removed
+            self._write_snapshot(df)
+            with self._lock:
+                self._write_meta(meta)
+                os.remove(self.compacting_path)
+                self._state = None
+                get_data_cache().invalidate(self.path)
+
+@profile_methods('arrow', *STORAGE_PROFILED_METHODS)
+class ArrowBackend(CSVBackend):
+    """Arrow snapshot with typed columns, plus the same journal as CSVBackend
+
+    The snapshot is an uncompressed Arrow IPC file that is memory-mapped when read: a full
+    load() skips parsing text entirely, and load(columns=...) reads only those columns
+    (bypassing the data cache, which holds whole frames). Changes are journaled and
+    compacted exactly as in CSVBackend, into a new Arrow file.
+    """
+
+    sidecar_suffix = "_arrow"
+
+    def __init__(self, path=ARROW_FILE, **kwargs):
+        super().__init__(path, **kwargs)
+
+    def _read_snapshot(self, path):
+        return read_arrow_file(path)
+
+    def _snapshot(self, copy=True, columns=None):
+        if columns is None or not os.path.exists(self.path):
+            return super()._snapshot(copy, columns)
+        # Numeric arrays (category codes, dates) come straight from the read-only mapping; the
+        # copy makes them writable for replay_journal and callers, while text stays mapped
+        return read_arrow_file(self.path, columns).copy()
+
+    def _write_snapshot(self, df):
+        with atomic_write(self.path, mode='wb', lock=self._lock) as f:
+            write_arrow_file(f, df)
+        self._write_backup(df)
+
+SQLITE_INDEXED_COLUMNS = ['status', 'company', 'date_applied', 'follow_up_date', 'deadline', 'interview_date']
+
+@profile_methods('sqlite', *STORAGE_PROFILED_METHODS)
+class SQLiteBackend(StorageBackend):
+    """SQLite storage with one row per application and indexes on the filtered/reminder columns
+
+    The database runs in WAL mode. Writes run in BEGIN IMMEDIATE transactions, so SQLite's
+    own locking serializes them across threads and processes, and each one bumps the
+    version kept in the meta table.
+    """
+
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        # SQLite's busy handler polls, which can starve a writer under heavy contention;
+        # a blocking file lock queues writers fairly instead
+        self._write_lock = FileLock(os.path.splitext(path)[0] + ".lock")
+        self._init_schema()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_schema(self):
+        columns_sql = ", ".join(f'"{col}" TEXT' for col in APPLICATION_COLUMNS)
+        with closing(self._connect()) as conn:
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'meta'").fetchone():
+                return
+        with self._write_lock, closing(self._connect()) as conn, conn:
+            # WAL lets readers carry on while another session or process is writing
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(f"CREATE TABLE IF NOT EXISTS applications (id INTEGER PRIMARY KEY AUTOINCREMENT, {columns_sql})")
+            for col in SQLITE_INDEXED_COLUMNS:
+                conn.execute(f'CREATE INDEX IF NOT EXISTS idx_applications_{col} ON applications ("{col}")')
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0)")
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction that takes the database write lock up front and bumps the version"""
+        with self._write_lock:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                yield conn
+                conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+                get_data_cache().invalidate(self.path)
+
+    def _read(self, sql, params=()):
+        with closing(self._connect()) as conn:
+            df = pd.read_sql_query(sql, conn, params=params, index_col='id')
+        df.index.name = None
+        return apply_schema(df)
+
+    def _clean(self, record):
+        return encode_record(record)
+
+    def _check_version(self, conn, expected_version):
+        """check_version inside a write transaction"""
+        if expected_version is not None:
+            check_version(conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0], expected_version)
+
+    def _current_record(self, conn, key):
+        row = conn.execute("SELECT * FROM applications WHERE id = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        record = dict(row)
+        del record['id']
+        return record
+
+    def reserve_ids(self, next_id):
+        """Make sure new rows get IDs of at least next_id"""
+        with self._transaction() as conn:
+            cursor = conn.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'applications'", (next_id - 1,))
+            if cursor.rowcount == 0:
+                # sqlite_sequence has no unique constraint, so only insert when there is no row yet
+                conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('applications', ?)", (next_id - 1,))
+
+    def next_key(self):
+        with closing(self._connect()) as conn:
+            seq = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'applications'").fetchone()
+            top = conn.execute("SELECT MAX(id) FROM applications").fetchone()[0]
+        return max(seq[0] if seq else 0, top or 0) + 1
+
+    def _select(self, columns, filters=None, search=None, keys=None):
+        """SELECT ... FROM ... WHERE for a query, with its parameters"""
+        sql, clauses, params = f"SELECT {columns} FROM applications", [], []
+        if keys is not None:
+            # One JSON parameter instead of an IN list, which would hit SQLite's variable limit
+            sql += " JOIN json_each(?) AS ranked ON ranked.value = applications.id"
+            params.append(json.dumps([int(key) for key in keys]))
+        for col, values in (filters or {}).items():
+            if values and col in APPLICATION_COLUMNS:
+                clauses.append(f'"{col}" IN ({", ".join("?" for _ in values)})')
+                params.extend(to_storage_value(v) for v in values)
+        if search:
+            clauses.append("(company LIKE ? OR job_title LIKE ?)")
+            params.extend([f"%{search}%", f"%{search}%"])
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return sql, params
+
+    def count(self, filters=None, search=None, keys=None):
+        sql, params = self._select("COUNT(*)", filters, search, keys)
+        with closing(self._connect()) as conn:
+            return conn.execute(sql, params).fetchone()[0]
+
+    def load(self, columns=None):
+        # Commits by other processes go to the -wal file and leave the database file's mtime
+        # and size alone, so the cache is also keyed on the version
+        df = get_data_cache().get_or_load(self.path, lambda _: self._read("SELECT * FROM applications ORDER BY id"),
+                                          copy=columns is None, token=self.version())
+        return df if columns is None else df[columns].copy()
+
+    def version(self):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+
+    def get(self, key):
+        df = self._read("SELECT * FROM applications WHERE id = ?", (int(key),))
+        return df.iloc[0].to_dict() if len(df) else None
+
+    def save(self, df, expected_version=None):
+        rows = [self._clean(record) for record in df.to_dict('records')]
+        # Keep existing application IDs (e.g. when migrating from CSV); AUTOINCREMENT still
+        # never hands out an ID that was used before
+        ids = [int(key) for key in df.index] if pd.api.types.is_integer_dtype(df.index) else [None] * len(df)
+        placeholders = ", ".join("?" for _ in ['id'] + APPLICATION_COLUMNS)
+        col_sql = ", ".join(f'"{col}"' for col in ['id'] + APPLICATION_COLUMNS)
+        with self._transaction() as conn:
+            self._check_version(conn, expected_version)
+            conn.execute("DELETE FROM applications")
+            conn.executemany(
+                f"INSERT INTO applications ({col_sql}) VALUES ({placeholders})",
+                [(row_id, *(row.get(col) for col in APPLICATION_COLUMNS)) for row_id, row in zip(ids, rows)]
+            )
+
+    def insert(self, record, expected_version=None):
+        values = self._clean(record)
+        col_sql = ", ".join(f'"{col}"' for col in values)
+        placeholders = ", ".join("?" for _ in values)
+        with self._transaction() as conn:
+            self._check_version(conn, expected_version)
+            cursor = conn.execute(f"INSERT INTO applications ({col_sql}) VALUES ({placeholders})", tuple(values.values()))
+        return cursor.lastrowid
+
+    def insert_many(self, records):
+        rows = [self._clean(record) for record in records]
+        if not rows:
+            return []
+        col_sql = ", ".join(f'"{col}"' for col in APPLICATION_COLUMNS)
+        placeholders = ", ".join("?" for _ in APPLICATION_COLUMNS)
+        sql = f"INSERT INTO applications ({col_sql}) VALUES ({placeholders})"
+        with self._transaction() as conn:
+            return [conn.execute(sql, tuple(row.get(col) for col in APPLICATION_COLUMNS)).lastrowid for row in rows]
+
+    def update(self, key, record, base=None, expected_version=None):
+        key = int(key)
+        with self._transaction() as conn:
+            self._check_version(conn, expected_version)
+            if base is not None:
+                record = merge_changes(self._current_record(conn, key), base, record)
+            values = self._clean(record)
+            if values:
+                assignments = ", ".join(f'"{col}" = ?' for col in values)
+                conn.execute(f"UPDATE applications SET {assignments} WHERE id = ?", (*values.values(), key))
+
+    def delete(self, key, base=None, expected_version=None):
+        key = int(key)
+        with self._transaction() as conn:
+            self._check_version(conn, expected_version)
+            if base is not None:
+                check_unchanged(self._current_record(conn, key), base)
+            conn.execute("DELETE FROM applications WHERE id = ?", (key,))
+
+    def apply_ops(self, ops):
+        if not ops:
+            return
+        with self._transaction() as conn:
+            for op in ops:
+                key = int(op['key'])
+                if op['op'] == 'delete':
+                    conn.execute("DELETE FROM applications WHERE id = ?", (key,))
+                    continue
+                values = {col: value for col, value in op['record'].items() if col in APPLICATION_COLUMNS}
+                if op['op'] == 'insert':
+                    col_sql = ", ".join(f'"{col}"' for col in ['id', *values])
+                    placeholders = ", ".join("?" for _ in range(len(values) + 1))
+                    conn.execute(f"INSERT OR REPLACE INTO applications ({col_sql}) VALUES ({placeholders})",
+                                 (key, *values.values()))
+                elif values:
+                    assignments = ", ".join(f'"{col}" = ?' for col in values)
+                    conn.execute(f"UPDATE applications SET {assignments} WHERE id = ?", (*values.values(), key))
+
+    def query(self, filters=None, search=None, order_by=None, descending=False, limit=None, offset=0, keys=None):
+        sql, params = self._select("applications.*", filters, search, keys)
+        tiebreak = "ranked.key" if keys is not None else "id"
+        if order_by in APPLICATION_COLUMNS:
+            if order_by in CATEGORY_COLUMNS:
+                # Sort enums in their option order, like the categorical columns in pandas
+                options = CATEGORY_COLUMNS[order_by]
+                cases = " ".join("WHEN '{}' THEN {}".format(option.replace("'", "''"), i) for i, option in enumerate(options))
+                sort_expr = f'CASE "{order_by}" {cases} END'
+            else:
+                sort_expr = f'"{order_by}"'
+            sql += f' ORDER BY {sort_expr} IS NULL, {sort_expr} {"DESC" if descending else "ASC"}, {tiebreak}'
+        else:
+            sql += f" ORDER BY {tiebreak}"
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([-1 if limit is None else limit, offset])
+        return self._read(sql, params)
+
+def migrate_csv_to_sqlite(csv_path=DATA_FILE, db_path=DB_FILE):
+    """One-shot copy of the CSV data file into an empty SQLite database
+
+    Returns the number of rows migrated (0 when there is nothing to do).
+    """
+    if not os.path.exists(csv_path):
+        return 0
+    backend = SQLiteBackend(db_path)
+    if backend.count():
+        return 0
+    source = CSVBackend(csv_path)
+    df = source.load()
+    backend.save(df)
+    # IDs of rows deleted before the migration must not be handed out again either
+    backend.reserve_ids(source.next_key())
+    return len(df)
+
+def migrate_to_arrow(source_path=DATA_FILE, arrow_path=ARROW_FILE):
+    """One-shot copy of the CSV data file (with its journal) or a .json backup into an empty Arrow store
+
+    Returns the number of rows migrated (0 when there is nothing to do).
+    """
+    if not os.path.exists(source_path):
+        return 0
+    backend = ArrowBackend(arrow_path)
+    if backend.count():
+        return 0
+    if source_path.lower().endswith('.json'):
+        df = read_json_backup(source_path)
+        backend.save(df)
+    else:
+        source = CSVBackend(source_path)
+        df = source.load()
+        backend.save(df)
+        # IDs of rows deleted before the migration must not be handed out again either
+        backend.reserve_ids(source.next_key())
+    return len(df)
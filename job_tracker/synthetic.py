@@ -0,0 +1,153 @@
+"""Seeded synthetic applications for load testing and benchmarks
+
+generate_applications(n, seed) builds a schema-typed DataFrame shaped like a real tracker:
+skewed status and channel mixes, a long tail of companies, mostly empty follow-up/deadline/
+interview dates and salary strings in the many formats people actually type. The same
+seed (and today) always gives the same data. Rows are drawn as numpy codes into small pools
+of distinct values, and each distinct string is only built once, so a million rows take
+a few seconds.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from .schema import CHANNEL_OPTIONS, PRIORITY_OPTIONS, REFERRAL_OPTIONS, STATUS_OPTIONS, apply_schema
+
+# Category mixes, in the schema's option order
+STATUS_WEIGHTS = dict(zip(STATUS_OPTIONS, [0.45, 0.09, 0.10, 0.03, 0.28, 0.05]))
+PRIORITY_WEIGHTS = dict(zip(PRIORITY_OPTIONS, [0.3, 0.5, 0.2]))
+CHANNEL_WEIGHTS = dict(zip(CHANNEL_OPTIONS, [0.45, 0.20, 0.08, 0.15, 0.07, 0.05]))
+
+# Share of applications with each optional value set
+FOLLOW_UP_RATE = 0.3
+DEADLINE_RATE = 0.2
+INTERVIEW_RATES = {'Interviewing': 0.9, 'Offered': 0.95, 'Rejected': 0.15, 'Withdrawn': 0.1}
+SALARY_RATE = 0.65
+NOTES_RATE = 0.5
+CONTACT_RATE = 0.4
+APPLICATION_ID_RATE = 0.7
+
+# Salary strings as typed: str.format templates over low/high (thousands), low_full/high_full
+# (whole amounts), hourly and monthly equivalents of low; with the share written each way
+SALARY_FORMATS = [
+    ("${low}k-${high}k", 0.3),
+    ("${low_full:,} - ${high_full:,}", 0.12),
+    ("{low}-{high}k", 0.1),
+    ("€{low}-{high}k/yr", 0.08),
+    ("£{low_full:,}", 0.06),
+    ("CAD {low}k to {high}k", 0.04),
+    ("${hourly}/hr", 0.08),
+    ("{monthly:,}", 0.07),
+    (" ${high}K ", 0.05),
+    ("Competitive", 0.06),
+    ("DOE", 0.04),
+]
+SALARY_SPREADS_K = [10, 15, 20, 30]
+SALARY_MIN_K, SALARY_MAX_K = 20, 500  # Low end range, in thousands
+
+HISTORY_DAYS = 365  # date_applied spread, most recent days most common
+COMPANY_SKEW = 1.1  # Zipf exponent of applications per company
+
+TITLES = ['Software Engineer', 'Data Analyst', 'Data Scientist', 'Product Manager', 'Backend Engineer',
+          'Frontend Developer', 'ML Engineer', 'DevOps Engineer', 'QA Engineer', 'UX Designer',
+          'Business Analyst', 'Strategy Consultant', 'Project Manager', 'Solutions Architect', 'Data Engineer']
+SENIORITY = ['', '', '', 'Senior ', 'Junior ', 'Lead ', 'Staff ', 'Principal ']
+COMPANY_WORDS = ['Acme', 'Blue', 'North', 'Bright', 'Quantum', 'Silver', 'Nova', 'Pioneer', 'Summit', 'Vertex',
+                 'Apex', 'Cedar', 'Harbor', 'Iron', 'Lumen', 'Maple', 'Orbit', 'Prism', 'River', 'Stellar']
+COMPANY_SUFFIXES = ['Labs', 'Systems', 'Analytics', 'Tech', 'Group', 'Partners', 'Inc', 'Digital', 'Health',
+                    'Capital', 'Robotics', 'Networks', 'Software', 'Consulting', 'Media']
+LOCATIONS = {'Remote': 0.3, 'New York': 0.12, 'San Francisco': 0.1, 'London': 0.08, 'Berlin': 0.07,
+             'Toronto': 0.06, 'Austin': 0.06, 'Dubai': 0.04, 'Bangalore': 0.04, 'Hybrid': 0.05, None: 0.08}
+NOTES = ['Great opportunity', 'Good company culture', 'Interesting role', 'Recruiter reached out',
+         'Referred by a former colleague', 'Take-home assignment sent', 'Waiting on feedback',
+         'Salary below expectations', 'Strong team, long commute', 'Applied through careers page']
+FIRST_NAMES = ['John', 'Jane', 'Bob', 'Sarah', 'Priya', 'Ahmed', 'Mei', 'Carlos', 'Anna', 'Liam']
+LAST_NAMES = ['Doe', 'Smith', 'Johnson', 'Wilson', 'Patel', 'Khan', 'Chen', 'Garcia', 'Novak', 'Brown']
+
+def _codes(rng, weights, n):
+    """n positions into weights, drawn with its {value: weight} mix"""
+    p = np.array(list(weights.values()), dtype=float)
+    return rng.choice(len(p), n, p=p / p.sum())
+
+def _category(rng, weights, n):
+    """n draws from a {option: weight} mix in schema option order, as a Categorical"""
+    return pd.Categorical.from_codes(_codes(rng, weights, n), categories=list(weights))
+
+def _text(pool, codes, present=None):
+    """pool[codes] as a pandas string array, missing where present is False"""
+    values = np.asarray(pool, dtype=object)[codes]
+    if present is not None:
+        values[~present] = None
+    return pd.array(values, dtype='string')
+
+def _company_pool(size):
+    """size distinct company names, most common first"""
+    combos = [f"{word} {suffix}" for suffix in COMPANY_SUFFIXES for word in COMPANY_WORDS]
+    return [combos[i % len(combos)] + (f" {i // len(combos) + 1}" if i >= len(combos) else "") for i in range(size)]
+
+def _salaries(rng, n):
+    """Free-text salary ranges in SALARY_FORMATS, each distinct string formatted once"""
+    lows = np.arange(SALARY_MIN_K, SALARY_MAX_K + 1, 5)
+    pool = [template.format(low=low, high=low + spread, low_full=low * 1000, high_full=(low + spread) * 1000,
+                            hourly=round(low * 1000 / 2080), monthly=int(round(low * 1000 / 12, -2)))
+            for template, _ in SALARY_FORMATS for spread in SALARY_SPREADS_K for low in lows]
+    low = np.clip(np.round(rng.lognormal(np.log(75), 0.45, n) / 5) * 5, SALARY_MIN_K, SALARY_MAX_K)
+    spread = rng.integers(0, len(SALARY_SPREADS_K), n)
+    fmt = _codes(rng, dict(enumerate(weight for _, weight in SALARY_FORMATS)), n)
+    codes = (fmt * len(SALARY_SPREADS_K) + spread) * len(lows) + ((low - SALARY_MIN_K) // 5).astype(int)
+    return _text(pool, codes, rng.random(n) < SALARY_RATE)
+
+def _days_after(rng, start, rate, low, high):
+    """Dates low..high days after start for roughly rate of the rows, NaT elsewhere"""
+    dates = start + pd.to_timedelta(rng.integers(low, high + 1, len(start)), unit='D')
+    return dates.where(rng.random(len(start)) < rate)
+
+def generate_applications(n, seed=0, today=None):
+    """n synthetic applications as a schema-typed DataFrame (deterministic per seed and today)"""
+    rng = np.random.default_rng(seed)
+    today = pd.Timestamp(today or pd.Timestamp.now()).normalize()
+
+    status = _category(rng, STATUS_WEIGHTS, n)
+    channel = _category(rng, CHANNEL_WEIGHTS, n)
+
+    # A few big employers and a long tail of one-offs
+    companies = _company_pool(max(50, n // 5))
+    p = 1.0 / np.arange(1, len(companies) + 1) ** COMPANY_SKEW
+    company = rng.choice(len(companies), n, p=p / p.sum())
+
+    titles = [level + title for level in SENIORITY for title in TITLES]
+    contacts = [f"{first} {last}" for first in FIRST_NAMES for last in LAST_NAMES]
+    contact = rng.integers(0, len(contacts), n)
+    has_contact = rng.random(n) < CONTACT_RATE
+    has_email = has_contact & (rng.random(n) < 0.8)
+    domains = np.array([re.sub(r"[^a-z0-9]+", "", name.lower()) + ".com" for name in companies], dtype=object)
+    first_names = np.array([name.split(" ")[0].lower() + "@" for name in contacts], dtype=object)
+    emails = np.full(n, None, dtype=object)
+    emails[has_email] = first_names[contact[has_email]] + domains[company[has_email]]
+
+    date_applied = pd.Series(today - pd.to_timedelta(np.minimum(rng.exponential(HISTORY_DAYS / 4, n), HISTORY_DAYS).astype(int), unit='D'))
+    interview_rate = pd.Series(status).map(INTERVIEW_RATES).astype(float).fillna(0.0).to_numpy()
+
+    df = pd.DataFrame({
+        'job_title': _text(titles, rng.integers(0, len(titles), n)),
+        'company': _text(companies, company),
+        'status': status,
+        'priority': _category(rng, PRIORITY_WEIGHTS, n),
+        'channel': channel,
+        'salary_range': _salaries(rng, n),
+        'location': _text(list(LOCATIONS), _codes(rng, LOCATIONS, n)),
+        'date_applied': date_applied,
+        'follow_up_date': _days_after(rng, date_applied, FOLLOW_UP_RATE, 3, 21),
+        'deadline': _days_after(rng, date_applied, DEADLINE_RATE, 1, 30),
+        'interview_date': _days_after(rng, date_applied, 1.0, 5, 45).where(rng.random(n) < interview_rate),
+        'notes': _text(NOTES, rng.integers(0, len(NOTES), n), rng.random(n) < NOTES_RATE),
+        'referral': pd.Categorical(np.where((channel == 'Referral') | (rng.random(n) < 0.05), 'Yes', 'No'),
+                                   categories=REFERRAL_OPTIONS),
+        'application_id': ("APP" + pd.Series(np.arange(1, n + 1)).astype('string').str.zfill(7))
+                          .where(rng.random(n) < APPLICATION_ID_RATE),
+        'contact_person': _text(contacts, contact, has_contact),
+        'contact_email': pd.array(emails, dtype='string'),
+    })
+    df.index = pd.RangeIndex(1, n + 1)
+    return apply_schema(df)
@@ -0,0 +1,51 @@
+"""Workspaces: one separate store per user or team, served from a single process
+
+Each named workspace keeps its data in WORKSPACES_DIR/<name>/, under the same file names
+the default (unnamed) workspace uses in the working directory. The workspace a request
+belongs to is held in a context variable, set around the request with use_workspace();
+get_storage(), the backups and the derived indexes all follow it, so concurrent sessions
+of different users never see each other's data.
+"""
+import contextvars
+import os
+import re
+from contextlib import contextmanager
+
+WORKSPACES_DIR = os.environ.get("JOB_TRACKER_WORKSPACES_DIR", "workspaces")
+WORKSPACE_NAME_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]{0,63}")
+
+_current = contextvars.ContextVar('workspace', default=None)
+
+def check_workspace_name(name):
+    """Return name if it can name a workspace (it becomes a directory name), else raise ValueError"""
+    if not isinstance(name, str) or not WORKSPACE_NAME_PATTERN.fullmatch(name):
+        raise ValueError(f"Invalid workspace name {name!r}: use up to 64 letters, digits, '-' or '_'.")
+    return name
+
+def current_workspace():
+    """Name of the workspace in use, or None for the default one"""
+    return _current.get()
+
+@contextmanager
+def use_workspace(name):
+    """Route storage, backups and derived indexes in the enclosed block to workspace name (None: default)"""
+    token = _current.set(None if name is None else check_workspace_name(name))
+    try:
+        yield name
+    finally:
+        _current.reset(token)
+
+def workspace_path(filename, workspace=None):
+    """Where a store file lives for workspace (None: the default workspace), creating its directory"""
+    if workspace is None:
+        return filename
+    directory = os.path.join(WORKSPACES_DIR, check_workspace_name(workspace))
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, filename)
+
+def list_workspaces():
+    """Names of the workspaces that have a directory, sorted"""
+    if not os.path.isdir(WORKSPACES_DIR):
+        return []
+    return sorted(name for name in os.listdir(WORKSPACES_DIR)
+                  if WORKSPACE_NAME_PATTERN.fullmatch(name) and os.path.isdir(os.path.join(WORKSPACES_DIR, name)))
@@ -0,0 +1,238 @@
+"""Write-behind storage: edits land in memory at once and reach disk in coalesced batches
+
+WriteBehindStore wraps a backend for a single app process that owns its data. Every insert,
+update and delete is applied to an in-memory copy of the applications and queued as a
+journal operation, so the caller returns without touching the disk. One writer thread
+waits for a burst of edits to go quiet (WRITE_BEHIND_DELAY_SECONDS, but never longer than
+WRITE_BEHIND_MAX_DELAY_SECONDS after the first one), collapses the queue to one operation
+per application and hands it to the backend's apply_ops as a single write: one journal
+append for CSV, one transaction for SQLite. The store on disk is therefore always the
+in-memory state as of some earlier flush, never half of one.
+
+close() flushes whatever is still queued; the service registers it to run at exit and
+calls it when it evicts the workspace. Writes made after close() (by a caller still holding
+the store) go straight to the backend. Writes made by other processes while the store is
+open are not seen.
+"""
+import os
+import threading
+import time
+
+from .profiling import profile_methods
+from .storage import STORAGE_PROFILED_METHODS, StorageBackend, check_unchanged, check_version, encode_record, merge_changes, replay_journal
+
+WRITE_BEHIND = os.environ.get("JOB_TRACKER_WRITE_BEHIND", "0") == "1"
+WRITE_BEHIND_DELAY_SECONDS = 0.5  # Flush once no edit has arrived for this long...
+WRITE_BEHIND_MAX_DELAY_SECONDS = 5.0  # ...or this long after the first edit of a burst
+WRITE_BEHIND_RETRY_SECONDS = 2.0
+
+def coalesce_ops(ops):
+    """Collapse journal operations to at most one per application, with the same end result
+
+    Updates fold into the insert or update before them and a delete replaces everything
+    queued for that application. Operations on different applications are independent.
+    """
+    merged = {}
+    for op in ops:
+        key, kind = op['key'], op['op']
+        previous = merged.get(key)
+        if kind == 'insert' or kind == 'delete' or previous is None:
+            merged[key] = {'op': kind, 'key': key, **({'record': dict(op['record'])} if 'record' in op else {})}
+        elif previous['op'] != 'delete':
+            previous['record'].update(op['record'])
+    return list(merged.values())
+
+@profile_methods('write_behind', *STORAGE_PROFILED_METHODS)
+class WriteBehindStore(StorageBackend):
+    """In-memory applications in front of a backend, written back by one background thread"""
+
+    def __init__(self, backend, delay=WRITE_BEHIND_DELAY_SECONDS, max_delay=WRITE_BEHIND_MAX_DELAY_SECONDS,
+                 retry=WRITE_BEHIND_RETRY_SECONDS):
+        self.backend = backend
+        self.path = backend.path
+        self.delay = delay
+        self.max_delay = max_delay
+        self.retry = retry
+        self.writes = 0  # Batches written to the backend
+        self.flushed_ops = 0  # Queued operations those batches covered
+        self.last_error = None
+        self._df = backend.load()
+        self._version = backend.version()
+        self._next_key = backend.next_key()
+        self._queue = []
+        self._in_flight = 0
+        self._burst_started = self._last_queued = None
+        self._flush_now = False
+        self._closing = False
+        self._attempts = 0
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def start(self):
+        """Start the writer thread (once)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+            self._thread.start()
+        return self
+
+    def pending_writes(self):
+        """Operations applied in memory but not yet on disk"""
+        with self._cond:
+            return len(self._queue) + self._in_flight
+
+    def _queue_ops(self, *ops):
+        """Apply operations to the in-memory frame and queue them; _cond must be held"""
+        if self._closing:
+            # No writer thread to hand them to: write through, after anything still queued
+            self._drain()
+            self.backend.apply_ops(list(ops))
+        self._df = replay_journal(self._df, list(ops))
+        self._version += 1
+        if self._closing:
+            return
+        now = time.monotonic()
+        if not self._queue:
+            self._burst_started = now
+        self._last_queued = now
+        self._queue.extend(ops)
+        self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closing:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                # Let the burst go quiet first, unless asked to flush or it has run long
+                while not (self._flush_now or self._closing):
+                    now = time.monotonic()
+                    timeout = min(self._last_queued + self.delay, self._burst_started + self.max_delay) - now
+                    if timeout <= 0:
+                        break
+                    self._cond.wait(timeout)
+                batch, self._queue = self._queue, []
+                self._in_flight = len(batch)
+                self._flush_now = False
+            try:
+                self.backend.apply_ops(coalesce_ops(batch))
+                error = None
+            except Exception as e:  # Keep the edits queued; the next attempt retries them
+                error = e
+            with self._cond:
+                self._in_flight = 0
+                self._attempts += 1
+                self.last_error = error
+                if error is None:
+                    self.writes += 1
+                    self.flushed_ops += len(batch)
+                else:
+                    self._queue[:0] = batch
+                    self._burst_started = self._last_queued = time.monotonic()
+                self._cond.notify_all()
+                if error is not None:
+                    if self._closing:
+                        return
+                    self._cond.wait(self.retry)
+
+    def _drain(self):
+        """Wait until everything queued so far is on disk; _cond must be held
+
+        Raises the backend's error if a flush attempt fails meanwhile.
+        """
+        attempts = self._attempts
+        while self._queue or self._in_flight:
+            if self._attempts > attempts and self.last_error is not None:
+                raise self.last_error
+            if self._thread is None or not self._thread.is_alive():
+                raise RuntimeError("The write-behind thread is not running.")
+            self._flush_now = True
+            self._cond.notify_all()
+            self._cond.wait()
+
+    def flush(self):
+        """Write queued edits now and wait until they are on disk"""
+        with self._cond:
+            self._drain()
+
+    def close(self):
+        """Flush queued edits and stop the writer thread"""
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._cond:
+            if self._queue:
+                raise RuntimeError(f"{len(self._queue)} queued edits could not be saved: {self.last_error}")
+
+    def load(self, columns=None):
+        with self._cond:
+            return self._df.copy() if columns is None else self._df[columns].copy()
+
+    def version(self):
+        with self._cond:
+            return self._version
+
+    def get(self, key):
+        key = int(key)
+        with self._cond:
+            return self._df.loc[key].to_dict() if key in self._df.index else None
+
+    def next_key(self):
+        with self._cond:
+            return self._next_key
+
+    def save(self, df, expected_version=None):
+        with self._cond:
+            # A full replacement supersedes queued edits, but must not be overtaken by them
+            self._drain()
+            check_version(self._version, expected_version)
+            self.backend.save(df)
+            self._df = self.backend.load()
+            self._version += 1
+            self._next_key = max(self._next_key, self.backend.next_key())
+
+    def insert(self, record, expected_version=None):
+        record = encode_record(record)
+        with self._cond:
+            check_version(self._version, expected_version)
+            key = self._next_key
+            self._next_key += 1
+            self._queue_ops({'op': 'insert', 'key': key, 'record': record})
+        return key
+
+    def insert_many(self, records):
+        records = [encode_record(record) for record in records]
+        if not records:
+            return []
+        with self._cond:
+            keys = list(range(self._next_key, self._next_key + len(records)))
+            self._next_key += len(records)
+            self._queue_ops(*({'op': 'insert', 'key': key, 'record': record} for key, record in zip(keys, records)))
+        return keys
+
+    def update(self, key, record, base=None, expected_version=None):
+        key = int(key)
+        with self._cond:
+            check_version(self._version, expected_version)
+            if base is not None:
+                record = merge_changes(self.get(key), base, record)
+                if not record:
+                    return
+            self._queue_ops({'op': 'update', 'key': key, 'record': encode_record(record)})
+
+    def delete(self, key, base=None, expected_version=None):
+        key = int(key)
+        with self._cond:
+            check_version(self._version, expected_version)
+            if base is not None:
+                check_unchanged(self.get(key), base)
+            self._queue_ops({'op': 'delete', 'key': key})
+
+    def apply_ops(self, ops):
+        if ops:
+            with self._cond:
+                self._next_key = max([self._next_key] + [int(op['key']) + 1 for op in ops])
+                self._queue_ops(*ops)
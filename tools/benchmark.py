@@ -0,0 +1,154 @@
+"""Time the core operations on synthetic datasets of increasing size and emit JSON
+
+For every size, a seeded dataset from job_tracker.synthetic is saved into a fresh store in
+a temporary directory. Then each benchmark is run --repeat times:
+
+- save: replace all applications (storage.save)
+- load / load_cached: storage.load with the parsed-data cache cleared / warm
+- dashboard: reminders and aggregate counts, as the dashboard computes them
+- tracker_filter: one filtered, sorted page plus its total count
+- search_build / search: build the search index / run a set of queries on it
+- insights: aggregate counts, the priority x status crosstab and parsed salaries
+- calendar: build the event index and query the current month
+
+    python tools/benchmark.py --sizes 1000 10000 100000 --output results.json
+    python tools/benchmark.py --baseline results.json   # exit 1 on regressions
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd  # noqa: E402
+
+from job_tracker.analytics import Aggregates, SalaryIndex  # noqa: E402
+from job_tracker.events import EventIndex  # noqa: E402
+from job_tracker.reminders import compute_reminders  # noqa: E402
+from job_tracker.search import SearchIndex  # noqa: E402
+from job_tracker.storage import ArrowBackend, CSVBackend, SQLiteBackend, get_data_cache  # noqa: E402
+from job_tracker.synthetic import generate_applications  # noqa: E402
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+SEARCH_QUERIES = ['acme', 'senior engineer', 'feedback', 'lab', 'priya', 'nomatchatall']
+TRACKER_QUERY = {'filters': {'status': ['Applied', 'Interviewing']}, 'order_by': 'date_applied',
+                 'descending': True, 'limit': 50}
+FIXED_TODAY = '2026-01-15'  # Generated dates and reminder windows line up across runs
+
+def open_store(backend, directory):
+    """An empty store of the given backend in directory"""
+    if backend == 'csv':
+        return CSVBackend(os.path.join(directory, 'apps.csv'))
+    if backend == 'arrow':
+        return ArrowBackend(os.path.join(directory, 'apps.arrow'))
+    return SQLiteBackend(os.path.join(directory, 'apps.db'))
+
+def timed(fn, repeat, setup=None):
+    """Run fn repeat times (after setup, untimed, each time); return the timings in ms"""
+    runs = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - start) * 1000)
+    return runs
+
+def run_size(size, backend, repeat, seed):
+    """Timings in ms for every benchmark at one dataset size, as {name: [runs]}"""
+    today = pd.Timestamp(FIXED_TODAY)
+    results = {}
+    start = time.perf_counter()
+    df = generate_applications(size, seed=seed, today=today)
+    results['generate'] = [(time.perf_counter() - start) * 1000]
+
+    with tempfile.TemporaryDirectory() as directory:
+        storage = open_store(backend, directory)
+        results['save'] = timed(lambda: storage.save(df), repeat)
+        path = storage.path
+        results['load'] = timed(storage.load, repeat, setup=lambda: get_data_cache().invalidate(path))
+        results['load_cached'] = timed(storage.load, repeat)
+        df = storage.load()
+
+        def dashboard():
+            reminders = compute_reminders(df, today=today.date())
+            aggregates = Aggregates(df)
+            return reminders, aggregates.active, aggregates.count('status', 'Offered')
+        results['dashboard'] = timed(dashboard, repeat)
+        results['tracker_filter'] = timed(lambda: (storage.query(**TRACKER_QUERY),
+                                                   storage.count(filters=TRACKER_QUERY['filters'])), repeat)
+        get_data_cache().invalidate()
+
+    index = SearchIndex(df)
+    results['search_build'] = timed(lambda: SearchIndex(df), repeat)
+    results['search'] = timed(lambda: [index.search(query, limit=50) for query in SEARCH_QUERIES], repeat)
+
+    def insights():
+        aggregates = Aggregates(df)
+        return aggregates.value_counts('status'), aggregates.value_counts('channel'), aggregates.crosstab(), SalaryIndex(df)
+    results['insights'] = timed(insights, repeat)
+    results['calendar'] = timed(lambda: EventIndex(df).month(today.year, today.month), repeat)
+    return results
+
+def compare(results, baseline, max_slowdown, min_delta_ms):
+    """Benchmarks whose median is over max_slowdown times, and min_delta_ms above, the baseline's"""
+    before = {(row['backend'], row['size'], row['benchmark']): row['median_ms'] for row in baseline['results']}
+    regressions = []
+    for row in results:
+        old = before.get((row['backend'], row['size'], row['benchmark']))
+        if old and row['median_ms'] > old * max_slowdown and row['median_ms'] - old > min_delta_ms:
+            regressions.append(f"{row['backend']} {row['size']} {row['benchmark']}: "
+                               f"{old:.1f} -> {row['median_ms']:.1f} ms")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="dataset sizes (up to 1000000)")
+    parser.add_argument('--backend', choices=['sqlite', 'csv', 'arrow'], nargs='+', default=['sqlite'])
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per benchmark")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write the JSON here instead of stdout")
+    parser.add_argument('--baseline', help="earlier JSON output to compare against")
+    parser.add_argument('--max-slowdown', type=float, default=1.5,
+                        help="median ratio over the baseline that counts as a regression")
+    parser.add_argument('--min-delta-ms', type=float, default=5.0,
+                        help="ignore slowdowns smaller than this, which are mostly timer noise")
+    args = parser.parse_args()
+
+    results = []
+    for backend in args.backend:
+        for size in args.sizes:
+            for name, runs in run_size(size, backend, args.repeat, args.seed).items():
+                results.append({'backend': backend, 'size': size, 'benchmark': name,
+                                'median_ms': round(statistics.median(runs), 3), 'min_ms': round(min(runs), 3),
+                                'runs_ms': [round(run, 3) for run in runs]})
+                print(f"{backend:<7}{size:>9} {name:<15}{statistics.median(runs):>11.1f} ms", file=sys.stderr)
+
+    report = {
+        'meta': {'python': platform.python_version(), 'pandas': pd.__version__, 'platform': platform.platform(),
+                 'seed': args.seed, 'repeat': args.repeat, 'created': time.strftime('%Y-%m-%dT%H:%M:%S%z')},
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.max_slowdown, args.min_delta_ms)
+        for line in regressions:
+            print(f"Regression: {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
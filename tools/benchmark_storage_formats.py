@@ -0,0 +1,123 @@
+"""Compare load time and memory of the CSV and Arrow stores, full and column-projected
+
+For every size, a seeded dataset from job_tracker.synthetic is saved into a CSV store and
+an Arrow store in a temporary directory. Each load below then runs --repeat times, each in
+a fresh interpreter so the parsed-data cache is cold and memory is measured from the same
+baseline:
+
+- full: storage.load()
+- projected: storage.load(columns=[status, channel]), what the sidebar and insights counts need
+
+For each it reports the median time of the first load, of a second load in the same
+process (warm data cache) and the growth of the process's resident memory (VmRSS, and the
+peak VmHWM) over the load. Memory is read from /proc, so it is only reported on Linux.
+
+    python tools/benchmark_storage_formats.py --sizes 100000 1000000 --output formats.json
+"""
+import argparse
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_SIZES = [100000, 1000000]
+PROJECTED_COLUMNS = ['status', 'channel']
+FIXED_TODAY = '2026-01-15'
+
+def memory_kb():
+    """(VmRSS, VmHWM) of this process in KB, or (None, None) without /proc"""
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            fields = dict(line.split(':', 1) for line in f)
+    except OSError:
+        return None, None
+    return int(fields['VmRSS'].split()[0]), int(fields['VmHWM'].split()[0])
+
+def measure(backend, path, columns):
+    """One load in this (fresh) process, as a dict of timings and memory growth"""
+    # Libraries are imported up front so that the baseline includes them
+    importlib.import_module('pyarrow.ipc')
+    from job_tracker.storage import ArrowBackend, CSVBackend
+
+    storage = ArrowBackend(path) if backend == 'arrow' else CSVBackend(path)
+    rss, hwm = memory_kb()
+    start = time.perf_counter()
+    df = storage.load(columns)
+    first_ms = (time.perf_counter() - start) * 1000
+    after_rss, after_hwm = memory_kb()
+    start = time.perf_counter()
+    storage.load(columns)
+    again_ms = (time.perf_counter() - start) * 1000
+    result = {'rows': len(df), 'first_ms': round(first_ms, 1), 'again_ms': round(again_ms, 1),
+              'rss_mb': None, 'peak_mb': None}
+    if rss is not None:
+        result['rss_mb'] = round((after_rss - rss) / 1024, 1)
+        result['peak_mb'] = round((after_hwm - hwm) / 1024, 1)
+    return result
+
+def measure_in_subprocess(backend, path, columns):
+    command = [sys.executable, os.path.abspath(__file__), '--measure', backend, path]
+    if columns:
+        command += ['--columns', *columns]
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+def median(runs, field):
+    values = [run[field] for run in runs if run[field] is not None]
+    return round(statistics.median(values), 1) if values else None
+
+def run_size(size, args):
+    from job_tracker.storage import ArrowBackend, CSVBackend
+    from job_tracker.synthetic import generate_applications
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        df = generate_applications(size, seed=args.seed, today=FIXED_TODAY)
+        paths = {'csv': os.path.join(directory, 'apps.csv'), 'arrow': os.path.join(directory, 'apps.arrow')}
+        for backend, path in paths.items():
+            storage = CSVBackend(path) if backend == 'csv' else ArrowBackend(path)
+            start = time.perf_counter()
+            storage.save(df)
+            save_ms = (time.perf_counter() - start) * 1000
+            for load, columns in [('full', None), ('projected', PROJECTED_COLUMNS)]:
+                runs = [measure_in_subprocess(backend, path, columns) for _ in range(args.repeat)]
+                row = {'size': size, 'backend': backend, 'load': load, 'file_mb': round(os.path.getsize(path) / 2 ** 20, 1),
+                       'save_ms': round(save_ms, 1), **{field: median(runs, field) for field in
+                                                         ('first_ms', 'again_ms', 'rss_mb', 'peak_mb')}}
+                results.append(row)
+                print(f"{size:>9,} {backend:<6} {load:<10} file {row['file_mb']:>7,.1f} MB  "
+                      f"load {row['first_ms']:>9,.1f} ms (again {row['again_ms']:>8,.1f} ms)  "
+                      f"RSS +{row['rss_mb']} MB (peak +{row['peak_mb']} MB)", file=sys.stderr)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=3, help="fresh processes per measurement")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write the JSON here instead of stdout")
+    parser.add_argument('--measure', nargs=2, metavar=('BACKEND', 'PATH'), help=argparse.SUPPRESS)
+    parser.add_argument('--columns', nargs='+', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(*args.measure, args.columns)))
+        return 0
+    results = [row for size in args.sizes for row in run_size(size, args)]
+    text = json.dumps({'projected_columns': PROJECTED_COLUMNS, 'results': results}, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
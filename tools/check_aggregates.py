@@ -0,0 +1,109 @@
+"""Check the incrementally maintained aggregate counts against a full recompute
+
+--rows synthetic applications are counted once with Aggregates(df), then --edits random
+single-application writes are applied both to the frame and to the counts, the way the
+service patches the cached counts after a write: updates of random counted fields
+(including clearing them), inserts, deletes, deletes of missing keys and repeated upserts
+of an unchanged row. Every --check-every edits, and at the end:
+
+- matches: Aggregates.matches(df) holds, i.e. the counts equal Aggregates(df) built afresh
+- views: value_counts and crosstab equal pandas' value_counts and crosstab of the frame
+
+Timings of one upsert and of a full recompute are printed. Exits with status 1 on a
+failure, so it can run as a CI step:
+    python tools/check_aggregates.py
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd  # noqa: E402
+
+from job_tracker.analytics import AGGREGATE_COLUMNS, Aggregates  # noqa: E402
+from job_tracker.synthetic import generate_applications  # noqa: E402
+
+FIXED_TODAY = '2026-01-15'
+
+def check_views(aggregates, df, label):
+    """Failure messages where the count views differ from pandas on df"""
+    failures = []
+    for col in AGGREGATE_COLUMNS:
+        expected = df[col].astype(object).value_counts()
+        actual = aggregates.value_counts(col)
+        if expected.to_dict() != actual.to_dict():
+            failures.append(f"{label}: value_counts('{col}') differs from the frame's")
+    expected = pd.crosstab(df['priority'].astype(object), df['status'].astype(object))
+    actual = aggregates.crosstab()
+    expected = expected.reindex(index=actual.index, columns=actual.columns)
+    if not expected.fillna(0).astype('int64').equals(actual) or expected.values.sum() != actual.values.sum():
+        failures.append(f"{label}: crosstab differs from the frame's")
+    if aggregates.total != len(df):
+        failures.append(f"{label}: total {aggregates.total}, expected {len(df)}")
+    return failures
+
+def run_edits(df, aggregates, edits, check_every, rng, seed):
+    """Apply random edits to df and aggregates; return (df, failures, upsert timings in ms)"""
+    donors = generate_applications(edits, seed=seed + 1, today=FIXED_TODAY).to_dict('records')
+    next_key = int(df.index.max()) + 1
+    failures, upsert_ms = [], []
+    for i, donor in enumerate(donors, 1):
+        kind = rng.random()
+        if kind < 0.15:
+            key, next_key = next_key, next_key + 1
+            df.loc[key] = pd.Series(donor)
+        elif kind < 0.25 and len(df):
+            key = rng.choice(list(df.index))
+            df = df.drop(index=key)
+            aggregates.remove(key)
+            continue
+        elif kind < 0.3:
+            aggregates.remove(next_key + 1000)  # Not stored: a no-op
+            continue
+        else:
+            key = rng.choice(list(df.index))
+            if kind >= 0.35:  # Otherwise upsert the unchanged row again
+                for col in rng.sample(AGGREGATE_COLUMNS, rng.randint(1, len(AGGREGATE_COLUMNS))):
+                    df.loc[key, col] = None if rng.random() < 0.25 else donor[col]
+        record = df.loc[key].to_dict()
+        start = time.perf_counter()
+        aggregates.upsert(key, record)
+        upsert_ms.append((time.perf_counter() - start) * 1000)
+        if i % check_every == 0 and not aggregates.matches(df):
+            failures.append(f"after edit {i}: counts differ from a full recompute")
+            break
+    return df, failures, upsert_ms
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--edits', type=int, default=2000)
+    parser.add_argument('--check-every', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    df = generate_applications(args.rows, seed=args.seed, today=FIXED_TODAY)
+    start = time.perf_counter()
+    aggregates = Aggregates(df)
+    build_ms = (time.perf_counter() - start) * 1000
+    failures = check_views(aggregates, df, "initial")
+    df, edit_failures, upsert_ms = run_edits(df, aggregates, args.edits, args.check_every, rng, args.seed)
+    failures += edit_failures
+    if not aggregates.matches(df):
+        failures.append("after all edits: counts differ from a full recompute")
+    failures += check_views(aggregates, df, "after all edits")
+    upsert_ms.sort()
+    print(f"{args.edits} edits on {args.rows:,} applications: upsert p50 {upsert_ms[len(upsert_ms) // 2]:.3f} ms "
+          f"(max {upsert_ms[-1]:.3f} ms), full recompute {build_ms:,.1f} ms; "
+          f"{'counts match a recompute' if not failures else 'FAILED'}")
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""Check that concurrent read-modify-write edits from threads and processes lose no updates
+
+On each backend, in a temporary directory, --threads threads in this process (sharing one
+store, as the app's sessions do) and --processes child processes (each with its own) run at
+the same time. Every writer makes --ops edits, each of which:
+
+- reads one of a few contended applications, appends its own unique token to the notes it
+  read, and writes them back with the row it read as base=; a StaleWriteError means another
+  writer got there first, so it reads again and retries
+- every --insert-every edits, also adds an application named after the writer and edit
+
+Afterwards every token must be in the notes exactly once, every added application must be
+stored exactly once, and the row count must add up. Then the threads all write at once with
+the same expected_version= (what the API does for If-Match): exactly one may succeed. Exits with status 1 on a failure, so it
+can run as a CI step:
+    python tools/check_concurrency.py --threads 4 --processes 4 --ops 50
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from job_tracker.storage import ArrowBackend, CSVBackend, SQLiteBackend, StaleWriteError  # noqa: E402
+from job_tracker.synthetic import generate_applications  # noqa: E402
+
+SEED_ROWS = 50
+CONTENDED_KEYS = [1, 2, 3, 4]
+MAX_RETRIES = 1000
+COMPACT_BYTES = 64 * 1024  # Small, so CSV compactions run while the writers are busy
+
+def open_store(backend, directory):
+    if backend == 'csv':
+        return CSVBackend(os.path.join(directory, 'apps.csv'), compact_bytes=COMPACT_BYTES)
+    if backend == 'arrow':
+        return ArrowBackend(os.path.join(directory, 'apps.arrow'), compact_bytes=COMPACT_BYTES)
+    return SQLiteBackend(os.path.join(directory, 'apps.db'))
+
+def seed(backend, directory):
+    df = generate_applications(SEED_ROWS, seed=0, today='2026-01-15')
+    df['notes'] = None
+    open_store(backend, directory).save(df)
+
+def append_token(store, key, token):
+    """Append token to the notes of key by read-modify-write; return the number of conflicts retried"""
+    for conflicts in range(MAX_RETRIES):
+        base = store.get(key)
+        notes = base['notes'] if isinstance(base['notes'], str) else ""
+        try:
+            store.update(key, {'notes': f"{notes} {token}".strip()}, base=base)
+            return conflicts
+        except StaleWriteError:
+            continue
+    raise RuntimeError(f"{token}: gave up after {MAX_RETRIES} conflicts")
+
+def run_writer(store, name, ops, insert_every, seed_value):
+    """One writer's edits; returns the number of conflicts it retried"""
+    rng = random.Random(seed_value)
+    conflicts = 0
+    for i in range(ops):
+        if i % insert_every == 0:
+            store.insert({'job_title': 'Concurrent', 'company': f"{name}-{i}", 'status': 'Applied',
+                          'date_applied': '2026-01-15'})
+        conflicts += append_token(store, rng.choice(CONTENDED_KEYS), f"{name}-{i}")
+    return conflicts
+
+def verify(backend, directory, writers, ops, insert_every):
+    """Failure messages for the store the writers left behind"""
+    failures = []
+    df = open_store(backend, directory).load()
+    tokens = Counter(token for key in CONTENDED_KEYS for token in str(df.loc[key, 'notes'] or "").split())
+    expected = {f"{name}-{i}" for name in writers for i in range(ops)}
+    lost = expected - set(tokens)
+    doubled = [token for token, count in tokens.items() if count > 1]
+    if lost:
+        failures.append(f"{backend}: {len(lost)} of {len(expected)} edits lost, e.g. {sorted(lost)[:5]}")
+    if doubled:
+        failures.append(f"{backend}: {len(doubled)} edits applied twice, e.g. {sorted(doubled)[:5]}")
+    added = Counter(df.loc[df['job_title'] == 'Concurrent', 'company'])
+    expected_added = {f"{name}-{i}" for name in writers for i in range(0, ops, insert_every)}
+    if set(added) != expected_added or any(count > 1 for count in added.values()):
+        failures.append(f"{backend}: {sum(added.values())} applications added, expected {len(expected_added)} distinct")
+    if len(df) != SEED_ROWS + len(expected_added):
+        failures.append(f"{backend}: {len(df)} rows, expected {SEED_ROWS + len(expected_added)}")
+    return failures
+
+def check_expected_version(backend, directory, threads):
+    """Failure messages unless exactly one of threads writes made against one version succeeds"""
+    store = open_store(backend, directory)
+    version = store.version()
+    barrier = threading.Barrier(threads)
+    outcomes = []
+
+    def write(i):
+        barrier.wait()
+        try:
+            store.update(CONTENDED_KEYS[0], {'notes': f"expected-version-{i}"}, expected_version=version)
+            outcomes.append('written')
+        except StaleWriteError:
+            outcomes.append('stale')
+
+    workers = [threading.Thread(target=write, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    if outcomes.count('written') != 1:
+        return [f"{backend}: {outcomes.count('written')} of {threads} writes with the same expected_version succeeded"]
+    return []
+
+def check_backend(backend, args):
+    with tempfile.TemporaryDirectory() as directory:
+        seed(backend, directory)
+        threads = [f"t{i}" for i in range(args.threads)]
+        processes = [f"p{i}" for i in range(args.processes)]
+        start = time.perf_counter()
+        children = [subprocess.Popen([sys.executable, os.path.abspath(__file__), '--child', backend, directory, name,
+                                      str(args.ops), str(args.insert_every), str(args.seed + i)],
+                                     cwd=ROOT, stdout=subprocess.PIPE, text=True)
+                    for i, name in enumerate(processes)]
+        store = open_store(backend, directory)
+        conflicts, errors = [], []
+
+        def work(name, seed_value):
+            try:
+                conflicts.append(run_writer(store, name, args.ops, args.insert_every, seed_value))
+            except Exception as e:
+                errors.append(f"{backend} {name}: {e!r}")
+
+        workers = [threading.Thread(target=work, args=(name, args.seed + 1000 + i)) for i, name in enumerate(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        for name, child in zip(processes, children):
+            out, _ = child.communicate()
+            if child.returncode:
+                errors.append(f"{backend} {name}: exited with status {child.returncode}")
+            else:
+                conflicts.append(json.loads(out)['conflicts'])
+        elapsed = time.perf_counter() - start
+        failures = errors + verify(backend, directory, threads + processes, args.ops, args.insert_every)
+        failures += check_expected_version(backend, directory, max(args.threads, 2))
+    edits = (args.threads + args.processes) * args.ops
+    print(f"{backend:<7} {args.threads} threads + {args.processes} processes: {edits} read-modify-write edits "
+          f"({sum(conflicts)} conflicts retried) in {elapsed:,.1f} s, "
+          f"{'no lost updates' if not failures else 'FAILED'}")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--backend', choices=['sqlite', 'csv', 'arrow'], nargs='+', default=['sqlite', 'csv'])
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--ops', type=int, default=50, help="edits per writer")
+    parser.add_argument('--insert-every', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--child', nargs=6, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        backend, directory, name, ops, insert_every, seed_value = args.child
+        conflicts = run_writer(open_store(backend, directory), name, int(ops), int(insert_every), int(seed_value))
+        print(json.dumps({'conflicts': conflicts}))
+        return 0
+
+    failures = []
+    for backend in args.backend:
+        failures += check_backend(backend, args)
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
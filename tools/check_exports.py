@@ -0,0 +1,123 @@
+"""Check every export format round-trips and measure streaming memory and cache reuse
+
+In a temporary directory, --rows synthetic applications are stored in SQLite. For each
+available format, the filtered, sorted export is:
+
+- decoded again and compared with the query result (CSV byte for byte against to_csv)
+- timed on the first request and on a repeat, which must be served from the export cache
+- traced with tracemalloc while iter_export encodes the already loaded rows into a file,
+  next to building the whole CSV as one string (what the download button used to do)
+
+Exits with status 1 on a mismatch or a repeat that was not a cache hit:
+    python tools/check_exports.py --rows 100000
+"""
+import argparse
+import gzip
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd  # noqa: E402
+
+from job_tracker.exports import available_formats, get_export_cache, iter_export, stream_export  # noqa: E402
+from job_tracker.schema import APPLICATION_COLUMNS, apply_schema  # noqa: E402
+from job_tracker.storage import SQLiteBackend  # noqa: E402
+from job_tracker.synthetic import generate_applications  # noqa: E402
+
+QUERY = {'filters': {'status': ['Applied', 'Interviewing', 'Pending']}, 'order_by': 'date_applied', 'descending': True}
+
+def decode(fmt, data):
+    """An export read back as a schema-typed DataFrame"""
+    if fmt == 'csv':
+        df = pd.read_csv(io.BytesIO(data))
+    elif fmt == 'csv.gz':
+        df = pd.read_csv(io.BytesIO(gzip.decompress(data)))
+    elif fmt == 'jsonl':
+        df = pd.read_json(io.BytesIO(data), lines=True, dtype=False)
+    elif fmt == 'xlsx':
+        df = pd.read_excel(io.BytesIO(data))
+    else:
+        df = pd.read_parquet(io.BytesIO(data))
+    return apply_schema(df)[APPLICATION_COLUMNS]
+
+def streaming_peak(df, fmt):
+    """Peak bytes allocated while encoding df as fmt chunk by chunk into a file"""
+    with tempfile.TemporaryFile() as f:
+        tracemalloc.start()
+        for chunk in iter_export(df, fmt):
+            f.write(chunk)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return peak
+
+def check_format(storage, fmt, frame, expected, expected_csv):
+    failures = []
+    cache = get_export_cache()
+    misses = cache.misses
+    start = time.perf_counter()
+    data = b"".join(stream_export(storage, fmt, QUERY))
+    first_ms = (time.perf_counter() - start) * 1000
+    hits = cache.hits
+    start = time.perf_counter()
+    again = b"".join(stream_export(storage, fmt, QUERY))
+    repeat_ms = (time.perf_counter() - start) * 1000
+
+    if cache.misses != misses + 1 or cache.hits != hits + 1:
+        failures.append(f"{fmt}: the repeat was not served from the export cache")
+    if again != data:
+        failures.append(f"{fmt}: the cached export differs from the first one")
+    if fmt in ('csv', 'csv.gz'):
+        if (gzip.decompress(data) if fmt == 'csv.gz' else data) != expected_csv:
+            failures.append(f"{fmt}: differs from DataFrame.to_csv")
+    else:
+        back = decode(fmt, data)
+        different = [col for col in APPLICATION_COLUMNS if not back[col].equals(expected[col])]
+        if len(back) != len(expected) or different:
+            failures.append(f"{fmt}: {len(back)} rows read back, columns differing: {different}")
+    peak = streaming_peak(frame, fmt)
+    print(f"{fmt:<8} {len(data) / 2 ** 20:>8.1f} MB  first {first_ms:>8,.0f} ms  repeat {repeat_ms:>7.1f} ms  "
+          f"peak memory while encoding {peak / 2 ** 20:>6.1f} MB")
+    return failures, {'format': fmt, 'bytes': len(data), 'first_ms': round(first_ms, 1),
+                      'repeat_ms': round(repeat_ms, 2), 'peak_bytes': peak}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--formats', nargs='+', help="default: every available format")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="also write the timings here as JSON")
+    args = parser.parse_args()
+
+    failures, results = [], []
+    with tempfile.TemporaryDirectory() as directory:
+        storage = SQLiteBackend(os.path.join(directory, 'apps.db'))
+        storage.save(generate_applications(args.rows, seed=args.seed, today='2026-01-15'))
+        frame = storage.query(**QUERY)
+        expected = frame[APPLICATION_COLUMNS]
+        tracemalloc.start()
+        expected_csv = expected.to_csv(index=False).encode('utf-8')
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{len(expected):,} applications; building the CSV as one string peaked at {peak / 2 ** 20:.1f} MB "
+              f"for a {len(expected_csv) / 2 ** 20:.1f} MB payload")
+        expected = expected.reset_index(drop=True)
+        for fmt in args.formats or available_formats():
+            format_failures, row = check_format(storage, fmt, frame, expected, expected_csv)
+            failures += format_failures
+            results.append(row)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'rows': args.rows, 'results': results}, f, indent=2)
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
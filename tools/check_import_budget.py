@@ -0,0 +1,85 @@
+"""Check that the job_tracker core stays cheap to import and free of UI dependencies
+
+Each module is imported in a fresh interpreter with -X importtime, best of --runs:
+
+- total: cumulative import time, including pandas and everything else it pulls in
+- own: time spent in job_tracker's own modules only (stable across machines and pandas versions)
+
+Exits with status 1 when a module exceeds its budget or imports a UI package, so it can
+run as a CI step: python tools/check_import_budget.py
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Module -> (total budget, own budget) in milliseconds; None means not checked
+IMPORT_BUDGETS_MS = {
+    'job_tracker': (20, 5),
+    'job_tracker.schema': (None, 20),
+    'job_tracker.storage': (None, 40),
+    'job_tracker.reminders': (None, 20),
+    'job_tracker.search': (None, 20),
+    'job_tracker.salary': (None, 20),
+    'job_tracker.analytics': (None, 40),
+    'job_tracker.indexes': (None, 50),
+    'job_tracker.service': (None, 80),
+    'job_tracker.bulk_import': (None, 40),
+    'job_tracker.synthetic': (None, 20),
+    'job_tracker.profiling': (30, 10),
+    'job_tracker.write_behind': (None, 60),
+    'job_tracker.workspaces': (20, 5),
+    'job_tracker.scheduler': (None, 40),
+    'job_tracker.exports': (None, 40),
+    'job_tracker.api': (None, 120),
+}
+
+# Packages the core must never import
+FORBIDDEN_PACKAGES = ['streamlit', 'plotly']
+
+def measure(module):
+    """(total ms, own ms, forbidden packages imported) for one import in a fresh interpreter"""
+    check = (f"import json, sys, {module}; "
+             f"print(json.dumps(sorted({{m.split('.')[0] for m in sys.modules}} & {set(FORBIDDEN_PACKAGES)!r})))")
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', check], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    total = own = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = [part.strip() for part in line[len('import time:'):].split('|')]
+        if name == module:
+            total = int(cumulative_us) / 1000
+        if name.split('.')[0] == 'job_tracker':
+            own += int(self_us) / 1000
+    return total, own, json.loads(result.stdout)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help="imports per module; the fastest counts")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':<26}{'total ms':>10}{'own ms':>9}  budget")
+    for module, (total_budget, own_budget) in IMPORT_BUDGETS_MS.items():
+        runs = [measure(module) for _ in range(args.runs)]
+        total, own = min(run[0] for run in runs), min(run[1] for run in runs)
+        forbidden = sorted({name for run in runs for name in run[2]})
+        over = [f"total > {total_budget}"] if total_budget is not None and total > total_budget else []
+        over += [f"own > {own_budget}"] if own > own_budget else []
+        over += [f"imports {', '.join(forbidden)}"] if forbidden else []
+        budget = f"{total_budget if total_budget is not None else '-'} / {own_budget}"
+        print(f"{module:<26}{total:>10.1f}{own:>9.1f}  {budget}{'  FAIL: ' + '; '.join(over) if over else ''}")
+        if over:
+            failures.append(module)
+
+    if failures:
+        print(f"Import budget exceeded: {', '.join(failures)}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""Check the reminder scheduler against the dashboard and time its heap and feed updates
+
+In a temporary directory, --rows synthetic applications are stored in SQLite and a
+ReminderScheduler is run on a simulated clock, one step per day for --days days:
+
+- agreement: on every day, each reminder the dashboard (compute_reminders) shows has been
+  fired by then, and everything fired that day is on the dashboard
+- once: a restarted scheduler on the same directory fires nothing again
+- edits: --edits single-application writes are patched into the heap and feed without a
+  rebuild, and leave the same pending reminders and feed as a rebuild from scratch
+- feed: every line of the .ics feed is CRLF-terminated and at most 75 octets, with one
+  VEVENT per reminder date
+- thread: with the background thread running, an interview added for tomorrow reaches the
+  outbox file within a second
+
+Timings of a full rebuild, one patched edit and a feed request are printed. Exits with
+status 1 on a failure, so it can run as a CI step:
+    python tools/check_reminders.py
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd  # noqa: E402
+
+from job_tracker.reminders import compute_reminders  # noqa: E402
+from job_tracker.scheduler import OUTBOX_FILE, REMINDER_COLUMNS, ReminderScheduler  # noqa: E402
+from job_tracker.storage import SQLiteBackend  # noqa: E402
+from job_tracker.synthetic import generate_applications  # noqa: E402
+
+FIXED_TODAY = '2026-01-15'
+
+class Clock:
+    """A settable stand-in for datetime.now"""
+
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def dashboard_ids(df, today):
+    """Ids of the reminders compute_reminders shows on a day"""
+    reminders = compute_reminders(df, today=today)
+    ids = set()
+    for hits, column in [(reminders.upcoming_deadlines, 'deadline'), (reminders.follow_ups, 'follow_up_date'),
+                         (reminders.upcoming_interviews, 'interview_date')]:
+        kind = REMINDER_COLUMNS[column][0]
+        ids |= {f"{key}-{kind}-{day:%Y%m%d}" for key, day in zip(hits.index, pd.to_datetime(hits[column]))}
+    return ids
+
+def pending_ids(scheduler):
+    return {rid for _, rid, key in scheduler._heap if rid in scheduler._reminders.get(key, ())}
+
+def comparable_feed(scheduler):
+    """The feed without DTSTAMP lines, with its events in a stable order"""
+    text = scheduler.feed()[1].decode('utf-8')
+    return sorted(line for line in text.split("\r\n") if not line.startswith("DTSTAMP:"))
+
+def check_feed(scheduler, df):
+    failures = []
+    data = scheduler.feed()[1]
+    lines = data.split(b"\r\n")
+    if lines[-1] != b"" or any(b"\n" in line for line in lines):
+        failures.append("feed lines are not all CRLF-terminated")
+    long = [line for line in lines if len(line) > 75]
+    if long:
+        failures.append(f"{len(long)} feed lines are longer than 75 octets")
+    expected = sum(int(df[column].notna().sum()) for column in REMINDER_COLUMNS)
+    events = data.count(b"BEGIN:VEVENT")
+    if events != expected:
+        failures.append(f"feed has {events} events, expected {expected}")
+    return failures
+
+def check_agreement(storage, directory, days):
+    failures = []
+    df = storage.load()
+    clock = Clock(datetime.fromisoformat(FIXED_TODAY))
+    fired = []
+    scheduler = ReminderScheduler(storage, directory, hook=fired.append, clock=clock)
+    scheduler.sync()
+    seen = set()
+    for day in range(days):
+        clock.now = datetime.fromisoformat(FIXED_TODAY) + timedelta(days=day)
+        today = clock.now.date()
+        now_fired = {reminder['id'] for reminder in scheduler.fire_due()}
+        seen |= now_fired
+        shown = dashboard_ids(df, today)
+        if not shown <= seen:
+            failures.append(f"{today}: {len(shown - seen)} dashboard reminders were never fired")
+        if not now_fired <= shown:
+            failures.append(f"{today}: {len(now_fired - shown)} fired reminders are not on the dashboard")
+        if failures:
+            break
+    print(f"agreement: {len(fired):,} reminders fired over {days} days, all matching the dashboard"
+          if not failures else "agreement: FAILED")
+    again = ReminderScheduler(storage, directory, hook=fired.append, clock=clock)
+    again.sync()
+    refired = again.fire_due()
+    if refired:
+        failures.append(f"a restarted scheduler fired {len(refired)} reminders again")
+    return failures
+
+def check_edits(storage, directory, edits, rng):
+    failures = []
+    clock = Clock(datetime.fromisoformat(FIXED_TODAY))
+    scheduler = ReminderScheduler(storage, directory, hook=lambda reminder: None, clock=clock)
+    start = time.perf_counter()
+    scheduler.sync()
+    rebuild_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    scheduler.feed()
+    first_feed_ms = (time.perf_counter() - start) * 1000
+    keys = list(storage.load().index)
+    today = pd.Timestamp(FIXED_TODAY)
+    apply_ms = []
+    for i in range(edits):
+        before = storage.version()
+        kind = rng.random()
+        if kind < 0.2:
+            key = storage.insert({'job_title': 'Check', 'company': f"Check {i}", 'status': 'Interviewing',
+                                  'date_applied': FIXED_TODAY, 'interview_date': today + pd.Timedelta(days=rng.randint(0, 5))})
+        elif kind < 0.3:
+            key = keys.pop(rng.randrange(len(keys)))
+            storage.delete(key)
+        else:
+            key = rng.choice(keys)
+            column = rng.choice(list(REMINDER_COLUMNS))
+            storage.update(key, {column: None if rng.random() < 0.3 else today + pd.Timedelta(days=rng.randint(-3, 20)),
+                                 'company': f"Edited & renamed, {i}; \"quoted\" ünïcode"})
+        record = storage.get(key)
+        start = time.perf_counter()
+        scheduler.apply(key, before, storage.version(), record)
+        apply_ms.append((time.perf_counter() - start) * 1000)
+    start = time.perf_counter()
+    scheduler.feed()
+    edited_feed_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    scheduler.feed()
+    cached_feed_ms = (time.perf_counter() - start) * 1000
+
+    if scheduler.rebuilds != 1:
+        failures.append(f"edits caused {scheduler.rebuilds - 1} rebuilds")
+    fresh = ReminderScheduler(storage, directory, hook=lambda reminder: None, clock=clock)
+    fresh.sync()
+    if pending_ids(scheduler) != pending_ids(fresh):
+        failures.append("patched heap differs from a rebuilt one")
+    if comparable_feed(scheduler) != comparable_feed(fresh):
+        failures.append("patched feed differs from a rebuilt one")
+    failures += check_feed(scheduler, storage.load())
+    apply_ms.sort()
+    print(f"edits: {edits} patched in p50 {apply_ms[len(apply_ms) // 2]:.3f} ms (max {apply_ms[-1]:.3f} ms), "
+          f"full rebuild {rebuild_ms:,.1f} ms; feed {first_feed_ms:,.1f} ms first, {edited_feed_ms:,.1f} ms after "
+          f"the edits, {cached_feed_ms:.3f} ms unchanged")
+    return failures
+
+def check_thread(storage, directory):
+    scheduler = ReminderScheduler(storage, directory, poll_seconds=60).start()
+    tomorrow = (datetime.now() + timedelta(days=1)).date().isoformat()
+    before = storage.version()
+    key = storage.insert({'job_title': 'Thread', 'company': 'Thread check', 'status': 'Interviewing',
+                          'date_applied': tomorrow, 'interview_date': tomorrow})
+    scheduler.apply(key, before, storage.version(), storage.get(key))
+    outbox = os.path.join(directory, OUTBOX_FILE)
+    deadline = time.monotonic() + 1
+    found = False
+    while time.monotonic() < deadline and not found:
+        time.sleep(0.02)
+        if os.path.exists(outbox):
+            with open(outbox, encoding='utf-8') as f:
+                found = any(json.loads(line)['key'] == key for line in f)
+    scheduler.stop()
+    if not found:
+        return ["the background thread did not fire a due reminder within a second"]
+    print("thread: a reminder due at once reached the outbox")
+    return []
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--days', type=int, default=45)
+    parser.add_argument('--edits', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    failures = []
+    with tempfile.TemporaryDirectory() as directory:
+        storage = SQLiteBackend(os.path.join(directory, 'apps.db'))
+        storage.save(generate_applications(args.rows, seed=args.seed, today=FIXED_TODAY))
+        failures += check_agreement(storage, os.path.join(directory, 'agreement'), args.days)
+        failures += check_edits(storage, os.path.join(directory, 'edits'), args.edits, rng)
+        failures += check_thread(storage, os.path.join(directory, 'thread'))
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
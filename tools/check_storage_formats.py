@@ -0,0 +1,125 @@
+"""Check that column-projected loads agree with full loads on every backend, journal included
+
+On each backend, in a temporary directory, --rows synthetic applications are saved and then
+the same --edits random edits are made: updates of random fields of every type (text,
+categories, dates, cleared values), inserts and deletes. With those edits still in the
+journal (CSV, Arrow), and again after compacting them into the snapshot:
+
+- projection: load(columns=...) equals load()[columns] for a range of column sets,
+  and the frame it returns can be written to
+- agreement: every backend's load() equals the CSV backend's
+
+Exits with status 1 on a failure, so it can run as a CI step:
+    python tools/check_storage_formats.py
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd  # noqa: E402
+
+from job_tracker.schema import APPLICATION_COLUMNS  # noqa: E402
+from job_tracker.storage import ArrowBackend, CSVBackend, SQLiteBackend  # noqa: E402
+from job_tracker.synthetic import generate_applications  # noqa: E402
+
+FIXED_TODAY = '2026-01-15'
+COLUMN_SETS = [['status', 'channel'], ['priority'], ['referral'], ['status', 'deadline', 'company'],
+               ['interview_date', 'follow_up_date'], ['notes'], APPLICATION_COLUMNS]
+
+def open_store(backend, directory):
+    if backend == 'csv':
+        return CSVBackend(os.path.join(directory, 'apps.csv'))
+    if backend == 'arrow':
+        return ArrowBackend(os.path.join(directory, 'apps.arrow'))
+    return SQLiteBackend(os.path.join(directory, 'apps.db'))
+
+def make_edits(rows, edits, seed):
+    """The same random (kind, key, record) edits for every backend"""
+    rng = random.Random(seed)
+    donors = generate_applications(edits, seed=seed + 1, today=FIXED_TODAY).to_dict('records')
+    keys = list(range(1, rows + 1))
+    next_key = rows + 1
+    plan = []
+    for donor in donors:
+        kind = rng.random()
+        if kind < 0.15:
+            plan.append(('insert', next_key, donor))
+            keys.append(next_key)
+            next_key += 1
+        elif kind < 0.25:
+            plan.append(('delete', keys.pop(rng.randrange(len(keys))), None))
+        else:
+            columns = rng.sample(APPLICATION_COLUMNS, rng.randint(1, 4))
+            record = {col: None if rng.random() < 0.2 and col not in ('job_title', 'company') else donor[col]
+                      for col in columns}
+            plan.append(('update', rng.choice(keys), record))
+    return plan
+
+def apply_edits(store, plan):
+    for kind, key, record in plan:
+        if kind == 'insert':
+            stored = store.insert(record)
+            if stored != key:
+                raise AssertionError(f"insert got key {stored}, expected {key}")
+        elif kind == 'delete':
+            store.delete(key)
+        else:
+            store.update(key, record)
+
+def check_projections(backend, store, stage):
+    failures = []
+    full = store.load()
+    for columns in COLUMN_SETS:
+        label = f"{backend} ({stage}) load(columns={columns if len(columns) < 5 else 'all'})"
+        try:
+            projected = store.load(columns=columns)
+            pd.testing.assert_frame_equal(projected, full[columns])
+            projected.iloc[0, 0] = projected.iloc[-1, 0]
+        except Exception as e:
+            failures.append(f"{label}: {type(e).__name__}: {str(e).splitlines()[0]}")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--backend', choices=['sqlite', 'csv', 'arrow'], nargs='+', default=['csv', 'arrow', 'sqlite'])
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--edits', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    plan = make_edits(args.rows, args.edits, args.seed)
+    failures = []
+    with tempfile.TemporaryDirectory() as directory:
+        stores = {}
+        for backend in dict.fromkeys(['csv'] + args.backend):
+            os.mkdir(os.path.join(directory, backend))
+            store = stores[backend] = open_store(backend, os.path.join(directory, backend))
+            store.save(generate_applications(args.rows, seed=args.seed, today=FIXED_TODAY))
+            apply_edits(store, plan)
+        for stage in ('journaled', 'compacted'):
+            expected = stores['csv'].load()
+            for backend in args.backend:
+                store = stores[backend]
+                if stage == 'compacted' and not isinstance(store, CSVBackend):
+                    continue
+                if stage == 'compacted':
+                    store.compact()
+                stage_failures = check_projections(backend, store, stage)
+                try:
+                    pd.testing.assert_frame_equal(store.load(), expected)
+                except AssertionError as e:
+                    stage_failures.append(f"{backend} ({stage}): differs from CSV: {str(e).splitlines()[0]}")
+                print(f"{backend:<7} {stage:<10} {len(COLUMN_SETS)} projections "
+                      f"{'match the full load' if not stage_failures else 'FAILED'}")
+                failures += stage_failures
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
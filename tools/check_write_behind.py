@@ -0,0 +1,142 @@
+"""Check that write-behind saves coalesce bursts of edits and stay crash-consistent
+
+Every edit updates the notes of one application, and every third edit also adds an
+application first. On each backend, in a temporary directory:
+
+- coalescing: --edits edits, --interval apart, through a WriteBehindStore must reach the
+  backend in at most --max-writes writes, and all of them must be on disk after close()
+- crash: a child process keeps making edits and is killed (SIGKILL) at a random moment,
+  --crashes times. The store it leaves must load and hold exactly the first k edits for
+  some k, as if the process had stopped between two of them
+
+Exits with status 1 on a failure, so it can run as a CI step:
+    python tools/check_write_behind.py
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from job_tracker.storage import ArrowBackend, CSVBackend, SQLiteBackend  # noqa: E402
+from job_tracker.synthetic import generate_applications  # noqa: E402
+from job_tracker.write_behind import WriteBehindStore  # noqa: E402
+
+SEED_ROWS = 500
+EDITED_KEY = 1
+INSERT_EVERY = 3
+
+def open_store(backend, directory):
+    if backend == 'csv':
+        return CSVBackend(os.path.join(directory, 'apps.csv'))
+    if backend == 'arrow':
+        return ArrowBackend(os.path.join(directory, 'apps.arrow'))
+    return SQLiteBackend(os.path.join(directory, 'apps.db'))
+
+def make_edit(store, i, insert=True):
+    """Edit number i (from 1): maybe add an application, then update the edited one"""
+    if insert and i % INSERT_EVERY == 0:
+        store.insert({'job_title': 'Burst', 'company': f"Burst {i}", 'status': 'Applied', 'date_applied': '2026-01-15'})
+    store.update(EDITED_KEY, {'notes': f"edit {i}"})
+
+def edits_on_disk(backend, directory):
+    """How many edits the store on disk holds, or an error message if it is no prefix of them"""
+    df = open_store(backend, directory).load()
+    notes = df.loc[EDITED_KEY, 'notes']
+    done = int(notes.split()[1]) if isinstance(notes, str) and notes.startswith("edit ") else 0
+    inserted = {int(company.split()[1]) for company in df['company'].dropna() if company.startswith("Burst ")}
+    expected = {i for i in range(1, done + 1) if i % INSERT_EVERY == 0}
+    allowed = [expected]
+    if (done + 1) % INSERT_EVERY == 0:
+        # The process may have stopped between the insert and the update of the next edit
+        allowed.append(expected | {done + 1})
+    if inserted not in allowed:
+        return f"notes say {done} edits but the added applications are {sorted(inserted)}"
+    if len(df) != SEED_ROWS + len(inserted):
+        return f"{len(df)} rows, expected {SEED_ROWS + len(inserted)}"
+    return done
+
+def seed(backend, directory):
+    open_store(backend, directory).save(generate_applications(SEED_ROWS, seed=0, today='2026-01-15'))
+
+def check_coalescing(backend, edits, interval, max_writes):
+    with tempfile.TemporaryDirectory() as directory:
+        seed(backend, directory)
+        store = WriteBehindStore(open_store(backend, directory)).start()
+        start = time.perf_counter()
+        for i in range(1, edits + 1):
+            make_edit(store, i)
+            time.sleep(interval)
+        elapsed = (time.perf_counter() - start) * 1000
+        store.close()
+        done = edits_on_disk(backend, directory)
+    direct = edits + edits // INSERT_EVERY
+    print(f"{backend:<7} {edits} edits in {elapsed:,.0f} ms -> {store.writes} writes (direct: {direct}); "
+          f"{done} edits on disk after close()")
+    failures = []
+    if store.writes > max_writes:
+        failures.append(f"{backend}: {store.writes} writes for {edits} edits, budget {max_writes}")
+    if done != edits:
+        failures.append(f"{backend}: after close() the store holds {done} of {edits} edits")
+    return failures
+
+def check_crashes(backend, crashes, rng):
+    failures = []
+    with tempfile.TemporaryDirectory() as directory:
+        seed(backend, directory)
+        for attempt in range(crashes):
+            # Each child starts from what the last one left behind
+            before = edits_on_disk(backend, directory)
+            child = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--child', backend, directory, str(before)],
+                                     cwd=ROOT, stdout=subprocess.DEVNULL)
+            time.sleep(rng.uniform(0.5, 2.0))
+            child.kill()
+            child.wait()
+            done = edits_on_disk(backend, directory)
+            if isinstance(done, str):
+                failures.append(f"{backend} crash {attempt + 1}: {done}")
+                break
+            print(f"{backend:<7} crash {attempt + 1}: killed with {done - before} edits on disk, store consistent")
+    return failures
+
+def child(backend, directory, first):
+    """Keep editing through a short-delay WriteBehindStore until killed"""
+    store = WriteBehindStore(open_store(backend, directory), delay=0.02, max_delay=0.1).start()
+    # The last child may have been killed between the insert and the update of this edit
+    make_edit(store, first + 1, insert=not store.load()['company'].eq(f"Burst {first + 1}").any())
+    i = first + 1
+    while True:
+        i += 1
+        make_edit(store, i)
+        time.sleep(0.001)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--backend', choices=['sqlite', 'csv', 'arrow'], nargs='+', default=['sqlite', 'csv'])
+    parser.add_argument('--edits', type=int, default=200)
+    parser.add_argument('--interval', type=float, default=0.002, help="seconds between edits")
+    parser.add_argument('--max-writes', type=int, default=5, help="most backend writes allowed for the burst")
+    parser.add_argument('--crashes', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--child', nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        backend, directory, first = args.child
+        child(backend, directory, int(first))
+
+    rng = random.Random(args.seed)
+    failures = []
+    for backend in args.backend:
+        failures += check_coalescing(backend, args.edits, args.interval, args.max_writes)
+        failures += check_crashes(backend, args.crashes, rng)
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""Convert the CSV data file (with its journal) or a JSON backup into the Arrow store
+
+    python tools/convert_to_arrow.py
+    python tools/convert_to_arrow.py --source job_applications_backup.json
+    python tools/convert_to_arrow.py --workspace alice
+
+Then run the app with JOB_TRACKER_STORAGE=arrow. Nothing is written when the Arrow store
+already holds applications; the source is left as it is.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_tracker.storage import ARROW_FILE, DATA_FILE, migrate_to_arrow  # noqa: E402
+from job_tracker.workspaces import workspace_path  # noqa: E402
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workspace', help="workspace to convert (default: the default workspace)")
+    parser.add_argument('--source', help="CSV data file or .json backup (default: the workspace's CSV data file)")
+    parser.add_argument('--output', help="Arrow file to create (default: the workspace's)")
+    args = parser.parse_args()
+    source = args.source or workspace_path(DATA_FILE, args.workspace)
+    output = args.output or workspace_path(ARROW_FILE, args.workspace)
+
+    if not os.path.exists(source):
+        print(f"{source} does not exist", file=sys.stderr)
+        return 1
+    start = time.perf_counter()
+    rows = migrate_to_arrow(source, output)
+    if not rows:
+        print(f"Nothing converted: {output} already has applications, or {source} has none")
+        return 0
+    print(f"Converted {rows:,} applications from {source} ({os.path.getsize(source) / 2 ** 20:,.1f} MB) to {output} "
+          f"({os.path.getsize(output) / 2 ** 20:,.1f} MB) in {time.perf_counter() - start:,.1f} s")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""Fill the app's store with synthetic applications, to try the app at production size
+
+    python tools/generate_data.py 100000 --seed 1
+    python tools/generate_data.py 500 --workspace alice
+
+Replaces everything in the configured store (JOB_TRACKER_STORAGE) of the default workspace
+in the current directory, or of --workspace.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_tracker.service import open_storage  # noqa: E402
+from job_tracker.storage import STORAGE_BACKEND  # noqa: E402
+from job_tracker.synthetic import generate_applications  # noqa: E402
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('rows', type=int, help="number of applications (1000 to 1000000)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--backend', choices=['sqlite', 'csv', 'arrow'], default=STORAGE_BACKEND)
+    parser.add_argument('--workspace', help="workspace to fill (default: the default workspace)")
+    args = parser.parse_args()
+
+    storage = open_storage(args.backend, workspace=args.workspace)
+    storage.save(generate_applications(args.rows, seed=args.seed))
+    print(f"Wrote {args.rows} synthetic applications to {storage.path}")
+
+if __name__ == '__main__':
+    main()
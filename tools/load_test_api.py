@@ -0,0 +1,150 @@
+"""Requests/sec and latency of the JSON API under concurrent clients
+
+Starts `python -m job_tracker.api` on a free port in a temporary directory holding --rows
+synthetic applications, then runs --clients threads with one keep-alive connection each for
+--seconds. Each client picks its next request by the --mix weights:
+
+- page: the next page of a tracker listing, following next_cursor (and starting over at the end)
+- revalidate: the first page again with If-None-Match, answered 304 while nothing changed
+- get: one application by id
+- patch: change the notes of one application
+
+    python tools/load_test_api.py --rows 10000 --clients 8 --seconds 20 --output api.json
+
+Prints one line per request kind and writes the full results as JSON.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from job_tracker.service import open_storage  # noqa: E402
+from job_tracker.synthetic import generate_applications  # noqa: E402
+
+LIST_PATH = "/applications?status=Applied&status=Interviewing&order_by=date_applied&descending=1&limit=50"
+DEFAULT_MIX = {'page': 5, 'revalidate': 3, 'get': 3, 'patch': 1}
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def wait_until_up(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"The API server did not start on port {port}")
+
+def percentile(values, share):
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+def client(port, keys, mix, deadline, seed, results):
+    """One client: requests in the mix until deadline, appending (kind, status, ms) to results"""
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    kinds, weights = list(mix), list(mix.values())
+    cursor = etag = None
+    while time.monotonic() < deadline:
+        kind = rng.choices(kinds, weights)[0]
+        headers, body, method = {}, None, 'GET'
+        if kind == 'page':
+            path = LIST_PATH + (f"&cursor={cursor}" if cursor else "")
+        elif kind == 'revalidate':
+            path = LIST_PATH
+            headers = {'If-None-Match': etag} if etag else {}
+        elif kind == 'get':
+            path = f"/applications/{rng.choice(keys)}"
+        else:
+            method, path = 'PATCH', f"/applications/{rng.choice(keys)}"
+            body = json.dumps({'notes': f"load test {rng.random():.6f}"})
+            headers = {'Content-Type': 'application/json'}
+        start = time.perf_counter()
+        conn.request(method, path, body=body, headers=headers)
+        response = conn.getresponse()
+        data = response.read()
+        ms = (time.perf_counter() - start) * 1000
+        results.append((kind, response.status, ms))
+        if kind == 'page' and response.status == 200:
+            cursor = json.loads(data)['next_cursor']
+        if kind in ('page', 'revalidate') and response.getheader('ETag'):
+            etag = response.getheader('ETag')
+    conn.close()
+
+def summarize(rows, seconds):
+    latencies = sorted(ms for _, _, ms in rows)
+    statuses = {}
+    for _, status, _ in rows:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {'requests': len(rows), 'rps': round(len(rows) / seconds, 1),
+            'p50_ms': round(statistics.median(latencies), 3), 'p99_ms': round(percentile(latencies, 0.99), 3),
+            'max_ms': round(latencies[-1], 3), 'statuses': statuses}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=15)
+    parser.add_argument('--backend', choices=['sqlite', 'csv', 'arrow'], default='sqlite')
+    parser.add_argument('--mix', type=json.loads, default=DEFAULT_MIX, help="JSON {kind: weight}")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write the JSON here instead of stdout")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        storage = open_storage(args.backend)
+        storage.save(generate_applications(args.rows, seed=args.seed))
+        keys = [int(key) for key in storage.load().index]
+        port = free_port()
+        env = {**os.environ, 'JOB_TRACKER_STORAGE': args.backend, 'PYTHONPATH': ROOT}
+        server = subprocess.Popen([sys.executable, '-m', 'job_tracker.api', '--port', str(port), '--quiet'],
+                                  cwd=directory, env=env, stdout=subprocess.DEVNULL)
+        try:
+            wait_until_up(port)
+            results = []
+            deadline = time.monotonic() + args.seconds
+            threads = [threading.Thread(target=client, args=(port, keys, args.mix, deadline, args.seed + i, results))
+                       for i in range(args.clients)]
+            start = time.monotonic()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.monotonic() - start
+        finally:
+            server.terminate()
+            server.wait()
+            os.chdir(ROOT)
+
+    report = {'rows': args.rows, 'clients': args.clients, 'seconds': round(elapsed, 2), 'backend': args.backend,
+              'overall': summarize(results, elapsed),
+              'by_kind': {kind: summarize([row for row in results if row[0] == kind], elapsed)
+                          for kind in args.mix if any(row[0] == kind for row in results)}}
+    for kind, row in [('overall', report['overall'])] + list(report['by_kind'].items()):
+        print(f"{kind:<11}{row['requests']:>8} requests {row['rps']:>9.1f}/s  p50 {row['p50_ms']:>8.2f} ms  "
+              f"p99 {row['p99_ms']:>8.2f} ms  {row['statuses']}", file=sys.stderr)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
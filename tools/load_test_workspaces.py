@@ -0,0 +1,136 @@
+"""Per-request latency of one process serving a growing number of workspaces
+
+For each tenant count, that many workspaces are filled with --rows synthetic applications
+in a temporary directory. Then --threads concurrent sessions send --requests requests,
+each for a random workspace, doing what a dashboard rerun does: read the version, get the
+workspace's backup manager and reminder scheduler (starting their threads on first use),
+load the applications, get the aggregate counts, compute reminders and query one tracker
+page. Every --write-every'th request also edits one application. Latencies, the data cache
+state and the number of threads and open workspaces the process ends up with (bounded by
+ACTIVE_WORKSPACES_MAX, see job_tracker.service) are reported per tenant count as JSON:
+
+    python tools/load_test_workspaces.py --tenants 1 10 100 300 --output load.json
+
+Exits with status 1 when the median latency at the largest tenant count is over
+--max-growth times the median with one tenant.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd  # noqa: E402
+
+from job_tracker import service  # noqa: E402
+from job_tracker.indexes import get_aggregates  # noqa: E402
+from job_tracker.reminders import compute_reminders  # noqa: E402
+from job_tracker.storage import get_data_cache  # noqa: E402
+from job_tracker.synthetic import generate_applications  # noqa: E402
+from job_tracker.workspaces import use_workspace  # noqa: E402
+
+DEFAULT_TENANTS = [1, 10, 100, 300]
+PAGE_QUERY = {'filters': {'status': ['Applied', 'Interviewing']}, 'order_by': 'date_applied',
+              'descending': True, 'limit': 50}
+FIXED_TODAY = '2026-01-15'
+
+def request(workspace, write, rng):
+    """One dashboard-like request for workspace; returns its latency in ms"""
+    start = time.perf_counter()
+    with use_workspace(workspace):
+        storage = service.get_storage()
+        version = storage.version()
+        service.get_backup_manager()
+        service.get_reminder_scheduler()
+        df = service.load_data()
+        aggregates = get_aggregates(df, version)
+        compute_reminders(df, today=pd.Timestamp(FIXED_TODAY).date())
+        storage.query(**PAGE_QUERY)
+        aggregates.count('status', 'Offered')
+        if write and len(df):
+            service.update_application(int(rng.choice(df.index)), {'notes': f"load test {rng.random():.6f}"})
+    return (time.perf_counter() - start) * 1000
+
+def run_tenants(tenants, args, rng):
+    names = [f"tenant-{i:04d}" for i in range(tenants)]
+    for i, name in enumerate(names):
+        service.open_storage(args.backend, workspace=name).save(
+            generate_applications(args.rows, seed=i, today=FIXED_TODAY))
+    cache = get_data_cache()
+    cache.invalidate()
+    plan = [(rng.choice(names), i % args.write_every == 0) for i in range(args.requests)]
+    # Warm up once per workspace, as a long-running server would be
+    for name in names:
+        request(name, False, rng)
+    hits, misses, evictions = cache.hits, cache.misses, cache.evictions
+    with ThreadPoolExecutor(args.threads) as pool:
+        latencies = list(pool.map(lambda item: request(item[0], item[1], random.Random(rng.random())), plan))
+    latencies.sort()
+    stats = cache.stats()
+    threads, open_workspaces = threading.active_count(), len(service._workspaces)
+    service.close_workspaces()
+    return {'tenants': tenants, 'requests': len(latencies),
+            'p50_ms': round(statistics.median(latencies), 3),
+            'p95_ms': round(latencies[int(len(latencies) * 0.95)], 3),
+            'p99_ms': round(latencies[int(len(latencies) * 0.99)], 3),
+            'cache_hits': stats['hits'] - hits, 'cache_misses': stats['misses'] - misses,
+            'cache_evictions': stats['evictions'] - evictions, 'cache_mb': round(stats['bytes'] / 2 ** 20, 1),
+            'threads': threads, 'open_workspaces': open_workspaces}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tenants', type=int, nargs='+', default=DEFAULT_TENANTS)
+    parser.add_argument('--rows', type=int, default=300, help="applications per workspace")
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--threads', type=int, default=4, help="concurrent sessions")
+    parser.add_argument('--write-every', type=int, default=10)
+    parser.add_argument('--backend', choices=['sqlite', 'csv'], default='sqlite')
+    parser.add_argument('--cache-mb', type=int, help="data cache budget (default: DATA_CACHE_MAX_BYTES)")
+    parser.add_argument('--active-workspaces', type=int,
+                        help="workspaces kept open with their threads (default: ACTIVE_WORKSPACES_MAX)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-growth', type=float, default=1.5)
+    parser.add_argument('--output', help="write the JSON here instead of stdout")
+    args = parser.parse_args()
+
+    if args.cache_mb:
+        get_data_cache().max_bytes = args.cache_mb * 2 ** 20
+    if args.active_workspaces:
+        service.ACTIVE_WORKSPACES_MAX = args.active_workspaces
+    rng = random.Random(args.seed)
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        for tenants in args.tenants:
+            row = run_tenants(tenants, args, rng)
+            results.append(row)
+            print(f"{tenants:>6} workspaces  p50 {row['p50_ms']:>7.2f} ms  p95 {row['p95_ms']:>7.2f} ms  "
+                  f"p99 {row['p99_ms']:>7.2f} ms  cache {row['cache_hits']}/{row['cache_misses']} hits/misses, "
+                  f"{row['cache_evictions']} evictions, {row['cache_mb']} MB; {row['threads']} threads, "
+                  f"{row['open_workspaces']} workspaces open", file=sys.stderr)
+        os.chdir(ROOT)
+
+    text = json.dumps({'rows': args.rows, 'threads': args.threads, 'backend': args.backend,
+                       'active_workspaces': service.ACTIVE_WORKSPACES_MAX, 'results': results}, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    growth = results[-1]['p50_ms'] / results[0]['p50_ms']
+    if growth > args.max_growth:
+        print(f"Median latency grew {growth:.2f}x from {results[0]['tenants']} to {results[-1]['tenants']} workspaces",
+              file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""List backup generations or rebuild one
+
+    python tools/restore_backup.py --list
+    python tools/restore_backup.py --generation 12 --output restored.csv
+    python tools/restore_backup.py --generation 12 --into-store
+    python tools/restore_backup.py --workspace alice --list
+
+--into-store replaces the configured store's contents with the generation. That is itself a
+new write, so the state it replaced is kept in the next backup.
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_tracker.backups import BACKUP_DIR, BackupManager, read_manifest, restore_generation  # noqa: E402
+from job_tracker.service import get_storage  # noqa: E402
+from job_tracker.workspaces import use_workspace, workspace_path  # noqa: E402
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workspace', help="workspace whose backups to use (default: the default workspace)")
+    parser.add_argument('--directory', help="backup directory (default: the workspace's)")
+    parser.add_argument('--list', action='store_true', help="list the generations and exit")
+    parser.add_argument('--generation', type=int, help="generation to rebuild (default: the newest)")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--output', help="write the rebuilt applications to this CSV file")
+    target.add_argument('--into-store', action='store_true', help="replace the store's contents with them")
+    args = parser.parse_args()
+    args.directory = args.directory or workspace_path(BACKUP_DIR, args.workspace)
+
+    generations = read_manifest(args.directory)
+    if args.list or not (args.output or args.into_store):
+        for entry in generations:
+            created = datetime.fromtimestamp(entry['created']).strftime('%Y-%m-%d %H:%M:%S')
+            detail = f"{entry['changes']} changes" if entry['kind'] == 'delta' else f"{entry['rows']} rows"
+            print(f"{entry['generation']:>6}  {entry['kind']:<5}  {created}  version {entry['version']:<8} "
+                  f"{detail:<14} {entry['bytes']:>10,} bytes")
+        if not generations:
+            print(f"No backups in {args.directory}")
+        return 0
+
+    df = restore_generation(args.generation, args.directory)
+    if args.output:
+        df.to_csv(args.output, index_label='id')
+        print(f"Wrote {len(df)} applications to {args.output}")
+    else:
+        with use_workspace(args.workspace):
+            storage = get_storage()
+            # Back up what is about to be replaced first, in case it has not been yet
+            BackupManager(storage, args.directory).maybe_backup(force=True)
+            storage.save(df)
+        print(f"Restored {len(df)} applications into {storage.path}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())